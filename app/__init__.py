@@ -1,8 +1,9 @@
 # --- app/__init__.py ---
 
+import time
+_import_started = time.perf_counter() # For the start-up time log line (see app/bootstrap.py)
+
 import os
-import logging
-from logging.handlers import RotatingFileHandler
 from flask import Flask, current_app # Import current_app
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
@@ -10,9 +11,6 @@ from flask_mail import Mail
 from itsdangerous import URLSafeTimedSerializer
 from datetime import datetime
 import cloudinary
-import cloudinary.utils
-# Import Werkzeug for password hashing needed in auto-admin create
-from werkzeug.security import generate_password_hash
 
 # Initialize extensions
 db = SQLAlchemy()
@@ -20,13 +18,12 @@ login_manager = LoginManager()
 mail = Mail()
 serializer = None
 
-# Configure logging formatter
-log_formatter = logging.Formatter(
-    '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-)
-
 def create_app(config_class=None):
-    """ Create and configure the Flask application. """
+    """
+    Create and configure the Flask application.
+    `config_class` (a config object/class or a dict, e.g. {'TESTING': True}) overrides the environment-based defaults.
+    """
+    create_started = time.perf_counter()
     app = Flask(__name__, instance_relative_config=True)
 
     # Default Upload Folder Path (for local fallback if UPLOAD_FOLDER env var not set)
@@ -39,9 +36,99 @@ def create_app(config_class=None):
         SECURITY_PASSWORD_SALT=os.environ.get('SECURITY_PASSWORD_SALT', 'change_this_dev_salt'),
         SQLALCHEMY_DATABASE_URI=os.environ.get('DATABASE_URL', f"sqlite:///{os.path.join(app.instance_path, 'site.db')}"),
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        # Engine profile (see app/engine.py): 'web', 'worker', 'pgbouncer' or 'default'; DB_POOL_* override single values
+        DB_ENGINE_PROFILE=os.environ.get('DB_ENGINE_PROFILE', 'web').lower(),
+        DB_POOL_SIZE=os.environ.get('DB_POOL_SIZE'), # Default for 'web': WEB_THREADS + in-process background threads
+        DB_MAX_OVERFLOW=os.environ.get('DB_MAX_OVERFLOW'),
+        DB_POOL_TIMEOUT=os.environ.get('DB_POOL_TIMEOUT'),
+        DB_POOL_RECYCLE=os.environ.get('DB_POOL_RECYCLE'),
+        # Gunicorn worker processes / threads per worker / worker class (see gunicorn.conf.py, app/concurrency.py)
+        WEB_WORKERS=int(os.environ.get('WEB_CONCURRENCY', 1)),
+        WEB_THREADS=int(os.environ.get('GUNICORN_THREADS', 1)),
+        WEB_WORKER_CLASS=os.environ.get('WEB_WORKER_CLASS', 'sync').lower(), # 'sync', 'gthread' or 'gevent'
+        # SQLite pragmas applied to every new connection
+        SQLITE_JOURNAL_MODE=os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        SQLITE_SYNCHRONOUS=os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        SQLITE_BUSY_TIMEOUT_MS=int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
         # UPLOAD_FOLDER env var used by Cloudinary logic if needed, defaults locally
         UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', default_upload_folder),
         MAX_CONTENT_LENGTH = 5 * 1024 * 1024, # 5 MB limit
+        # Resume uploads: 'sync' (upload during the request) or 'async' (spool locally, background upload; see app/uploads.py)
+        RESUME_UPLOAD_MODE=os.environ.get('RESUME_UPLOAD_MODE', 'sync'),
+        RESUME_SPOOL_FOLDER=os.environ.get('RESUME_SPOOL_FOLDER', os.path.join(app.instance_path, 'uploads', 'spool')),
+        RESUME_UPLOAD_WORKERS=int(os.environ.get('RESUME_UPLOAD_WORKERS', 2)), # In-process uploader threads (0 = external uploader only)
+        RESUME_UPLOAD_MAX_ATTEMPTS=int(os.environ.get('RESUME_UPLOAD_MAX_ATTEMPTS', 5)),
+        # Retry delay after a failed upload: doubles per attempt, capped (seconds)
+        RESUME_UPLOAD_BACKOFF_SECONDS=int(os.environ.get('RESUME_UPLOAD_BACKOFF_SECONDS', 30)),
+        RESUME_UPLOAD_BACKOFF_MAX_SECONDS=int(os.environ.get('RESUME_UPLOAD_BACKOFF_MAX_SECONDS', 1800)),
+        # Memoized resume delivery URLs (see app/resume_urls.py)
+        RESUME_URL_CACHE_SIZE=int(os.environ.get('RESUME_URL_CACHE_SIZE', 4096)),
+        RESUME_URL_CACHE_TTL=int(os.environ.get('RESUME_URL_CACHE_TTL', 3600)),
+        # Rows fetched (and resume URLs built) per batch when streaming application exports (see app/exports.py)
+        EXPORT_BATCH_SIZE=int(os.environ.get('EXPORT_BATCH_SIZE', 1000)),
+        # JSON job API (see app/job_api.py): Cache-Control max-age for CDNs/pollers, and the largest ?limit=
+        API_CACHE_MAX_AGE=int(os.environ.get('API_CACHE_MAX_AGE', 60)),
+        API_MAX_PAGE_SIZE=int(os.environ.get('API_MAX_PAGE_SIZE', 100)),
+        # Bulk job import (see app/job_import.py): rows per INSERT batch / commit, and the per-file row limit
+        JOB_IMPORT_BATCH_SIZE=int(os.environ.get('JOB_IMPORT_BATCH_SIZE', 500)),
+        JOB_IMPORT_MAX_ROWS=int(os.environ.get('JOB_IMPORT_MAX_ROWS', 5000)),
+        # Pagination: 'offset' (numbered pages) or 'keyset' (cursor tokens) by default; '?paging=cursor' opts in per request
+        PAGINATION_MODE=os.environ.get('PAGINATION_MODE', 'offset'),
+        # Totals in cursor mode: exact, cached, approx or none (see app/pagination.py)
+        PAGINATION_COUNT_MODE=os.environ.get('PAGINATION_COUNT_MODE', 'exact'),
+        PAGINATION_COUNT_CACHE_SECONDS=int(os.environ.get('PAGINATION_COUNT_CACHE_SECONDS', 60)),
+        # Raise instead of log when a view exceeds its @query_budget (turn on in tests)
+        QUERY_BUDGET_ENFORCE=os.environ.get('QUERY_BUDGET_ENFORCE', 'False').lower() in ['true', '1', 't'],
+        # Per-request SQL timing, Server-Timing header and slow query log (see app/instrumentation.py)
+        SQL_INSTRUMENTATION=os.environ.get('SQL_INSTRUMENTATION', 'False').lower() in ['true', '1', 't'],
+        SQL_SLOW_QUERY_MS=float(os.environ.get('SQL_SLOW_QUERY_MS', 100)),
+        SQL_STATS_WINDOW=int(os.environ.get('SQL_STATS_WINDOW', 500)), # Requests kept per endpoint
+        # Anonymous page cache for main.index / jobs.job_list (see app/cache.py)
+        PAGE_CACHE_ENABLED=os.environ.get('PAGE_CACHE_ENABLED', 'True').lower() in ['true', '1', 't'],
+        PAGE_CACHE_TTL=int(os.environ.get('PAGE_CACHE_TTL', 60)),
+        PAGE_CACHE_MAX_ENTRIES=int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', 512)),
+        CACHE_BACKEND=os.environ.get('CACHE_BACKEND', 'local'), # 'local', 'redis' or 'module:Class'
+        CACHE_REDIS_URL=os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0'),
+        # Password hashing (see app/passwords.py): werkzeug method string ('' = werkzeug default), pool size and backlog per process
+        PASSWORD_HASH_METHOD=os.environ.get('PASSWORD_HASH_METHOD', ''),
+        PASSWORD_HASH_WORKERS=int(os.environ.get('PASSWORD_HASH_WORKERS', 2)),
+        PASSWORD_HASH_QUEUE=int(os.environ.get('PASSWORD_HASH_QUEUE', 16)),
+        PASSWORD_HASH_TIMEOUT=float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10)),
+        # Identity cache in front of the Flask-Login user loader (see app/user_cache.py); lives in CACHE_BACKEND if set
+        USER_CACHE_ENABLED=os.environ.get('USER_CACHE_ENABLED', 'True').lower() in ['true', '1', 't'],
+        USER_CACHE_TTL=int(os.environ.get('USER_CACHE_TTL', 30)),
+        USER_CACHE_MAX_ENTRIES=int(os.environ.get('USER_CACHE_MAX_ENTRIES', 2048)),
+        # Site-wide admin counts (see app/stats.py): read cache lifetime and drift-check interval (0 = CLI only)
+        STATS_CACHE_SECONDS=int(os.environ.get('STATS_CACHE_SECONDS', 30)),
+        STATS_RECONCILE_SECONDS=int(os.environ.get('STATS_RECONCILE_SECONDS', 3600)),
+        # Location/category facet counts on the job search page (see app/facets.py): read cache lifetime
+        FACETS_CACHE_SECONDS=int(os.environ.get('FACETS_CACHE_SECONDS', 60)),
+        # Hot/cold archival (see app/archive.py): job age, jobs per transaction, whether listings nobody applied to
+        # are archived too, and an in-process run interval (0 = off; schedule `flask archive` in one place instead)
+        ARCHIVE_JOB_AGE_DAYS=int(os.environ.get('ARCHIVE_JOB_AGE_DAYS', 180)),
+        ARCHIVE_BATCH_SIZE=int(os.environ.get('ARCHIVE_BATCH_SIZE', 500)),
+        ARCHIVE_UNAPPLIED_JOBS=os.environ.get('ARCHIVE_UNAPPLIED_JOBS', 'False').lower() in ['true', '1', 't'],
+        ARCHIVE_INTERVAL_SECONDS=int(os.environ.get('ARCHIVE_INTERVAL_SECONDS', 0)),
+        # Start the in-process background threads (outbox senders, resume uploaders, stats reconcile, archival)
+        # in create_app. Off by default: run the CLI workers instead, or enable it on one process
+        BACKGROUND_WORKERS=os.environ.get('BACKGROUND_WORKERS', 'False').lower() in ['true', '1', 't'],
+        # Run `flask bootstrap` work (create_all, search index, default admin) inside create_app
+        AUTO_BOOTSTRAP=os.environ.get('AUTO_BOOTSTRAP', 'False').lower() in ['true', '1', 't'],
+        # Start-up budget checked by `flask startup-time`
+        STARTUP_BUDGET_IMPORT_MS=float(os.environ.get('STARTUP_BUDGET_IMPORT_MS', 1500)),
+        STARTUP_BUDGET_CREATE_APP_MS=float(os.environ.get('STARTUP_BUDGET_CREATE_APP_MS', 250)),
+        # Logging (see app/logs.py): level, 'text' or 'json' lines, rotation size/backups, in-memory queue bound
+        LOG_LEVEL=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+        LOG_FORMAT=os.environ.get('LOG_FORMAT', 'text').lower(),
+        LOG_DIR=os.environ.get('LOG_DIR', 'logs'),
+        LOG_FILE=os.environ.get('LOG_FILE', 'job_portal.log'),
+        LOG_MAX_BYTES=int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+        LOG_BACKUP_COUNT=int(os.environ.get('LOG_BACKUP_COUNT', 10)),
+        LOG_QUEUE_SIZE=int(os.environ.get('LOG_QUEUE_SIZE', 10000)), # Records beyond this are dropped, never blocking a request
+        # Static assets (see app/assets.py): source folder, `flask assets-build` output, max-age for unhashed names
+        STATIC_ROOT=os.environ.get('STATIC_ROOT', os.path.join(os.path.dirname(app.root_path), 'static')),
+        STATIC_BUILD_DIR=os.environ.get('STATIC_BUILD_DIR', os.path.join(os.path.dirname(app.root_path), 'static_build')),
+        STATIC_MAX_AGE=int(os.environ.get('STATIC_MAX_AGE', 60)),
         # Mail Config
         MAIL_SERVER=os.environ.get('MAIL_SERVER', 'smtp.example.com'),
         MAIL_PORT=int(os.environ.get('MAIL_PORT', 587)),
@@ -50,8 +137,21 @@ def create_app(config_class=None):
         MAIL_USERNAME=os.environ.get('MAIL_USERNAME'),
         MAIL_PASSWORD=os.environ.get('MAIL_PASSWORD'),
         MAIL_DEFAULT_SENDER=os.environ.get('MAIL_DEFAULT_SENDER', 'noreply@example.com'),
+        # Email outbox: queue mail in the DB and send from background workers (see app/outbox.py)
+        MAIL_USE_OUTBOX=os.environ.get('MAIL_USE_OUTBOX', 'False').lower() in ['true', '1', 't'],
+        MAIL_OUTBOX_WORKERS=int(os.environ.get('MAIL_OUTBOX_WORKERS', 1)), # In-process sender threads (0 = external worker only)
+        MAIL_OUTBOX_BATCH_SIZE=int(os.environ.get('MAIL_OUTBOX_BATCH_SIZE', 50)),
+        MAIL_OUTBOX_POLL_SECONDS=float(os.environ.get('MAIL_OUTBOX_POLL_SECONDS', 5)),
+        MAIL_OUTBOX_MAX_ATTEMPTS=int(os.environ.get('MAIL_OUTBOX_MAX_ATTEMPTS', 8)),
+        MAIL_OUTBOX_BACKOFF_SECONDS=int(os.environ.get('MAIL_OUTBOX_BACKOFF_SECONDS', 30)),
     )
 
+    # Explicit configuration (tests, scripts) wins over the environment
+    if isinstance(config_class, dict):
+        app.config.from_mapping(config_class)
+    elif config_class is not None:
+        app.config.from_object(config_class)
+
     # Ensure Instance Folder Exists
     try:
         os.makedirs(app.instance_path, exist_ok=True)
@@ -75,9 +175,28 @@ def create_app(config_class=None):
 
     # Initialize Flask Extensions
     try:
+        from .engine import configure_engine, init_engine
+        configure_engine(app)
         db.init_app(app)
+        init_engine(app)
+        from .concurrency import init_concurrency
+        init_concurrency(app)
         login_manager.init_app(app)
         mail.init_app(app)
+        from .cache import init_cache
+        init_cache(app)
+        from .stats import init_stats
+        init_stats(app)
+        from .facets import init_facets
+        init_facets(app)
+        from .user_cache import init_user_cache
+        init_user_cache(app)
+        from .resume_urls import init_resume_urls
+        init_resume_urls(app)
+        from .instrumentation import init_instrumentation
+        init_instrumentation(app)
+        from .assets import init_assets
+        init_assets(app)
     except Exception as e:
         app.logger.error(f"Error initializing Flask extensions: {e}")
 
@@ -98,12 +217,11 @@ def create_app(config_class=None):
     # --- V V V --- CORRECTED load_user FUNCTION (Multi-line) --- V V V ---
     @login_manager.user_loader
     def load_user(user_id):
-        # Import models here to avoid potential circular dependencies at module level
-        from .models import User
+        # Imported here to avoid potential circular dependencies at module level
+        from .user_cache import load_user as load_cached_user
         try:
-            # Attempt to convert user_id to int and query the database
-            user = User.query.get(int(user_id))
-            return user
+            # Cached identity snapshot when available, otherwise one primary-key lookup
+            return load_cached_user(user_id)
         except ValueError:
             # Handle cases where user_id is not a valid integer format
             # Use current_app context to access logger safely inside the loader
@@ -122,29 +240,22 @@ def create_app(config_class=None):
         # Make datetime.utcnow available to all templates as 'now'
         return {'now': datetime.utcnow}
 
+    # Resume URL helper for templates (memoized; see app/resume_urls.py). Built once, not per render.
+    from .resume_urls import resume_url
+    template_helpers = dict(get_cloudinary_raw_url=resume_url)
     @app.context_processor
     def utility_processor():
-        # Make Cloudinary URL generation available to templates
-        def get_cloudinary_raw_url(public_id):
-            if not public_id: return None
-            try:
-                if cloudinary.config().cloud_name:
-                     # resource_type='raw' for non-image/video files like PDFs
-                     # secure=True ensures HTTPS URL
-                     url_tuple = cloudinary.utils.cloudinary_url(public_id, resource_type="raw", secure=True)
-                     return url_tuple[0] if url_tuple else None # cloudinary_url returns (url, options)
-                else: current_app.logger.warning("Cloudinary not configured, cannot generate URL."); return None
-            except Exception as e: current_app.logger.error(f"Error generating Cloudinary URL for {public_id}: {e}"); return None
-        return dict(get_cloudinary_raw_url=get_cloudinary_raw_url)
+        return template_helpers
 
     # --- Register Blueprints ---
     try:
-        from .views import main_bp, auth_bp, jobs_bp, employers_bp, admin_bp
+        from .views import main_bp, auth_bp, jobs_bp, employers_bp, admin_bp, api_bp
         app.register_blueprint(main_bp)
         app.register_blueprint(auth_bp, url_prefix='/auth')
         app.register_blueprint(jobs_bp, url_prefix='/jobs')
         app.register_blueprint(employers_bp, url_prefix='/employer')
         app.register_blueprint(admin_bp, url_prefix='/admin')
+        app.register_blueprint(api_bp, url_prefix='/api/v1') # Read-only JSON job API (see app/job_api.py)
         app.logger.info("Blueprints registered.")
     except ImportError:
         # Log specific import errors if views haven't been created yet or have syntax issues
@@ -153,74 +264,80 @@ def create_app(config_class=None):
     except Exception as e:
         app.logger.error(f"Error registering blueprints: {e}")
 
-    # --- Setup Logging ---
-    log_dir = 'logs'
-    log_file_path = os.path.join(log_dir, 'job_portal.log')
-    log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
-    logging_level = getattr(logging, log_level, logging.INFO)
-
-    if not app.debug and not app.testing: # Configure file logging only in production-like environments
-        if not os.path.exists(log_dir):
-            try: os.mkdir(log_dir)
-            except OSError as e: app.logger.error(f"Error creating logs directory '{log_dir}': {e}")
-        try:
-            # Use RotatingFileHandler for log rotation
-            file_handler = RotatingFileHandler(log_file_path, maxBytes=10240, backupCount=10)
-            file_handler.setFormatter(log_formatter)
-            file_handler.setLevel(logging_level)
-            app.logger.addHandler(file_handler)
-            app.logger.setLevel(logging_level) # Ensure app logger level is also set
-            app.logger.info(f'File logging configured: {log_file_path}')
-        except Exception as e:
-            app.logger.error(f"Failed to configure file logging: {e}")
-    else:
-        # In debug mode, rely on console output or basic config if needed
-        app.logger.setLevel(logging_level)
-        app.logger.info("Debug/Testing mode active. File logging skipped/minimal.")
-
+    # --- CLI Commands ---
+    from .search import reindex_command
+    from .outbox import outbox_worker_command, outbox_status_command
+    from .uploads import resume_uploader_command
+    from .benchmark import seed_data_command, benchmark_command, password_benchmark_command
+    from .counters import counters_repair_command
+    from .stats import stats_reconcile_command
+    from .facets import facets_rebuild_command
+    from .bootstrap import bootstrap_command, startup_time_command
+    from .indexes import index_advisor_command
+    from .archive import archive_command
+    from .assets import assets_build_command
+    from .loadtest import load_test_command
+    app.cli.add_command(reindex_command)
+    app.cli.add_command(outbox_worker_command)
+    app.cli.add_command(outbox_status_command)
+    app.cli.add_command(resume_uploader_command)
+    app.cli.add_command(seed_data_command)
+    app.cli.add_command(benchmark_command)
+    app.cli.add_command(password_benchmark_command)
+    app.cli.add_command(counters_repair_command)
+    app.cli.add_command(stats_reconcile_command)
+    app.cli.add_command(facets_rebuild_command)
+    app.cli.add_command(bootstrap_command)
+    app.cli.add_command(startup_time_command)
+    app.cli.add_command(index_advisor_command)
+    app.cli.add_command(archive_command)
+    app.cli.add_command(assets_build_command)
+    app.cli.add_command(load_test_command)
 
-    # --- Create Database Tables & Default Admin ---
-    with app.app_context():
-        try:
-            db.create_all() # Create tables if they don't exist
-            app.logger.info("DB tables checked/created (if needed).")
-
-            # Automatically create default admin if none exists
-            from .models import User # Import User model here
-            if not User.query.filter_by(role='admin').first():
-                app.logger.info("No admin user found. Attempting to create default admin...")
-                default_username = os.environ.get('DEFAULT_ADMIN_USERNAME', 'admin')
-                default_email = os.environ.get('DEFAULT_ADMIN_EMAIL')
-                default_password = os.environ.get('DEFAULT_ADMIN_PASSWORD')
-
-                if not default_email or not default_password:
-                    app.logger.error("DEFAULT_ADMIN_EMAIL or DEFAULT_ADMIN_PASSWORD env vars not set. Cannot create default admin.")
-                else:
-                    try:
-                        existing = User.query.filter((User.username == default_username) | (User.email == default_email)).first()
-                        if not existing:
-                            admin_user = User(username=default_username, email=default_email, role='admin', is_verified=True)
-                            admin_user.set_password(default_password)
-                            db.session.add(admin_user)
-                            db.session.commit()
-                            app.logger.info(f"Default admin user '{default_username}' created successfully.")
-                        else:
-                            app.logger.warning(f"User with username/email already exists. Default admin '{default_username}' not created.")
-                    except Exception as admin_create_e:
-                         db.session.rollback()
-                         app.logger.error(f"Failed to create default admin user: {admin_create_e}")
-            else:
-                 app.logger.info("Admin user already exists.")
+    # --- Setup Logging ---
+    # Queued file logging (see app/logs.py): views only enqueue records, a listener thread writes them
+    from .logs import init_logging
+    init_logging(app)
 
-        except Exception as e:
-            app.logger.error(f"Error during initial DB setup (create_all/admin check): {e}")
-            app.logger.error(f"Check Database URI: {app.config.get('SQLALCHEMY_DATABASE_URI')}")
+    # --- Database Setup ---
+    # Tables, search index and default admin are created by `flask bootstrap` (see app/bootstrap.py),
+    # not on every worker start. AUTO_BOOTSTRAP=True restores the old start-up behaviour.
+    if app.config.get('AUTO_BOOTSTRAP'):
+        from .bootstrap import bootstrap
+        with app.app_context():
+            bootstrap(app)
 
     # --- Final Checks ---
     if not app.config.get('MAIL_USERNAME') or not app.config.get('MAIL_PASSWORD'):
        app.logger.warning("MAIL config missing. Email disabled.")
 
-    app.logger.info("Flask app creation finished.")
+    # --- Background Workers (email outbox, resume uploads, stats reconcile, archival) ---
+    if background_workers_enabled(app.config):
+        start_background_workers(app)
+
+    created = time.perf_counter()
+    app.logger.info(f"Flask app creation finished in {(created - create_started) * 1000:.0f} ms "
+                    f"({(created - _import_started) * 1000:.0f} ms since app import).")
     return app
 
+
+def background_workers_enabled(config):
+    """True if create_app() starts the in-process background threads (BACKGROUND_WORKERS, never when testing)."""
+    return bool(config.get('BACKGROUND_WORKERS')) and not config.get('TESTING')
+
+def start_background_workers(app):
+    """Starts the configured in-process background threads: outbox senders, resume uploaders, stats reconcile, archival."""
+    if app.config.get('MAIL_USE_OUTBOX') and app.config.get('MAIL_OUTBOX_WORKERS', 0) > 0:
+        from .outbox import start_workers
+        start_workers(app)
+    if app.config.get('RESUME_UPLOAD_MODE') == 'async' and app.config.get('RESUME_UPLOAD_WORKERS', 0) > 0:
+        from .uploads import start_uploaders
+        start_uploaders(app)
+    if app.config.get('STATS_RECONCILE_SECONDS', 0) > 0:
+        from .stats import start_reconciler
+        start_reconciler(app)
+    if app.config.get('ARCHIVE_INTERVAL_SECONDS', 0) > 0:
+        from .archive import start_archiver
+        start_archiver(app)
+
 # --- End of __init__.py ---
\ No newline at end of file
@@ -0,0 +1,191 @@
+# --- app/archive.py ---
+# Hot/cold archival of expired jobs and their closed applications.
+#
+# Jobs posted more than ARCHIVE_JOB_AGE_DAYS ago that have applications, all of them closed (Rejected,
+# Hired, Offer Declined), are moved, with those applications, from `jobs` / `applications` into the
+# `jobs_archive` / `applications_archive` tables (same ids, counters and timestamps). Jobs that still
+# have an open application stay hot until the employer closes it. Old listings nobody applied to stay
+# live too, unless ARCHIVE_UNAPPLIED_JOBS is set. Each chunk of ARCHIVE_BATCH_SIZE
+# jobs is one short transaction: INSERT ... SELECT into the archive tables, DELETE from the hot ones,
+# and the derived data (site stats, facets, search index, public page cache) in step. A chunk that
+# fails with an IntegrityError (e.g. an id already in the archive) is rolled back, logged with its job
+# IDs and skipped for the rest of the run; the other chunks still go through. The list
+# pages' indexes and scans therefore only cover live data. Archived records stay readable through
+# the employer's and seeker's read-only archive pages and the job detail page.
+# Run it from one place: a scheduled `flask archive` (e.g. a daily cron / scheduler job), or one process
+# with ARCHIVE_INTERVAL_SECONDS > 0 (off by default, since every web worker would start its own thread).
+
+from collections import Counter
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from sqlalchemy import bindparam, exists, func, insert, literal, or_, select
+from sqlalchemy.exc import IntegrityError
+
+from . import db, search, stats, facets
+from .background import BackgroundPool
+from .cache import invalidate_public_pages
+from .models import Job, Application, ArchivedJob, ArchivedApplication, CLOSED_APPLICATION_STATUSES
+
+_pool = None
+
+
+class ArchiveResult:
+    """Outcome of one archival run: jobs and applications moved, chunks committed, and job IDs of chunks that failed."""
+
+    def __init__(self):
+        self.jobs = 0
+        self.applications = 0
+        self.batches = 0
+        self.skipped = []
+
+    def to_dict(self):
+        return {'jobs': self.jobs, 'applications': self.applications, 'batches': self.batches,
+                'skipped': len(self.skipped)}
+
+
+def cutoff_for(days=None):
+    """Jobs posted before this datetime are old enough to archive."""
+    if days is None:
+        days = current_app.config.get('ARCHIVE_JOB_AGE_DAYS', 180)
+    return datetime.utcnow() - timedelta(days=days)
+
+def candidates(cutoff, include_unapplied=None):
+    """Query for expired jobs whose applications are all closed, oldest first (jobs without any only if include_unapplied)."""
+    if include_unapplied is None:
+        include_unapplied = current_app.config.get('ARCHIVE_UNAPPLIED_JOBS', False)
+    # A resume still waiting for the uploader keeps its job hot too (the uploader works on live rows only)
+    open_application = exists().where(Application.job_id == Job.id,
+                                      or_(Application.status.notin_(CLOSED_APPLICATION_STATUSES),
+                                          Application.resume_status.in_(('pending', 'uploading'))))
+    query = select(Job.id, Job.is_approved, Job.location, Job.category)\
+        .where(Job.posted_at < cutoff, ~open_application)\
+        .order_by(Job.posted_at, Job.id)
+    if not include_unapplied:
+        query = query.where(exists().where(Application.job_id == Job.id))
+    return query
+
+def _copy(source, target, where_column, ids, archived_at):
+    """INSERT INTO target SELECT <source columns>, :archived_at FROM source WHERE where_column IN :ids."""
+    names = [column.name for column in target.columns if column.name != 'archived_at']
+    rows = select(*[source.c[name] for name in names], literal(archived_at, db.DateTime))\
+        .where(where_column.in_(bindparam('ids', expanding=True)))
+    return db.session.execute(insert(target).from_select(names + ['archived_at'], rows), {'ids': ids}).rowcount
+
+
+def archive_batch(cutoff, batch_size, include_unapplied=None, exclude=None, attempted=None):
+    """
+    Moves one chunk of expired jobs and their applications to the archive tables. Caller commits.
+    Job IDs in `exclude` are left alone; the chunk's IDs are appended to `attempted` before anything is
+    written. Returns (jobs, applications).
+    """
+    query = candidates(cutoff, include_unapplied)
+    if exclude:
+        query = query.where(Job.id.notin_(exclude))
+    # Locking the rows on PostgreSQL blocks new applications (their FK check) until this chunk commits;
+    # SQLite ignores FOR UPDATE but serializes writers anyway
+    rows = db.session.execute(query.limit(batch_size).with_for_update(skip_locked=True)).all()
+    if not rows:
+        return 0, 0
+    ids = [row.id for row in rows]
+    if attempted is not None:
+        attempted.extend(ids)
+    ids_param = bindparam('ids', expanding=True)
+    now = datetime.utcnow()
+    _copy(Job.__table__, ArchivedJob.__table__, Job.id, ids, now)
+    moved = _copy(Application.__table__, ArchivedApplication.__table__, Application.job_id, ids, now)
+    db.session.execute(Application.__table__.delete().where(Application.job_id.in_(ids_param)), {'ids': ids})
+    db.session.execute(Job.__table__.delete().where(Job.id.in_(ids_param)), {'ids': ids})
+
+    # Derived data leaves with the jobs, in the same transaction
+    approved = [row for row in rows if row.is_approved]
+    stats.adjust({stats.TOTAL_JOBS: -len(rows), stats.APPROVED_JOBS: -len(approved),
+                  stats.PENDING_JOBS: -(len(rows) - len(approved))})
+    if approved:
+        facet_deltas = Counter()
+        for row in approved:
+            facet_deltas[(row.location, row.category)] -= 1
+        facets.adjust(facet_deltas)
+        search.remove_jobs([row.id for row in approved])
+        invalidate_public_pages() # Approved listings disappeared
+    return len(rows), moved
+
+
+def archive_expired(days=None, batch_size=None, max_batches=None, include_unapplied=None):
+    """Archives every expired job (chunk by chunk, one commit each; failing chunks are skipped). Returns an ArchiveResult."""
+    cutoff = cutoff_for(days)
+    batch_size = batch_size or current_app.config.get('ARCHIVE_BATCH_SIZE', 500)
+    result = ArchiveResult()
+    chunks = 0
+    while max_batches is None or chunks < max_batches:
+        chunks += 1
+        attempted = []
+        try:
+            jobs, applications = archive_batch(cutoff, batch_size, include_unapplied, exclude=result.skipped,
+                                               attempted=attempted)
+            db.session.commit()
+        except IntegrityError as e: # e.g. an id already in the archive tables: leave this chunk hot, go on with the rest
+            db.session.rollback()
+            if not attempted:
+                raise
+            result.skipped.extend(attempted)
+            current_app.logger.error(f"Archive chunk of {len(attempted)} job(s) (ids {min(attempted)}-{max(attempted)}) "
+                                     f"rolled back and skipped: {e}")
+            continue
+        if not jobs:
+            break
+        result.jobs += jobs
+        result.applications += applications
+        result.batches += 1
+    if result.jobs or result.skipped:
+        current_app.logger.info(f"Archived {result.jobs} job(s) and {result.applications} application(s) "
+                                f"in {result.batches} batch(es); {len(result.skipped)} job(s) skipped.")
+    return result
+
+def archive_once():
+    archive_expired()
+    return 0 # The pool sleeps until the next run
+
+
+# --- Removal With Users ---
+def remove_user_records(user_id):
+    """Deletes a user's archived applications, and archived jobs (with their applications) they posted. Call before commit."""
+    ids_param = bindparam('ids', expanding=True)
+    job_ids = list(db.session.scalars(select(ArchivedJob.id).where(ArchivedJob.employer_id == user_id)))
+    if job_ids:
+        db.session.execute(ArchivedApplication.__table__.delete().where(ArchivedApplication.job_id.in_(ids_param)),
+                           {'ids': job_ids})
+        db.session.execute(ArchivedJob.__table__.delete().where(ArchivedJob.id.in_(ids_param)), {'ids': job_ids})
+    db.session.execute(ArchivedApplication.__table__.delete().where(ArchivedApplication.job_seeker_id == user_id))
+
+
+def start_archiver(app):
+    """Starts the periodic archival thread (once per process)."""
+    global _pool
+    if _pool is None or not _pool.running:
+        interval = app.config.get('ARCHIVE_INTERVAL_SECONDS', 86400)
+        _pool = BackgroundPool(app, 'archiver', archive_once, threads=1,
+                               interval=interval, start_delay=interval).start() # Not on worker boot
+    return _pool
+
+
+# --- CLI ---
+@click.command('archive')
+@click.option('--days', type=int, default=None, help='Archive jobs posted more than this many days ago (default ARCHIVE_JOB_AGE_DAYS).')
+@click.option('--batch-size', type=int, default=None, help='Jobs per transaction (default ARCHIVE_BATCH_SIZE).')
+@click.option('--include-unapplied/--skip-unapplied', default=None,
+              help='Also archive old jobs nobody applied to (default ARCHIVE_UNAPPLIED_JOBS).')
+@click.option('--dry-run', is_flag=True, help='Only count the jobs that would be archived.')
+def archive_command(days, batch_size, include_unapplied, dry_run):
+    """Moves expired jobs with only closed applications (and those applications) to the archive tables."""
+    if dry_run:
+        query = candidates(cutoff_for(days), include_unapplied)
+        pending = db.session.scalar(select(func.count()).select_from(query.subquery()))
+        click.echo(f"{pending} job(s) would be archived.")
+        return
+    result = archive_expired(days=days, batch_size=batch_size, include_unapplied=include_unapplied)
+    click.echo(f"Archived {result.jobs} job(s) and {result.applications} application(s) in {result.batches} batch(es).")
+    if result.skipped:
+        click.echo(f"Skipped {len(result.skipped)} job(s) whose chunk failed (see the log): {result.skipped}")
+
+# --- End of archive.py ---
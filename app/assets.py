@@ -0,0 +1,145 @@
+# --- app/assets.py ---
+# Static asset build: content-hashed file names, precompressed variants, far-future caching.
+#
+# `flask assets-build` copies everything under STATIC_ROOT into STATIC_BUILD_DIR twice: under its own
+# name and under a fingerprinted name (css/style.css -> css/style.3f2a9c1b7d0e.css, hash of the
+# contents). url(...) references inside CSS are rewritten to the hashed names first, so a change to
+# an image also changes the stylesheet's hash. Every text-like file gets .gz and (with the brotli
+# package installed) .br siblings, and manifest.json maps original -> hashed names.
+# At start-up the manifest is loaded once. url_for('static', filename=...) then resolves to the
+# hashed name through a url_defaults hook, so templates don't change. WhiteNoise (run.py, wrap_static)
+# serves the build directory. It picks the .br/.gz variant the browser accepts and marks
+# fingerprinted files `Cache-Control: public, max-age=315360000, immutable`, so repeat page loads
+# request no assets at all. Without a build the app falls back to serving STATIC_ROOT as before.
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import click
+from flask import current_app
+
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 12
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.map', '.xml', '.ico', '.ttf', '.eot', '.otf')
+# Fingerprinted names (name.<hash>.ext), served with immutable far-future caching
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{%d}\.[^./]+$' % HASH_LENGTH)
+_CSS_URL_RE = re.compile(r'''url\(\s*(['"]?)(?!data:|https?:|//|#)([^'")?#]+)([^'")]*)\1\s*\)''')
+
+try:
+    import brotli
+except ImportError: # Optional (requirements: whitenoise[brotli]); gzip variants only without it
+    brotli = None
+
+
+def _hashed_name(name, content):
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    root, ext = os.path.splitext(name)
+    return f"{root}.{digest}{ext}"
+
+def _source_files(source):
+    for directory, _, files in os.walk(source):
+        for filename in sorted(files):
+            path = os.path.join(directory, filename)
+            yield os.path.relpath(path, source).replace(os.sep, '/'), path
+
+def _rewrite_css(name, content, manifest):
+    """Points relative url(...) references at their hashed names."""
+    base = os.path.dirname(name)
+    def replace(match):
+        quote, target, suffix = match.groups()
+        resolved = os.path.normpath(os.path.join(base, target)).replace(os.sep, '/')
+        if resolved not in manifest:
+            return match.group(0)
+        relative = os.path.relpath(manifest[resolved], base or '.').replace(os.sep, '/')
+        return f"url({quote}{relative}{suffix}{quote})"
+    return _CSS_URL_RE.sub(replace, content.decode('utf-8')).encode('utf-8')
+
+def _write(path, content, compress):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    if not compress:
+        return
+    compressed = gzip.compress(content, compresslevel=9, mtime=0)
+    if len(compressed) < len(content): # Not worth serving otherwise
+        with open(path + '.gz', 'wb') as f:
+            f.write(compressed)
+    if brotli is not None:
+        compressed = brotli.compress(content, quality=11)
+        if len(compressed) < len(content):
+            with open(path + '.br', 'wb') as f:
+                f.write(compressed)
+
+
+def build(source, output):
+    """Builds fingerprinted + precompressed copies of `source` into `output` (replaced). Returns the manifest."""
+    if os.path.isdir(output):
+        shutil.rmtree(output)
+    files = dict(_source_files(source))
+    manifest = {}
+    # CSS last, so the url(...) references it rewrites already have hashed names
+    for name in sorted(files, key=lambda name: (name.endswith('.css'), name)):
+        with open(files[name], 'rb') as f:
+            content = f.read()
+        if name.endswith('.css'):
+            content = _rewrite_css(name, content, manifest)
+        manifest[name] = _hashed_name(name, content)
+        compress = name.lower().endswith(COMPRESSIBLE)
+        _write(os.path.join(output, name), content, compress)
+        _write(os.path.join(output, manifest[name]), content, compress)
+    with open(os.path.join(output, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+def load_manifest(output):
+    """{original name: hashed name} from a build, or {} if there is none."""
+    try:
+        with open(os.path.join(output, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def init_assets(app):
+    """Loads the asset manifest and makes url_for('static', ...) resolve to fingerprinted names."""
+    manifest = load_manifest(app.config['STATIC_BUILD_DIR'])
+    app.extensions['asset_manifest'] = manifest
+    if not manifest:
+        return
+    @app.url_defaults
+    def _fingerprint_static(endpoint, values):
+        if endpoint == 'static' and 'filename' in values:
+            values['filename'] = manifest.get(values['filename'], values['filename'])
+
+def wrap_static(app):
+    """Serves static files with WhiteNoise: the build directory when there is a manifest, else STATIC_ROOT."""
+    from whitenoise import WhiteNoise
+    if app.extensions.get('asset_manifest'):
+        root = app.config['STATIC_BUILD_DIR']
+        app.wsgi_app = WhiteNoise(app.wsgi_app, root=root, prefix='/static',
+                                  immutable_file_test=lambda path, url: bool(HASHED_NAME_RE.search(url)),
+                                  max_age=app.config.get('STATIC_MAX_AGE', 60)) # Unhashed names only
+        app.logger.info(f"WhiteNoise serving built assets from: {root}")
+    elif os.path.isdir(app.config['STATIC_ROOT']):
+        app.wsgi_app = WhiteNoise(app.wsgi_app, root=app.config['STATIC_ROOT'], prefix='/static')
+        app.logger.warning(f"No asset build found; serving unversioned files from {app.config['STATIC_ROOT']}. "
+                           "Run `flask assets-build`.")
+    else:
+        app.logger.warning(f"Static folder not found at {app.config['STATIC_ROOT']}. WhiteNoise disabled.")
+
+
+# --- CLI ---
+@click.command('assets-build')
+def assets_build_command():
+    """Fingerprints and precompresses the static files into STATIC_BUILD_DIR (run at build time)."""
+    source, output = current_app.config['STATIC_ROOT'], current_app.config['STATIC_BUILD_DIR']
+    manifest = build(source, output)
+    variants = 'gzip + brotli' if brotli is not None else 'gzip (install brotli for .br variants)'
+    click.echo(f"Built {len(manifest)} asset(s) from {source} into {output} ({variants}).")
+    for name, hashed in sorted(manifest.items()):
+        click.echo(f"  {name} -> {hashed}")
+
+# --- End of assets.py ---
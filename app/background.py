@@ -0,0 +1,60 @@
+# --- app/background.py ---
+# Small thread pool for background jobs that poll the database (outbox sender etc.).
+# Each thread repeatedly calls `task()` inside an app context; when a call reports no work
+# done (returns 0/None) the thread sleeps for `interval` seconds before polling again.
+# `start_delay` postpones the first call (e.g. periodic jobs that shouldn't hit the DB on worker boot).
+
+import threading
+from flask import Flask
+
+from . import db
+
+
+class BackgroundPool:
+    """Runs `task` in `threads` daemon threads until stop() is called."""
+
+    def __init__(self, app: Flask, name, task, threads=1, interval=5.0, start_delay=0.0):
+        self.app = app
+        self.name = name
+        self.task = task
+        self.threads = max(1, int(threads))
+        self.interval = interval
+        self.start_delay = start_delay
+        self._stop = threading.Event()
+        self._workers = []
+
+    def start(self):
+        for i in range(self.threads):
+            t = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+            t.start()
+            self._workers.append(t)
+        self.app.logger.info(f"Background pool '{self.name}' started with {self.threads} thread(s).")
+        return self
+
+    def stop(self, timeout=10.0):
+        self._stop.set()
+        for t in self._workers:
+            t.join(timeout)
+        self._workers = []
+
+    @property
+    def running(self):
+        return any(t.is_alive() for t in self._workers)
+
+    def _run(self):
+        if self.start_delay:
+            self._stop.wait(self.start_delay)
+        while not self._stop.is_set():
+            done = 0
+            with self.app.app_context():
+                try:
+                    done = self.task() or 0
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(f"Background pool '{self.name}' task error: {e}")
+                finally:
+                    db.session.remove()
+            if not done:
+                self._stop.wait(self.interval)
+
+# --- End of background.py ---
@@ -0,0 +1,426 @@
+# --- app/benchmark.py ---
+# Synthetic data and endpoint benchmarks.
+#
+# `flask seed-data` bulk-inserts realistic volumes through the real models (defaults: 10k employers,
+# 200k jobs, 2M applications). Categories, locations and job popularity are skewed (a few categories,
+# cities and listings get most of the traffic), so list pages behave like they do in production.
+#
+# `flask benchmark` drives the Flask test client against the hot endpoints and reports p50/p95/p99
+# latency plus SQL statements per request. Results can be saved as a baseline JSON file (commit it
+# with the change) and later runs compared against it: p95 slower than the tolerance or more queries
+# than before counts as a regression and makes the command exit non-zero.
+#
+# `flask password-benchmark` measures password verifications (= logins) per second per core for the
+# configured PASSWORD_HASH_METHOD, or any methods passed with --method, to help pick a cost.
+
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from sqlalchemy import event, func, insert
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from . import db, search, counters, stats, facets, passwords
+from .cache import invalidate_public_pages
+
+DEFAULT_BASELINE = 'benchmarks/baseline.json'
+SEED_EMAIL_DOMAIN = 'bench.example.com'
+
+# Ordered most to least common; weights follow a Zipf curve over the position
+CATEGORIES = [
+    'Software Development', 'Sales', 'Customer Support', 'Marketing', 'Finance', 'Operations',
+    'Data Science', 'Design', 'Human Resources', 'Healthcare', 'Education', 'Logistics',
+    'Legal', 'Manufacturing', 'Hospitality', 'Construction', 'Research', 'Security',
+]
+LOCATIONS = [
+    'Bengaluru', 'Chennai', 'Hyderabad', 'Mumbai', 'Pune', 'Delhi', 'Remote', 'Noida', 'Gurugram',
+    'Kolkata', 'Coimbatore', 'Ahmedabad', 'Kochi', 'Jaipur', 'Madurai', 'Trichy', 'Indore',
+    'Chandigarh', 'Lucknow', 'Nagpur', 'Mysuru', 'Vizag', 'Bhubaneswar', 'Salem',
+]
+TITLE_LEVELS = ['Junior', 'Associate', '', 'Senior', 'Lead', 'Principal']
+TITLE_ROLES = ['Engineer', 'Analyst', 'Manager', 'Specialist', 'Consultant', 'Executive', 'Developer', 'Coordinator']
+SKILLS = [
+    'python', 'flask', 'sql', 'postgresql', 'excel', 'communication', 'negotiation', 'react', 'java',
+    'aws', 'docker', 'accounting', 'crm', 'figma', 'tableau', 'recruiting', 'supply chain', 'linux',
+]
+# Most applications never leave 'Submitted'
+STATUS_WEIGHTS = {
+    'Submitted': 55, 'Viewed': 18, 'Shortlisted': 8, 'Interviewing': 5, 'Offer Made': 2,
+    'Hired': 1, 'Offer Declined': 1, 'Rejected': 10,
+}
+
+
+def _zipf_weights(n, s=1.1):
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _bulk_insert(model, rows, batch_size):
+    """Inserts row dicts in executemany batches, one transaction per batch. Returns the row count."""
+    total = 0
+    for batch in _batches(rows, batch_size):
+        db.session.execute(insert(model), batch)
+        db.session.commit()
+        total += len(batch)
+    return total
+
+def _new_ids(model, after_id, **filters):
+    return [row[0] for row in db.session.query(model.id).filter(model.id > after_id)
+            .filter_by(**filters).order_by(model.id)]
+
+def _max_id(model):
+    return db.session.query(func.max(model.id)).scalar() or 0
+
+
+# --- Seeding ---
+def seed_dataset(employers=10000, jobs=200000, applications=2000000, seekers=None,
+                 approved_ratio=0.85, days=180, batch_size=5000, seed=42, echo=print):
+    """
+    Bulk-generates users, jobs and applications. Returns a dict of row counts.
+    All seeded users share one password hash and use @bench.example.com addresses.
+    """
+    from .models import User, Job, Application
+    rng = random.Random(seed)
+    seekers = seekers or max(1, applications // 20)
+    now = datetime.utcnow()
+    span = timedelta(days=days).total_seconds()
+    placeholder = User()
+    placeholder.set_password('bench-password') # Hashed once; hashing per row would dominate seeding
+    password_hash = placeholder.password_hash
+    run_tag = f"{seed}-{int(time.time())}" # Keeps usernames/emails unique across repeated runs
+
+    def past(rng_value):
+        return now - timedelta(seconds=rng_value * span)
+
+    # Employers and job seekers
+    before_users = _max_id(User)
+    def user_rows(role, count):
+        for i in range(count):
+            name = f"bench_{role}_{run_tag}_{i}"
+            yield {
+                'username': name, 'email': f"{name}@{SEED_EMAIL_DOMAIN}", 'password_hash': password_hash,
+                'role': role, 'is_verified': True, 'created_at': past(rng.random()),
+                'company_name': f"Bench Company {i}" if role == 'employer' else None,
+            }
+    _bulk_insert(User, user_rows('employer', employers), batch_size)
+    employer_rows = db.session.query(User.id, User.company_name)\
+        .filter(User.id > before_users, User.role == 'employer').order_by(User.id).all()
+    echo(f"Employers: {len(employer_rows)}")
+    _bulk_insert(User, user_rows('job_seeker', seekers), batch_size)
+    seeker_ids = _new_ids(User, before_users, role='job_seeker')
+    echo(f"Job seekers: {len(seeker_ids)}")
+
+    # Jobs: employers, categories and locations all skewed towards the head of their lists
+    before_jobs = _max_id(Job)
+    category_weights = _zipf_weights(len(CATEGORIES))
+    location_weights = _zipf_weights(len(LOCATIONS))
+    employer_weights = _zipf_weights(len(employer_rows), s=0.8)
+    def job_rows():
+        picked_employers = rng.choices(employer_rows, weights=employer_weights, k=jobs)
+        for employer_id, company_name in picked_employers:
+            category = rng.choices(CATEGORIES, weights=category_weights)[0]
+            level = rng.choice(TITLE_LEVELS)
+            title = ' '.join(part for part in (level, category.split()[0], rng.choice(TITLE_ROLES)) if part)
+            skills = ', '.join(rng.sample(SKILLS, 4))
+            yield {
+                'title': title, 'category': category,
+                'location': rng.choices(LOCATIONS, weights=location_weights)[0],
+                'description': f"{title} at {company_name}. Skills: {skills}. " * rng.randint(2, 6),
+                'salary': f"{rng.randint(3, 40)} LPA" if rng.random() < 0.7 else None,
+                'company_name': company_name, 'employer_id': employer_id,
+                'posted_at': past(rng.random()), 'is_approved': rng.random() < approved_ratio,
+            }
+    _bulk_insert(Job, job_rows(), batch_size)
+    approved_job_ids = _new_ids(Job, before_jobs, is_approved=True)
+    echo(f"Jobs: {_max_id(Job) - before_jobs} ({len(approved_job_ids)} approved)")
+
+    # Applications: popular jobs (low index) attract most applicants; one application per (job, seeker)
+    statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    def application_rows():
+        if not approved_job_ids:
+            return
+        remaining = applications
+        mean = applications / len(seeker_ids)
+        max_per_seeker = min(len(approved_job_ids), 500)
+        for position, seeker_id in enumerate(seeker_ids):
+            if remaining <= 0:
+                break
+            if position == len(seeker_ids) - 1:
+                want = min(remaining, max_per_seeker)
+            else:
+                want = min(remaining, max_per_seeker, 1 + int(rng.expovariate(1.0 / mean)))
+            chosen = set()
+            for _ in range(want * 3):
+                chosen.add(approved_job_ids[int(len(approved_job_ids) * rng.random() ** 3)])
+                if len(chosen) >= want:
+                    break
+            for job_id in chosen:
+                status = rng.choices(statuses, weights=status_weights)[0]
+                applied_at = past(rng.random())
+                yield {
+                    'job_id': job_id, 'job_seeker_id': seeker_id, 'applied_at': applied_at,
+                    'current_ctc': f"{rng.randint(2, 30)} LPA", 'expected_ctc': f"{rng.randint(3, 45)} LPA",
+                    'notice_period_days': rng.choice((0, 15, 30, 60, 90)),
+                    'resume_public_id': f"job_portal/resumes/{job_id}/bench_{seeker_id}.pdf",
+                    'resume_status': 'uploaded', 'resume_upload_attempts': 0, 'status': status,
+                    'rejection_reason': 'Not a fit (synthetic)' if status == 'Rejected' else None,
+                    'status_updated_at': applied_at if status != 'Submitted' else None,
+                }
+            remaining -= len(chosen)
+    application_count = _bulk_insert(Application, application_rows(), batch_size)
+    echo(f"Applications: {application_count}")
+
+    # Derived data the views rely on
+    counters.recompute_counters()
+    stats.reconcile()
+    facets.rebuild()
+    search.rebuild_index()
+    invalidate_public_pages()
+    db.session.commit()
+    echo("Application counters, site stats, job facets and search index rebuilt, public page cache invalidated.")
+    return {'employers': len(employer_rows), 'job_seekers': len(seeker_ids),
+            'jobs': _max_id(Job) - before_jobs, 'applications': application_count}
+
+
+# --- Benchmark Runner ---
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class QueryCounter:
+    """Counts SQL statements on the app's engine while active (the test client runs in this thread)."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def _fixtures():
+    """Picks the users/jobs that make the heaviest pages: busiest job, its employer, most active seeker, an admin."""
+    from .models import User, Job, Application
+    busiest = db.session.query(Application.job_id, func.count(Application.id).label('n'))\
+        .group_by(Application.job_id).order_by(func.count(Application.id).desc()).first()
+    job = db.session.get(Job, busiest.job_id) if busiest else Job.query.order_by(Job.id).first()
+    seeker = db.session.query(Application.job_seeker_id, func.count(Application.id))\
+        .group_by(Application.job_seeker_id).order_by(func.count(Application.id).desc()).first()
+    admin = User.query.filter_by(role='admin').order_by(User.id).first()
+    top_category = db.session.query(Job.category).filter_by(is_approved=True)\
+        .group_by(Job.category).order_by(func.count(Job.id).desc()).limit(1).scalar()
+    return {
+        'job_id': job.id if job else None,
+        'employer_id': job.employer_id if job else None,
+        'seeker_id': seeker[0] if seeker else None,
+        'admin_id': admin.id if admin else None,
+        'category': top_category or '',
+    }
+
+
+def default_scenarios(fx):
+    """(name, url, user id to log in as or None) for the hot endpoints."""
+    scenarios = [
+        ('index', '/', None),
+        ('job_list', '/jobs/list', None),
+        ('job_list_deep_page', '/jobs/list?page=200', None),
+        ('job_list_cursor', '/jobs/list?paging=cursor', None),
+        ('job_list_search', '/jobs/list?q=senior+engineer', None),
+        ('job_list_filtered', f"/jobs/list?category={fx['category']}&location=Chennai", None),
+    ]
+    if fx['job_id'] and fx['employer_id']:
+        scenarios += [
+            ('employer_dashboard', '/employer/dashboard', fx['employer_id']),
+            ('view_applications', f"/employer/jobs/{fx['job_id']}/applications", fx['employer_id']),
+            ('view_applications_deep_page', f"/employer/jobs/{fx['job_id']}/applications?page=20", fx['employer_id']),
+        ]
+    if fx['seeker_id']:
+        scenarios.append(('my_applications', '/jobs/my-applications', fx['seeker_id']))
+    if fx['admin_id']:
+        scenarios += [
+            ('admin_dashboard', '/admin/dashboard', fx['admin_id']),
+            ('manage_jobs', '/admin/jobs', fx['admin_id']),
+            ('manage_jobs_pending', '/admin/jobs?status=pending', fx['admin_id']),
+            ('manage_users', '/admin/users', fx['admin_id']),
+        ]
+    return scenarios
+
+
+def run_scenario(app, url, user_id=None, iterations=50, warmup=5):
+    """Requests `url` repeatedly; returns latency percentiles (ms) and queries per request."""
+    client = app.test_client()
+    if user_id is not None:
+        with client.session_transaction() as sess: # Log in without going through the form/CSRF
+            sess['_user_id'] = str(user_id)
+            sess['_fresh'] = True
+    with app.app_context():
+        engine = db.engine
+    timings, queries, status = [], [], None
+    with QueryCounter(engine) as counter:
+        for i in range(warmup + iterations):
+            before = counter.count
+            start = time.perf_counter()
+            response = client.get(url)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            status = response.status_code
+            if i >= warmup:
+                timings.append(elapsed_ms)
+                queries.append(counter.count - before)
+    timings.sort()
+    return {
+        'url': url, 'status': status, 'iterations': iterations,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'p99_ms': round(percentile(timings, 99), 2),
+        'queries': max(queries) if queries else 0,
+    }
+
+
+def _outside_app_context(fn, *args, **kwargs):
+    """
+    Runs fn in a fresh thread. The CLI command holds an app context, and requests made inside it
+    would share its `g` (query counts, the logged-in user) instead of getting one per request.
+    """
+    outcome = {}
+    def target():
+        try:
+            outcome['value'] = fn(*args, **kwargs)
+        except BaseException as e:
+            outcome['error'] = e
+    thread = threading.Thread(target=target, name='benchmark')
+    thread.start()
+    thread.join()
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['value']
+
+
+def compare_to_baseline(results, baseline, tolerance=0.2):
+    """Returns a list of regression messages (slower p95 beyond `tolerance`, or more queries)."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name}: {current['queries']} queries per request (baseline {previous['queries']})")
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms (baseline {previous['p95_ms']} ms, +{tolerance:.0%} allowed)")
+    return regressions
+
+
+def password_rate(method=None, seconds=2.0):
+    """Single-thread password checks per second for a werkzeug method (None = werkzeug default)."""
+    stored = generate_password_hash('bench-password', method) if method else generate_password_hash('bench-password')
+    checks, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds or checks == 0:
+        check_password_hash(stored, 'bench-password')
+        checks += 1
+    elapsed = time.perf_counter() - start
+    return {'method': stored.split('$', 1)[0], 'per_second_per_core': round(checks / elapsed, 2),
+            'ms_per_check': round(elapsed / checks * 1000, 2)}
+
+
+# --- CLI ---
+@click.command('seed-data')
+@click.option('--employers', default=10000, show_default=True)
+@click.option('--jobs', default=200000, show_default=True)
+@click.option('--applications', default=2000000, show_default=True)
+@click.option('--seekers', default=None, type=int, help='Job seekers to create (default: applications / 20).')
+@click.option('--approved-ratio', default=0.85, show_default=True)
+@click.option('--batch-size', default=5000, show_default=True, help='Rows per INSERT batch / transaction.')
+@click.option('--seed', default=42, show_default=True, help='Random seed (same seed, same data).')
+def seed_data_command(employers, jobs, applications, seekers, approved_ratio, batch_size, seed):
+    """Bulk-generates synthetic employers, jobs and applications for benchmarking."""
+    start = time.perf_counter()
+    counts = seed_dataset(employers=employers, jobs=jobs, applications=applications, seekers=seekers,
+                          approved_ratio=approved_ratio, batch_size=batch_size, seed=seed, echo=click.echo)
+    click.echo(f"Seeded {counts} in {time.perf_counter() - start:.1f}s.")
+
+@click.command('password-benchmark')
+@click.option('--method', 'methods', multiple=True, help='Werkzeug method string(s) to compare (default: PASSWORD_HASH_METHOD).')
+@click.option('--seconds', default=2.0, show_default=True, help='Measuring time per method.')
+def password_benchmark_command(methods, seconds):
+    """Reports password checks (logins) per second per core for the configured or given hash methods."""
+    workers = current_app.config.get('PASSWORD_HASH_WORKERS', 2)
+    for method in methods or [passwords.hash_method()]:
+        result = password_rate(method, seconds)
+        click.echo(f"{result['method']:<28}{result['per_second_per_core']:>10} logins/s/core"
+                   f"{result['ms_per_check']:>10} ms each   (~{result['per_second_per_core'] * workers:.0f}/s per process"
+                   f" with PASSWORD_HASH_WORKERS={workers}, if cores allow)")
+
+@click.command('benchmark')
+@click.option('--iterations', default=50, show_default=True, help='Timed requests per endpoint.')
+@click.option('--warmup', default=5, show_default=True, help='Untimed requests per endpoint first.')
+@click.option('--only', multiple=True, help='Run only these scenarios (repeatable).')
+@click.option('--baseline', 'baseline_path', default=DEFAULT_BASELINE, show_default=True)
+@click.option('--save-baseline', is_flag=True, help='Write these results to the baseline file.')
+@click.option('--tolerance', default=0.2, show_default=True, help='Allowed p95 slowdown vs the baseline.')
+@click.option('--output', default=None, help='Also write results as JSON to this path.')
+@click.option('--page-cache/--no-page-cache', default=False, show_default=True,
+              help='Serve anonymous pages from the page cache (off measures the database work).')
+def benchmark_command(iterations, warmup, only, baseline_path, save_baseline, tolerance, output, page_cache):
+    """Benchmarks the hot endpoints and compares p50/p95/p99 and queries/request with a baseline."""
+    app = current_app._get_current_object()
+    app.config['PAGE_CACHE_ENABLED'] = page_cache
+    fx = _fixtures()
+    db.session.remove()
+
+    results = {}
+    click.echo(f"{'scenario':<30}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}")
+    for name, url, user_id in default_scenarios(fx):
+        if only and name not in only:
+            continue
+        result = _outside_app_context(run_scenario, app, url, user_id=user_id, iterations=iterations, warmup=warmup)
+        results[name] = result
+        click.echo(f"{name:<30}{result['status']:>7}{result['p50_ms']:>10}{result['p95_ms']:>10}"
+                   f"{result['p99_ms']:>10}{result['queries']:>9}")
+
+    if output:
+        with open(output, 'w') as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+    if save_baseline:
+        os.makedirs(os.path.dirname(baseline_path) or '.', exist_ok=True)
+        with open(baseline_path, 'w') as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+        click.echo(f"Baseline saved to {baseline_path}.")
+        return
+
+    try:
+        with open(baseline_path) as fh:
+            baseline = json.load(fh)
+    except FileNotFoundError:
+        click.echo(f"No baseline at {baseline_path}; run with --save-baseline to create one.")
+        return
+    regressions = compare_to_baseline(results, baseline, tolerance)
+    if regressions:
+        click.echo("Regressions against baseline:")
+        for message in regressions:
+            click.echo(f"  - {message}")
+        raise SystemExit(1)
+    click.echo("No regressions against baseline.")
+
+# --- End of benchmark.py ---
@@ -0,0 +1,194 @@
+# --- app/cache.py ---
+# Caching for anonymous public pages (main.index, jobs.job_list).
+#
+# Two tiers: an in-process LRU with TTL in front of an optional shared backend (CACHE_BACKEND:
+# 'local' = none, 'redis' = CACHE_REDIS_URL, or 'package.module:ClassName' for a custom class with
+# get/set/delete). Keys embed a version number stored in the `cache_versions` table; views bump it
+# (inside their own transaction) whenever a public listing changes, so a withdrawn listing is never
+# served from any worker's cache once the change commits.
+
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+from flask import current_app, request, session, make_response
+from flask_login import current_user
+
+from . import db
+
+PUBLIC_PAGES = 'public_pages'
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize=512, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + (ttl or self.ttl))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisBackend:
+    """Shared cache backend on Redis (needs the optional `redis` package)."""
+
+    def __init__(self, url, prefix='job_portal:'):
+        import redis # Optional dependency, only needed for this backend
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=int(ttl) if ttl else None)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+
+class TieredCache:
+    """In-process TTLCache in front of an optional shared backend. Values must be bytes for shared backends."""
+
+    def __init__(self, local, shared=None):
+        self.local = local
+        self.shared = shared
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            try:
+                value = self.shared.get(key)
+            except Exception as e:
+                current_app.logger.warning(f"Shared cache get failed: {e}")
+                value = None
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.local.set(key, value, ttl)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value, ttl or self.local.ttl)
+            except Exception as e:
+                current_app.logger.warning(f"Shared cache set failed: {e}")
+
+    def delete(self, key):
+        self.local.delete(key)
+        if self.shared is not None:
+            try:
+                self.shared.delete(key)
+            except Exception as e:
+                current_app.logger.warning(f"Shared cache delete failed: {e}")
+
+
+def make_shared_backend(app):
+    """Builds the shared backend named by CACHE_BACKEND (None for 'local')."""
+    name = app.config.get('CACHE_BACKEND', 'local')
+    try:
+        if name == 'local':
+            return None
+        if name == 'redis':
+            return RedisBackend(app.config['CACHE_REDIS_URL'])
+        module_name, class_name = name.split(':', 1)
+        return getattr(importlib.import_module(module_name), class_name)(app)
+    except Exception as e:
+        app.logger.error(f"Cache backend '{name}' unavailable, using in-process cache only: {e}")
+        return None
+
+
+def init_cache(app):
+    """Creates the page cache for the app (stored in app.extensions['page_cache'])."""
+    local = TTLCache(maxsize=app.config.get('PAGE_CACHE_MAX_ENTRIES', 512),
+                     ttl=app.config.get('PAGE_CACHE_TTL', 60))
+    app.extensions['page_cache'] = TieredCache(local, make_shared_backend(app))
+
+
+# --- Versions (invalidation) ---
+def current_version(name):
+    from .models import CacheVersion
+    return db.session.query(CacheVersion.version).filter_by(name=name).scalar() or 0
+
+def version_info(name):
+    """(version, time of the last bump or None) for a namespace, in one primary-key read."""
+    from .models import CacheVersion
+    row = db.session.query(CacheVersion.version, CacheVersion.updated_at).filter_by(name=name).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+def bump_version(name):
+    """Invalidates every cache entry built under `name`. Joins the caller's transaction; commit after calling."""
+    from .models import CacheVersion
+    now = datetime.utcnow()
+    updated = CacheVersion.query.filter_by(name=name)\
+        .update({'version': CacheVersion.version + 1, 'updated_at': now}, synchronize_session=False)
+    if not updated:
+        db.session.add(CacheVersion(name=name, version=1, updated_at=now))
+
+def invalidate_public_pages():
+    bump_version(PUBLIC_PAGES)
+
+
+# --- Page Cache Decorator ---
+def _cacheable():
+    return (current_app.config.get('PAGE_CACHE_ENABLED')
+            and request.method == 'GET'
+            and not current_user.is_authenticated
+            and not session.get('_flashes')) # Pending flash messages are rendered into the page
+
+def cached_page(view):
+    """Caches a view's full response for anonymous visitors, keyed by path + query string."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not _cacheable():
+            return view(*args, **kwargs)
+        page_cache = current_app.extensions['page_cache']
+        args_key = '&'.join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+        key = f"page:{current_version(PUBLIC_PAGES)}:{request.path}?{args_key}"
+
+        body = page_cache.get(key)
+        if body is not None:
+            response = make_response(body)
+            response.headers['X-Cache'] = 'HIT'
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.direct_passthrough:
+                page_cache.set(key, response.get_data())
+            response.headers['X-Cache'] = 'MISS'
+        response.vary.add('Cookie') # Logged-in users get uncached pages
+        return response
+    return wrapper
+
+# --- End of cache.py ---
@@ -0,0 +1,100 @@
+# --- app/concurrency.py ---
+# Cooperative (gevent) worker support.
+#
+# WEB_WORKER_CLASS=gevent runs gunicorn's gevent workers (see gunicorn.conf.py). Gunicorn monkey-patches
+# the standard library before it imports the app, so socket I/O (Cloudinary uploads in apply_job, SMTP
+# sends) yields to other requests instead of blocking the worker. init_concurrency() covers what the
+# patching doesn't:
+#   * psycopg2 talks to PostgreSQL through libpq's own sockets; a gevent wait callback makes queries yield.
+#   * Password hashing is CPU work; passwords.py hashes on gevent's native-thread pool (native_executor),
+#     so one login doesn't stall every other request on the worker.
+# Sessions: Flask-SQLAlchemy scopes db.session to the app context, and contexts are greenlet-local under
+# gevent, so each request keeps its own session. The greenlets share the engine's pool (app/engine.py).
+# Views call release_connection() before slow network I/O so a request doesn't sit on an idle pooled
+# connection during an upload, and mail sent after commit goes out in its own greenlet (spawn).
+# SQLite's lock waits can't yield to other greenlets, so run gevent workers against PostgreSQL.
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+from . import db
+
+
+def is_cooperative():
+    """True inside a gevent-patched process (gunicorn's gevent worker)."""
+    if 'gevent' not in sys.modules:
+        return False
+    from gevent import monkey
+    return monkey.is_module_patched('socket')
+
+def native_executor(max_workers, thread_name_prefix=''):
+    """Executor on real OS threads, for CPU work (patched threads are greenlets sharing one thread)."""
+    if is_cooperative():
+        from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+        return NativeThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+def spawn(fn, *args):
+    """Runs fn(*args) in its own greenlet with an app context when cooperative, else inline."""
+    if not is_cooperative():
+        return fn(*args)
+    import gevent
+    app = current_app._get_current_object()
+    def run():
+        with app.app_context():
+            fn(*args)
+    return gevent.spawn(run)
+
+def release_connection():
+    """
+    Ends the session's read-only transaction so its connection goes back to the pool before slow network
+    I/O. Loaded objects stay usable (nothing is expired). No-op if there are unflushed changes.
+    """
+    session = db.session()
+    if not session.in_transaction() or session.new or session.dirty or session.deleted:
+        return
+    expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        session.commit()
+    finally:
+        session.expire_on_commit = expire_on_commit
+
+
+def patch_psycopg():
+    """Makes psycopg2 wait for PostgreSQL through gevent. Returns False if psycopg2 isn't installed."""
+    try:
+        from psycopg2 import extensions, OperationalError
+    except ImportError:
+        return False
+    from gevent.socket import wait_read, wait_write
+
+    def gevent_wait_callback(conn, timeout=None):
+        while True:
+            state = conn.poll()
+            if state == extensions.POLL_OK:
+                break
+            elif state == extensions.POLL_READ:
+                wait_read(conn.fileno(), timeout=timeout)
+            elif state == extensions.POLL_WRITE:
+                wait_write(conn.fileno(), timeout=timeout)
+            else:
+                raise OperationalError(f"Bad result from poll: {state!r}")
+
+    extensions.set_wait_callback(gevent_wait_callback)
+    return True
+
+
+def init_concurrency(app):
+    """Adapts DB drivers to a gevent-patched worker (nothing to do in sync/gthread workers)."""
+    if not is_cooperative():
+        return
+    with app.app_context():
+        backend = db.engine.dialect.name
+    if backend == 'postgresql' and patch_psycopg():
+        app.logger.info("Cooperative worker: psycopg2 gevent wait callback installed.")
+    elif backend == 'sqlite':
+        app.logger.warning("Cooperative worker on SQLite: lock waits block the whole worker. Use PostgreSQL.")
+
+# --- End of concurrency.py ---
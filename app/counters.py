@@ -0,0 +1,100 @@
+# --- app/counters.py ---
+# Denormalized application counters on Job (applications_count plus one column per status).
+#
+# Views call these helpers *before* committing. Each one is a single UPDATE ... SET col = col + n, so
+# the counters change in the same transaction as the applications themselves and concurrent
+# requests never lose an increment. Deleting a job drops its counters along with it. If the counters
+# ever drift (bulk loads, manual SQL), `flask counters-repair` recomputes them from `applications`.
+
+from collections import defaultdict
+import click
+from sqlalchemy import func, update
+
+from . import db
+from .models import Job, Application, APPLICATION_STATUS_COUNTERS
+
+REPAIR_BATCH_SIZE = 1000
+
+
+def _status_column(status):
+    column = APPLICATION_STATUS_COUNTERS.get(status)
+    return getattr(Job, column) if column else None
+
+def _adjust(job_id, deltas):
+    """Adds {column attribute: delta} to one job's counters."""
+    values = {column: column + delta for column, delta in deltas.items() if delta}
+    if values:
+        Job.query.filter_by(id=job_id).update(values, synchronize_session=False)
+
+
+# --- Maintenance (call before db.session.commit()) ---
+def application_added(job_id, status='Submitted'):
+    deltas = {Job.applications_count: 1}
+    column = _status_column(status)
+    if column is not None:
+        deltas[column] = 1
+    _adjust(job_id, deltas)
+
+def application_status_changed(job_id, old_status, new_status):
+    if old_status == new_status:
+        return
+    deltas = {}
+    old_column, new_column = _status_column(old_status), _status_column(new_status)
+    if old_column is not None:
+        deltas[old_column] = -1
+    if new_column is not None:
+        deltas[new_column] = deltas.get(new_column, 0) + 1
+    _adjust(job_id, deltas)
+
+def remove_seeker_applications(user_id):
+    """Deletes a job seeker's applications and takes them off each job's counters. Returns the number deleted."""
+    rows = db.session.query(Application.job_id, Application.status, func.count(Application.id))\
+        .filter(Application.job_seeker_id == user_id).group_by(Application.job_id, Application.status).all()
+    per_job = defaultdict(dict)
+    for job_id, status, count in rows:
+        deltas = per_job[job_id]
+        deltas[Job.applications_count] = deltas.get(Job.applications_count, 0) - count
+        column = _status_column(status)
+        if column is not None:
+            deltas[column] = deltas.get(column, 0) - count
+    for job_id, deltas in per_job.items():
+        _adjust(job_id, deltas)
+    return Application.query.filter_by(job_seeker_id=user_id).delete(synchronize_session=False)
+
+
+# --- Repair ---
+def recompute_counters(job_ids=None):
+    """Rebuilds counters from the applications table (all jobs, or just `job_ids`). Caller commits. Returns jobs updated."""
+    columns = ['applications_count'] + list(APPLICATION_STATUS_COUNTERS.values())
+    zero = {column: 0 for column in columns}
+    reset = update(Job).values(**zero)
+    grouped = db.session.query(Application.job_id, Application.status, func.count(Application.id))\
+        .group_by(Application.job_id, Application.status)
+    if job_ids is not None:
+        reset = reset.where(Job.id.in_(job_ids))
+        grouped = grouped.filter(Application.job_id.in_(job_ids))
+    db.session.execute(reset.execution_options(synchronize_session=False))
+
+    totals = defaultdict(lambda: dict(zero))
+    for job_id, status, count in grouped:
+        row = totals[job_id]
+        row['applications_count'] += count
+        column = APPLICATION_STATUS_COUNTERS.get(status)
+        if column:
+            row[column] += count
+    rows = [{'id': job_id, **values} for job_id, values in totals.items()]
+    for start in range(0, len(rows), REPAIR_BATCH_SIZE):
+        db.session.execute(update(Job), rows[start:start + REPAIR_BATCH_SIZE]) # Bulk UPDATE by primary key
+    return len(rows)
+
+
+# --- CLI ---
+@click.command('counters-repair')
+@click.option('--job-id', 'job_ids', multiple=True, type=int, help='Only these jobs (repeatable). Default: all.')
+def counters_repair_command(job_ids):
+    """Recomputes per-job application counters from the applications table."""
+    updated = recompute_counters(list(job_ids) or None)
+    db.session.commit()
+    click.echo(f"Application counters recomputed ({updated} job(s) with applications).")
+
+# --- End of counters.py ---
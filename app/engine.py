@@ -0,0 +1,193 @@
+# --- app/engine.py ---
+# Database engine profiles and connection-pool metrics.
+#
+# DB_ENGINE_PROFILE picks the pool settings handed to Flask-SQLAlchemy (SQLALCHEMY_ENGINE_OPTIONS):
+#   * web       - gunicorn workers: pool sized to the threads that can hold a connection at once
+#                 (WEB_THREADS request threads, or COOPERATIVE_POOL_SIZE for gevent workers, plus this
+#                 process's background threads), a little overflow, short checkout timeout, pre-ping and
+#                 recycling so dropped server connections don't 500
+#   * worker    - CLI / standalone outbox and upload workers: a small pool, patient checkout
+#   * pgbouncer - an external transaction pooler does the pooling: NullPool, no pre-ping
+#   * default   - SQLAlchemy's defaults
+# DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT / DB_POOL_RECYCLE override single values.
+# SQLite ignores the profile's pre-ping/recycle and gets pragmas on every new connection instead:
+# journal_mode=WAL (readers no longer wait for a writer), synchronous=NORMAL (safe with WAL, no
+# fsync per commit) and busy_timeout (writers queue instead of failing with "database is locked").
+#
+# Queue pools are created as MeteredQueuePool, which records how long each checkout waited, checkout
+# timeouts and the peak number of connections in use. pool_stats() reports them with the current
+# saturation (in use / pool_size + max_overflow) at /admin/sql-stats, and per-request waits go into
+# the Server-Timing header when SQL_INSTRUMENTATION is on.
+
+import threading
+import time
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
+
+from . import db
+
+PROFILES = {
+    'web': {'max_overflow': 5, 'pool_timeout': 10, 'pool_recycle': 1800, 'pool_pre_ping': True},
+    'worker': {'pool_size': 2, 'max_overflow': 2, 'pool_timeout': 30, 'pool_recycle': 1800, 'pool_pre_ping': True},
+    'pgbouncer': {'poolclass': NullPool, 'pool_pre_ping': False},
+    'default': {},
+}
+_OVERRIDES = {'pool_size': 'DB_POOL_SIZE', 'max_overflow': 'DB_MAX_OVERFLOW',
+              'pool_timeout': 'DB_POOL_TIMEOUT', 'pool_recycle': 'DB_POOL_RECYCLE'}
+_SERVER_ONLY = ('pool_pre_ping', 'pool_recycle') # Pointless for a local SQLite file
+# Request connections for a gevent worker: greenlets hold one only while talking to the database
+# (see concurrency.release_connection), so a few serve many concurrent requests
+COOPERATIVE_POOL_SIZE = 10
+
+
+# --- Pool Metrics ---
+class PoolMetrics:
+    """Checkout counts, wait times, timeouts and peak connections in use for this process's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.waited = 0 # Checkouts that took longer than 1 ms (pool empty, or a new connection opened)
+            self.wait_ms_total = 0.0
+            self.wait_ms_max = 0.0
+            self.timeouts = 0
+            self.peak_in_use = 0
+
+    def record_checkout(self, wait_ms, in_use):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            if wait_ms > 1.0:
+                self.waited += 1
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            self.peak_in_use = max(self.peak_in_use, in_use)
+        if has_app_context():
+            g._pool_wait_ms = g.get('_pool_wait_ms', 0.0) + wait_ms
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'waited': self.waited,
+                'avg_wait_ms': round(self.wait_ms_total / self.checkouts, 3) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.wait_ms_max, 3),
+                'timeouts': self.timeouts,
+                'peak_in_use': self.peak_in_use,
+            }
+
+metrics = PoolMetrics()
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that times every checkout (waiting for a free connection, or opening an overflow one)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_checkout((time.perf_counter() - started) * 1000, self.checkedout())
+        return connection
+
+
+# --- Engine Options ---
+def _int_or_none(value):
+    return None if value in (None, '') else int(value)
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database URL and DB_ENGINE_PROFILE."""
+    name = config.get('DB_ENGINE_PROFILE', 'web')
+    if name not in PROFILES:
+        raise ValueError(f"Unknown DB_ENGINE_PROFILE '{name}' (choose from {', '.join(PROFILES)})")
+    options = dict(PROFILES[name])
+    if name == 'web':
+        request_slots = COOPERATIVE_POOL_SIZE if config.get('WEB_WORKER_CLASS') == 'gevent' else config.get('WEB_THREADS', 1)
+        options['pool_size'] = request_slots + background_threads(config)
+    for option, key in _OVERRIDES.items():
+        value = _int_or_none(config.get(key))
+        if value is not None:
+            options[option] = value
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite':
+        if url.database in (None, '', ':memory:'): # SQLAlchemy picks a single-connection pool for these
+            return {}
+        options = {key: value for key, value in options.items() if key not in _SERVER_ONLY}
+    if options.get('poolclass') is None and name != 'default':
+        options['poolclass'] = MeteredQueuePool
+    return options
+
+def background_threads(config):
+    """In-process background threads that may hold a connection (outbox, uploads, stats reconcile, archival)."""
+    if not config.get('BACKGROUND_WORKERS') or config.get('TESTING'): # None are started
+        return 0
+    threads = 0
+    if config.get('MAIL_USE_OUTBOX'):
+        threads += config.get('MAIL_OUTBOX_WORKERS', 0)
+    if config.get('RESUME_UPLOAD_MODE') == 'async':
+        threads += config.get('RESUME_UPLOAD_WORKERS', 0)
+    threads += 1 if config.get('STATS_RECONCILE_SECONDS', 0) > 0 else 0
+    threads += 1 if config.get('ARCHIVE_INTERVAL_SECONDS', 0) > 0 else 0
+    return threads
+
+
+def configure_engine(app):
+    """Sets SQLALCHEMY_ENGINE_OPTIONS from the profile (explicit options win). Call before db.init_app()."""
+    options = engine_options(app.config)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    capacity = options.get('pool_size', 0) + options.get('max_overflow', 0)
+    if capacity:
+        per_deploy = capacity * app.config.get('WEB_WORKERS', 1)
+        app.logger.info(f"DB engine profile '{app.config.get('DB_ENGINE_PROFILE')}': pool_size={options.get('pool_size')}, "
+                        f"max_overflow={options.get('max_overflow')} (up to {per_deploy} connections across "
+                        f"{app.config.get('WEB_WORKERS', 1)} worker(s)).")
+
+def init_engine(app):
+    """Hooks the SQLite pragmas onto the app's engine. Call after db.init_app()."""
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != 'sqlite' or engine.url.database in (None, '', ':memory:'):
+        return
+    pragmas = (
+        f"PRAGMA journal_mode={app.config.get('SQLITE_JOURNAL_MODE', 'WAL')}",
+        f"PRAGMA synchronous={app.config.get('SQLITE_SYNCHRONOUS', 'NORMAL')}",
+        f"PRAGMA busy_timeout={int(app.config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+    )
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def pool_stats():
+    """Pool configuration, current usage / saturation and checkout metrics for this process."""
+    pool = db.engine.pool
+    stats = {'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        in_use = pool.checkedout()
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        stats.update(size=pool.size(), max_overflow=pool._max_overflow, in_use=in_use, idle=pool.checkedin(),
+                     overflow=max(pool.overflow(), 0),
+                     saturation=round(in_use / capacity, 3) if capacity > 0 else None)
+    stats.update(metrics.snapshot())
+    return stats
+
+# --- End of engine.py ---
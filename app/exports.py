@@ -0,0 +1,98 @@
+# --- app/exports.py ---
+# Streaming export of a job's applications (CSV or JSON Lines) for its employer.
+#
+# The view returns a generator response. Rows are read with one statement that joins in the applicant
+# (no per-row user lookups) and runs with yield_per=EXPORT_BATCH_SIZE, so PostgreSQL uses a
+# server-side cursor and SQLite steps through its cursor. Each batch gets its resume URLs
+# (app/resume_urls.py) and is encoded and sent before the next one is fetched, so memory stays
+# flat whether a job has 50 applications or 500k.
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from flask import current_app
+from sqlalchemy import select
+
+from . import db
+from .models import Application, User
+from .resume_urls import resume_urls
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'), # Flask adds charset=utf-8 for text/*
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+# Output columns, in order
+FIELDS = (
+    'application_id', 'applicant_username', 'applicant_email', 'applied_at', 'current_ctc', 'expected_ctc',
+    'notice_period_days', 'earliest_join_date', 'status', 'status_updated_at', 'rejection_reason',
+    'resume_status', 'resume_url',
+)
+
+# Spreadsheet apps run cells starting with these as formulas
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _statement(job_id):
+    return select(
+        Application.id.label('application_id'),
+        User.username.label('applicant_username'),
+        User.email.label('applicant_email'),
+        Application.applied_at, Application.current_ctc, Application.expected_ctc,
+        Application.notice_period_days, Application.earliest_join_date,
+        Application.status, Application.status_updated_at, Application.rejection_reason,
+        Application.resume_status, Application.resume_public_id,
+    ).join(User, User.id == Application.job_seeker_id)\
+     .where(Application.job_id == job_id)\
+     .order_by(Application.applied_at, Application.id)
+
+def application_batches(job_id, batch_size=None):
+    """Yields lists of export dicts (FIELDS keys) for a job's applications, oldest first, batch_size at a time."""
+    batch_size = batch_size or current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    result = db.session.execute(_statement(job_id).execution_options(yield_per=batch_size))
+    for partition in result.mappings().partitions():
+        urls = resume_urls(row['resume_public_id'] for row in partition)
+        yield [{**{name: row.get(name) for name in FIELDS if name != 'resume_url'},
+                'resume_url': urls.get(row['resume_public_id'])} for row in partition]
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _csv_cell(value):
+    value = _plain(value)
+    if value is None:
+        return ''
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value # Keep user-entered text from being evaluated as a formula
+    return value
+
+def stream_csv(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for batch in batches:
+        writer.writerows([_csv_cell(row[name]) for name in FIELDS] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def stream_jsonl(batches):
+    for batch in batches:
+        yield ''.join(json.dumps({name: _plain(row[name]) for name in FIELDS}) + '\n' for row in batch)
+
+
+def export_applications(job_id, fmt):
+    """Returns (generator of str chunks, mimetype, file extension) for the export, or None for an unknown format."""
+    if fmt not in FORMATS:
+        return None
+    mimetype, extension = FORMATS[fmt]
+    encode = stream_csv if fmt == 'csv' else stream_jsonl
+    return encode(application_batches(job_id)), mimetype, extension
+
+# --- End of exports.py ---
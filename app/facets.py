@@ -0,0 +1,201 @@
+# --- app/facets.py ---
+# Location / category facet counts for the job search page.
+#
+# `job_facets` holds the number of approved jobs for every (location, category) pair, with both values
+# normalized (lower-case, single spaces). Locations are free text, so it has one row per distinct pair
+# in use - far fewer rows than `jobs`, but not a small fixed set. Views adjust it in the same
+# transaction as the job change (approved, unapproved, edited, deleted; see _job_listing_changed and
+# app/moderation.py). facet_counts() then answers "how many results per location / category" for
+# the current filters with GROUP BY ... ORDER BY count DESC LIMIT FACET_LIMIT queries over that
+# table instead of over `jobs`; the filters (substring LIKEs on the normalized values) and limits
+# run in SQL, so only the rows shown come back (the unfiltered total is a window sum over the same
+# groups). Each facet is counted with the other facet's filter
+# applied but not its own, so the user still sees the alternatives. Keyword searches are the
+# exception: their result set comes from the search index, so those counts are grouped (filtered and
+# limited the same way, on lower-cased values) over the matching rows only. Results are cached
+# in-process per filter / keyword for FACETS_CACHE_SECONDS; facet changes clear the cache when they
+# commit. The overall total is used as job_list's result count only without location/category filters:
+# the normalized matching can differ from the database's ilike, so filtered totals are counted from
+# the filtered query. `flask facets-rebuild` (also run by `flask bootstrap`) recounts everything.
+
+from collections import Counter
+import click
+from flask import current_app
+from sqlalchemy import event, func, inspect as sa_inspect, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import db
+from .cache import TTLCache
+
+FACET_LIMIT = 10 # Values shown per facet
+CACHE_ENTRIES = 256 # Cached (filters, keyword) results per process
+
+
+def _label(value):
+    return ' '.join((value or '').split())
+
+def normalize(value):
+    return _label(value).lower()
+
+def _merge(rows):
+    """(raw location, raw category, count) rows -> ({normalized pair: total}, {normalized pair: labels})."""
+    merged, labels = Counter(), {}
+    for location, category, count in rows:
+        key = (normalize(location), normalize(category))
+        merged[key] += count
+        labels.setdefault(key, (_label(location), _label(category)))
+    return merged, labels
+
+def _cache():
+    return current_app.extensions['job_facets_cache']
+
+
+# --- Incremental Updates (call before db.session.commit()) ---
+def job_deltas(job, deleted=False):
+    """
+    {(location, category): +1/-1} for a new, edited, re-approved/unapproved or deleted job.
+    Reads attribute history, so call it before the session flushes (other helpers' UPDATEs autoflush).
+    """
+    state = sa_inspect(job)
+    def old(name):
+        history = state.attrs[name].history
+        return history.deleted[0] if history.deleted else getattr(job, name)
+    was_public = bool(old('is_approved')) and not (state.transient or state.pending)
+    is_public = bool(job.is_approved) and not deleted
+    deltas = Counter()
+    if was_public:
+        deltas[(old('location'), old('category'))] -= 1
+    if is_public:
+        deltas[(job.location, job.category)] += 1
+    return deltas
+
+def adjust(deltas):
+    """Applies {(location, category): delta} (raw values) to the facet table in the caller's transaction."""
+    from .models import JobFacet
+    merged, labels = _merge((location, category, delta) for (location, category), delta in deltas.items())
+    changes = {key: delta for key, delta in merged.items() if delta}
+    if not changes:
+        return
+    for (location, category), delta in changes.items():
+        increment = update(JobFacet).where(JobFacet.location == location, JobFacet.category == category)\
+            .values(count=JobFacet.count + delta)
+        if db.session.execute(increment).rowcount or delta < 0:
+            continue
+        location_label, category_label = labels[(location, category)]
+        try: # First approved job for this pair
+            with db.session.begin_nested():
+                db.session.add(JobFacet(location=location, category=category, count=delta,
+                                        location_label=location_label, category_label=category_label))
+        except IntegrityError: # Another transaction inserted the pair first
+            db.session.execute(increment)
+    db.session.info['job_facets_changed'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _clear_cache_after_commit(session):
+    if session.info.pop('job_facets_changed', None):
+        cache = current_app.extensions.get('job_facets_cache')
+        if cache is not None:
+            cache.clear()
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_after_rollback(session, previous_transaction):
+    session.info.pop('job_facets_changed', None)
+
+
+# --- Reading ---
+def _contains(column, value):
+    """LIKE '%value%' with LIKE wildcards in `value` matched literally (None for an empty filter)."""
+    if not value:
+        return None
+    escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return column.like(f"%{escaped}%", escape='\\')
+
+def _top(query, key, label, count, criteria, limit):
+    """
+    ([(label, count)] for the `limit` largest groups of `key` among rows matching `criteria`, the count
+    over all those rows). The overall count is a window over the groups, so it costs no extra query.
+    """
+    query = query.with_entities(key, func.min(label), count, func.sum(count).over())\
+        .filter(*[c for c in criteria if c is not None])
+    rows = query.group_by(key).order_by(count.desc(), key).limit(limit).all()
+    return [(row_label, int(n)) for _, row_label, n, _ in rows], int(rows[0][3]) if rows else 0
+
+def _summarize(query, location_key, category_key, location_label, category_label, count, location, category, limit):
+    """Facet lists (two GROUP BY queries) for `query`'s rows, grouped on normalized location / category keys in SQL."""
+    location, category = normalize(location), normalize(category)
+    location_match, category_match = _contains(location_key, location), _contains(category_key, category)
+    locations, matching_category = _top(query, location_key, location_label, count, [category_match], limit)
+    categories, _ = _top(query, category_key, category_label, count, [location_match, category_key != ''], limit)
+    return {
+        'total': None if location else matching_category, # job_list counts location-filtered totals itself
+        'location': locations,
+        'category': categories,
+    }
+
+def _cached(key, compute):
+    cache = _cache()
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result)
+    return result
+
+def facet_counts(location='', category='', limit=FACET_LIMIT):
+    """
+    {'total': n, 'location': [(label, count)], 'category': [(label, count)]} for approved jobs matching
+    the location/category filters, largest first ('total' is None with a location filter). No query against `jobs`.
+    """
+    from .models import JobFacet
+    def compute():
+        query = db.session.query(JobFacet).filter(JobFacet.count > 0)
+        return _summarize(query, JobFacet.location, JobFacet.category, JobFacet.location_label, JobFacet.category_label,
+                          func.sum(JobFacet.count), location, category, limit)
+    return _cached(('facets', normalize(location), normalize(category), limit), compute)
+
+def search_facet_counts(keyword_query, location='', category='', limit=FACET_LIMIT, keyword=None):
+    """
+    Like facet_counts(), but for the jobs matched by a keyword search (`keyword_query`, see search.match_jobs).
+    Pass the search text as `keyword` to cache the result.
+    """
+    from .models import Job
+    def compute():
+        location_key = func.lower(func.coalesce(Job.location, ''))
+        category_key = func.lower(func.coalesce(Job.category, ''))
+        return _summarize(keyword_query.order_by(None), location_key, category_key, Job.location,
+                          func.coalesce(Job.category, ''), func.count(Job.id), location, category, limit)
+    if keyword is None:
+        return compute()
+    return _cached(('search', ' '.join(keyword.lower().split()), normalize(location), normalize(category), limit), compute)
+
+
+# --- Rebuild ---
+def rebuild():
+    """Recounts every pair from `jobs` and replaces the table contents. Caller commits. Returns the number of pairs."""
+    from .models import Job, JobFacet
+    grouped = db.session.query(Job.location, Job.category, func.count(Job.id))\
+        .filter(Job.is_approved.is_(True)).group_by(Job.location, Job.category).all()
+    merged, labels = _merge(grouped)
+    JobFacet.query.delete(synchronize_session=False)
+    db.session.add_all([JobFacet(location=key[0], category=key[1], count=count,
+                                 location_label=labels[key][0], category_label=labels[key][1])
+                        for key, count in merged.items()])
+    db.session.info['job_facets_changed'] = True
+    return len(merged)
+
+
+def init_facets(app):
+    """Creates the in-process facet cache (stored in app.extensions['job_facets_cache'])."""
+    app.extensions['job_facets_cache'] = TTLCache(maxsize=CACHE_ENTRIES, ttl=app.config.get('FACETS_CACHE_SECONDS', 60))
+
+
+# --- CLI ---
+@click.command('facets-rebuild')
+def facets_rebuild_command():
+    """Recounts the location/category facet table from the approved jobs."""
+    pairs = rebuild()
+    db.session.commit()
+    click.echo(f"Job facets rebuilt: {pairs} location/category pairs.")
+
+# --- End of facets.py ---
@@ -53,6 +53,12 @@ class JobForm(FlaskForm):
     category = StringField('Category (Optional)', validators=[Optional(), Length(max=100)])
     submit = SubmitField('Post Job')
 
+class JobImportForm(FlaskForm):
+    file = FileField('Jobs File (CSV or JSON Lines)', validators=[FileRequired(message="Choose a file to import."), FileAllowed(['csv', 'jsonl', 'ndjson'], 'CSV or JSON Lines files only!')])
+    employer_id = IntegerField('Employer ID (admins only)', validators=[Optional(), NumberRange(min=1)])
+    approve = BooleanField('Approve imported jobs immediately (admins only)')
+    submit = SubmitField('Import Jobs')
+
 class ApplicationForm(FlaskForm):
     current_ctc = StringField('Current CTC', validators=[DataRequired(message="Current CTC is required."), Length(max=100)])
     expected_ctc = StringField('Expected CTC', validators=[DataRequired(message="Expected CTC is required."), Length(max=100)])
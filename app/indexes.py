@@ -0,0 +1,187 @@
+# --- app/indexes.py ---
+# Index upkeep and a query-plan advisor.
+#
+# db.create_all() only creates missing tables, so indexes added to models.py later never reach an
+# existing database. ensure_indexes() (run by `flask bootstrap`) creates any declared index that the
+# database doesn't have yet.
+#
+# `flask index-advisor` requests the read-only (GET) views the way users hit them: the benchmark
+# scenarios plus every other GET route it can build a URL for. It records each SELECT they issue
+# and runs EXPLAIN on it (EXPLAIN QUERY PLAN on SQLite, EXPLAIN (FORMAT JSON) on PostgreSQL).
+# Statements that read a whole table (SQLite "SCAN <table>" without an index, PostgreSQL "Seq Scan")
+# are flagged, and so are sorts that need a temporary B-tree or Sort node. Planners choose full scans
+# on tiny tables, so run the advisor against a seeded database (`flask seed-data`).
+
+import json
+import re
+import threading
+import click
+from flask import current_app
+from sqlalchemy import event, inspect as sa_inspect
+
+from . import db
+
+# Tables that only ever hold a handful of rows (plus the catalogs); scanning them is fine
+SMALL_TABLES = ('site_stats', 'cache_versions', 'sqlite_master', 'sqlite_schema', 'pg_class', 'pg_tables')
+
+# Blueprint -> which fixture user to log in as when requesting its views
+BLUEPRINT_USERS = {'admin': 'admin_id', 'employers': 'employer_id', 'jobs': 'seeker_id'}
+
+_SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(.*)$')
+
+
+def ensure_indexes():
+    """Creates indexes declared on the models that are missing from existing tables. Returns their names."""
+    engine = db.engine
+    inspector = sa_inspect(engine)
+    created = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue # create_all() makes new tables together with their indexes
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    return created
+
+
+# --- Capturing view queries ---
+class StatementRecorder:
+    """Collects distinct SELECT statements (with the first parameters seen) and the scenarios that ran them."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.scenario = None
+        self.statements = {}
+        self._lock = threading.Lock()
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            return
+        with self._lock:
+            entry = self.statements.setdefault(statement, {'parameters': parameters, 'scenarios': []})
+            if self.scenario and self.scenario not in entry['scenarios']:
+                entry['scenarios'].append(self.scenario)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def view_scenarios(app, fx):
+    """Benchmark scenarios plus every other buildable GET route: [(name, url, user id or None)]."""
+    from .benchmark import default_scenarios
+    scenarios = default_scenarios(fx)
+    covered = {url.split('?')[0] for _, url, _ in scenarios}
+    adapter = app.url_map.bind('localhost')
+    values = {'job_id': fx['job_id']}
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if 'GET' not in rule.methods or rule.endpoint == 'static':
+            continue
+        if any(values.get(arg) is None for arg in rule.arguments):
+            continue # Needs an id (application, user, token) we can't pick safely
+        try:
+            url = adapter.build(rule.endpoint, {arg: values[arg] for arg in rule.arguments})
+        except Exception:
+            continue
+        if url in covered:
+            continue
+        covered.add(url)
+        blueprint = rule.endpoint.split('.', 1)[0]
+        scenarios.append((rule.endpoint, url, fx.get(BLUEPRINT_USERS.get(blueprint, ''))))
+    return scenarios
+
+
+def _request(app, url, user_id):
+    client = app.test_client()
+    if user_id is not None:
+        with client.session_transaction() as sess:
+            sess['_user_id'] = str(user_id)
+            sess['_fresh'] = True
+    return client.get(url).status_code
+
+
+# --- Plans ---
+def explain(conn, statement, parameters):
+    """Returns (plan lines, problems) for one statement on the connection's dialect."""
+    if conn.dialect.name == 'sqlite':
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        lines, problems = [], []
+        for row in rows:
+            detail = row[-1]
+            lines.append(detail)
+            scan = _SQLITE_SCAN.match(detail)
+            if scan and 'INDEX' not in scan.group(2) and scan.group(1) not in SMALL_TABLES:
+                problems.append(f"full scan of {scan.group(1)}")
+            elif detail.startswith('USE TEMP B-TREE'):
+                problems.append(detail.lower())
+        return lines, problems
+    if conn.dialect.name == 'postgresql':
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        lines, problems = [], []
+        def walk(node, depth=0):
+            relation = node.get('Relation Name')
+            lines.append('  ' * depth + node['Node Type'] + (f" on {relation}" if relation else '')
+                         + (f" ({node['Index Name']})" if node.get('Index Name') else ''))
+            if node['Node Type'] == 'Seq Scan' and relation not in SMALL_TABLES:
+                problems.append(f"full scan of {relation}")
+            elif node['Node Type'] == 'Sort':
+                problems.append(f"sort on {', '.join(node.get('Sort Key', []))}")
+            for child in node.get('Plans', []):
+                walk(child, depth + 1)
+        walk(plan[0]['Plan'])
+        return lines, problems
+    raise click.ClickException(f"EXPLAIN is not supported for the {conn.dialect.name} dialect")
+
+
+# --- CLI ---
+@click.command('index-advisor')
+@click.option('--only', multiple=True, help='Only these scenarios / endpoints (repeatable).')
+@click.option('--show-all', is_flag=True, help='Print plans for statements without problems too.')
+def index_advisor_command(only, show_all):
+    """EXPLAINs every SELECT issued by the GET views and flags full table scans and temp sorts (exit 1 on full scans)."""
+    from .benchmark import _fixtures, _outside_app_context
+    app = current_app._get_current_object()
+    app.config['PAGE_CACHE_ENABLED'] = False # Cached pages would hide their queries
+    fx = _fixtures()
+    db.session.remove()
+
+    with StatementRecorder(db.engine) as recorder:
+        for name, url, user_id in view_scenarios(app, fx):
+            if only and name not in only:
+                continue
+            recorder.scenario = name
+            status = _outside_app_context(_request, app, url, user_id)
+            click.echo(f"{status} {url} ({name})")
+
+    flagged = full_scans = 0
+    with db.engine.connect() as conn:
+        for statement, entry in recorder.statements.items():
+            try:
+                lines, problems = explain(conn, statement, entry['parameters'])
+            except click.ClickException:
+                raise
+            except Exception as e:
+                click.echo(f"\n! Could not EXPLAIN ({e}): {' '.join(statement.split())[:200]}")
+                continue
+            if not problems and not show_all:
+                continue
+            flagged += bool(problems)
+            full_scans += any(problem.startswith('full scan') for problem in problems)
+            click.echo(f"\n{'FLAGGED' if problems else 'ok'} [{', '.join(entry['scenarios'])}]")
+            click.echo(f"  {' '.join(statement.split())[:500]}")
+            for line in lines:
+                click.echo(f"    | {line}")
+            for problem in problems:
+                click.echo(f"    -> {problem}")
+    click.echo(f"\n{len(recorder.statements)} distinct statements, {flagged} flagged, {full_scans} with full scans.")
+    if full_scans: # Sorts are reported but don't fail the run (relevance ordering always sorts)
+        raise SystemExit(1)
+
+# --- End of indexes.py ---
@@ -0,0 +1,158 @@
+# --- app/instrumentation.py ---
+# SQL query counting and (opt-in) per-request SQL instrumentation.
+#
+# Every statement run through SQLAlchemy bumps a counter on flask.g, so each request (app context)
+# knows how many queries it issued. Views can declare a budget with @query_budget(n); going over it
+# raises QueryBudgetExceeded when QUERY_BUDGET_ENFORCE is on (tests) and logs a warning otherwise,
+# which catches N+1 lazy loads creeping back into list pages.
+#
+# With SQL_INSTRUMENTATION on, init_instrumentation() also times every statement on the app's
+# engine, adds a Server-Timing header (query count + DB time) to each response, logs statements
+# slower than SQL_SLOW_QUERY_MS with their endpoint and parameter count and types (never the
+# values), and keeps a rolling per-endpoint summary (last SQL_STATS_WINDOW requests) served at
+# /admin/sql-stats.
+
+import threading
+import time
+from collections import defaultdict, deque
+from functools import wraps
+from flask import g, current_app, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import db
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A view ran more SQL statements than its declared budget."""
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context():
+        g._sql_query_count = g.get('_sql_query_count', 0) + 1
+
+
+def query_count():
+    """Number of SQL statements issued so far in the current app context."""
+    return g.get('_sql_query_count', 0)
+
+
+def query_budget(max_queries):
+    """Declares the most SQL statements a request to this view may issue (including the user load)."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = view(*args, **kwargs)
+            used = query_count()
+            if used > max_queries:
+                message = f"{request.endpoint} issued {used} queries (budget {max_queries})"
+                if current_app.config.get('QUERY_BUDGET_ENFORCE'):
+                    raise QueryBudgetExceeded(message)
+                current_app.logger.warning(f"Query budget exceeded: {message}")
+            return response
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+
+# --- Per-Request Timing (SQL_INSTRUMENTATION) ---
+class EndpointStats:
+    """Rolling window of (queries, db_ms, total_ms) per endpoint."""
+
+    def __init__(self, window=500):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, queries, db_ms, total_ms):
+        with self._lock:
+            self._samples[endpoint].append((queries, db_ms, total_ms))
+
+    def summary(self):
+        """Returns {endpoint: {...}} sorted by total DB time spent, busiest first."""
+        with self._lock:
+            snapshot = {endpoint: list(samples) for endpoint, samples in self._samples.items()}
+        result = {}
+        for endpoint, samples in snapshot.items():
+            n = len(samples)
+            db_times = sorted(s[1] for s in samples)
+            result[endpoint] = {
+                'requests': n,
+                'avg_queries': round(sum(s[0] for s in samples) / n, 2),
+                'max_queries': max(s[0] for s in samples),
+                'avg_db_ms': round(sum(db_times) / n, 2),
+                'p95_db_ms': round(db_times[min(n - 1, int(n * 0.95))], 2),
+                'avg_total_ms': round(sum(s[2] for s in samples) / n, 2),
+                'db_ms_total': round(sum(db_times), 2),
+            }
+        return dict(sorted(result.items(), key=lambda item: item[1]['db_ms_total'], reverse=True))
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_query_start')
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    if not has_app_context():
+        return
+    g._sql_time_ms = g.get('_sql_time_ms', 0.0) + elapsed_ms
+    threshold = current_app.config.get('SQL_SLOW_QUERY_MS', 100)
+    if elapsed_ms >= threshold:
+        endpoint = request.endpoint if has_request_context() else '(no request)'
+        current_app.logger.warning(
+            f"Slow query ({elapsed_ms:.1f} ms) in {endpoint}: {' '.join(statement.split())} | params: {_describe_params(parameters, executemany)}"
+        )
+
+def _describe_params(parameters, executemany):
+    """Parameter count and types for the slow-query log; values (emails, password hashes, tokens) are never logged."""
+    if executemany:
+        return f"{len(parameters)} row(s)"
+    values = parameters.values() if isinstance(parameters, dict) else (parameters or ())
+    return f"{len(values)} ({', '.join(type(value).__name__ for value in values)})" if values else "none"
+
+
+def init_instrumentation(app):
+    """Hooks timing into the app's engine and request cycle if SQL_INSTRUMENTATION is on."""
+    if not app.config.get('SQL_INSTRUMENTATION'):
+        return
+    stats = EndpointStats(window=app.config.get('SQL_STATS_WINDOW', 500))
+    app.extensions['sql_stats'] = stats
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _before_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_execute)
+
+    @app.before_request
+    def _start_request_timer():
+        g._request_start = time.perf_counter()
+
+    @app.after_request
+    def _add_server_timing(response):
+        if '_request_start' not in g:
+            return response
+        total_ms = (time.perf_counter() - g._request_start) * 1000
+        queries = query_count()
+        db_ms = g.get('_sql_time_ms', 0.0)
+        response.headers.add('Server-Timing', f'db;dur={db_ms:.2f};desc="{queries} queries"')
+        response.headers.add('Server-Timing', f'app;dur={total_ms:.2f}')
+        if '_pool_wait_ms' in g: # Time spent waiting on the connection pool (app/engine.py)
+            response.headers.add('Server-Timing', f'pool;dur={g._pool_wait_ms:.2f}')
+        stats.record(request.endpoint or request.path, queries, db_ms, total_ms)
+        return response
+
+    app.logger.info("SQL instrumentation enabled.")
+
+
+def sql_stats_summary():
+    """Current rolling per-endpoint summary ({} if instrumentation is off)."""
+    stats = current_app.extensions.get('sql_stats')
+    return stats.summary() if stats else {}
+
+# --- End of instrumentation.py ---
@@ -0,0 +1,76 @@
+# --- app/job_api.py ---
+# Validators, conditional GET handling and serialization for the JSON job API (/api/v1, see views.py).
+#
+# Syndication clients poll the same URLs over and over, so every API response carries an ETag and a
+# Last-Modified date, and a matching If-None-Match / If-Modified-Since gets a bodiless 304 before any
+# listing row is loaded or serialized:
+#   * one job  - ETag from (id, Job.version); Last-Modified from Job.updated_at, else Job.posted_at.
+#                Validators come from a narrow primary-key read; the full row is loaded only on a miss.
+#   * job list - ETag from the public-listing version (cache_versions 'public_pages', bumped in the same
+#                transaction as any change to an approved job) plus the normalized query arguments;
+#                Last-Modified is the time of that bump. A 304 costs a single primary-key read.
+# Cache-Control lets CDNs and aggregators keep responses for API_CACHE_MAX_AGE seconds.
+
+import hashlib
+from datetime import timezone
+from flask import current_app, request, Response, url_for
+from werkzeug.http import unquote_etag
+
+from .cache import PUBLIC_PAGES, version_info
+
+API_VERSION = 'v1'
+# Job fields in API responses, in order
+FIELDS = ('id', 'title', 'company_name', 'location', 'category', 'salary', 'description', 'posted_at',
+          'updated_at', 'version')
+LIST_ARGS = ('q', 'location', 'category', 'cursor', 'limit')
+
+
+# --- Validators ---
+def job_validators(job_id, version, posted_at, updated_at):
+    """(ETag, Last-Modified) for one job."""
+    return f'W/"job-{job_id}-{version}"', updated_at or posted_at
+
+def list_validators():
+    """(ETag, Last-Modified) for the job list with the current request's arguments (one primary-key read)."""
+    version, changed_at = version_info(PUBLIC_PAGES)
+    args = '&'.join(f"{name}={request.args.get(name, '').strip()}" for name in LIST_ARGS)
+    digest = hashlib.sha1(f"{API_VERSION}|{version}|{args}".encode()).hexdigest()[:20]
+    return f'W/"jobs-{digest}"', changed_at
+
+def _aware(value):
+    """Naive UTC datetime -> aware, truncated to whole seconds (HTTP dates have no fractions)."""
+    return value.replace(microsecond=0, tzinfo=timezone.utc) if value else None
+
+def is_fresh(etag, last_modified):
+    """True if the client's copy is current. If-None-Match wins over If-Modified-Since (RFC 9110)."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(unquote_etag(etag)[0]) # Also true for '*'
+    since = request.if_modified_since
+    return bool(since and last_modified and _aware(last_modified) <= since)
+
+def _set_validators(response, etag, last_modified):
+    response.headers['ETag'] = etag
+    if last_modified:
+        response.last_modified = _aware(last_modified)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get('API_CACHE_MAX_AGE', 60)
+    return response
+
+def not_modified(etag, last_modified):
+    """Bodiless 304 carrying the validators."""
+    return _set_validators(Response(status=304), etag, last_modified)
+
+def json_response(payload, etag, last_modified):
+    return _set_validators(current_app.json.response(payload), etag, last_modified)
+
+
+# --- Serialization ---
+def _plain(value):
+    return value.replace(microsecond=0).isoformat() + 'Z' if hasattr(value, 'isoformat') else value
+
+def serialize(job):
+    data = {name: _plain(getattr(job, name)) for name in FIELDS}
+    data['url'] = url_for('jobs.job_detail', job_id=job.id, _external=True)
+    return data
+
+# --- End of job_api.py ---
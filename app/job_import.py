@@ -0,0 +1,129 @@
+# --- app/job_import.py ---
+# Bulk job import (CSV or JSON Lines) for employers and admins.
+#
+# Each row is validated with JobForm's own field rules, so an imported job can't hold anything the
+# single-job form would reject. The whole file is read and validated before anything is written, so an
+# unreadable file (bad encoding, broken CSV) imports nothing. Valid rows are then inserted
+# JOB_IMPORT_BATCH_SIZE at a time with one executemany INSERT per batch. Each batch commits with its derived data (site stats, and for
+# pre-approved admin imports the facets, search index and page cache), so a large file never holds
+# one long write transaction. If a batch fails, the batches before it stay imported and the result
+# says so (ImportResult.insert_error). The caller gets an ImportResult with the new job IDs and a per-row
+# error report, and queues a single admin notification for the whole import (or, for a pre-approved
+# admin import, the employer's batched approval email that bulk approval sends).
+
+import csv
+import io
+import json
+from collections import Counter
+from sqlalchemy import insert
+from werkzeug.datastructures import MultiDict
+
+from . import db, search, stats, facets
+from .cache import invalidate_public_pages
+from .forms import JobForm
+from .models import Job
+
+FIELDS = ('title', 'description', 'salary', 'location', 'category')
+FORMATS = ('csv', 'jsonl')
+
+
+class ImportResult:
+    """Outcome of one import: created job IDs, rows rejected with their errors, and rows seen."""
+
+    def __init__(self):
+        self.job_ids = []
+        self.titles = []
+        self.errors = [] # (row number, {field: [messages]})
+        self.rows = 0
+        self.insert_error = None # Set if a batch failed to insert; earlier batches stay committed
+
+    @property
+    def imported(self):
+        return len(self.job_ids)
+
+    def to_dict(self):
+        return {'rows': self.rows, 'imported': self.imported, 'insert_error': self.insert_error,
+                'errors': [{'row': row, 'errors': errors} for row, errors in self.errors]}
+
+
+def detect_format(filename):
+    """'csv' or 'jsonl' from the upload's extension (None if neither)."""
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    return {'csv': 'csv', 'jsonl': 'jsonl', 'ndjson': 'jsonl'}.get(extension)
+
+def parse_rows(stream, fmt):
+    """Yields (row number, dict or None, parse error or None) from an uploaded binary stream."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for number, row in enumerate(reader, start=2): # Row 1 is the header
+            yield number, {(key or '').strip().lower(): value for key, value in row.items()}, None
+        return
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Each line must be a JSON object"
+            continue
+        yield number, {str(key).lower(): value for key, value in row.items()}, None
+
+def validate_row(row):
+    """Runs JobForm's validators on one row. Returns (clean values, None) or (None, {field: [messages]})."""
+    data = MultiDict({name: '' if row.get(name) is None else str(row.get(name)).strip() for name in FIELDS})
+    form = JobForm(formdata=data, meta={'csrf': False})
+    if not form.validate():
+        return None, {name: list(messages) for name, messages in form.errors.items()}
+    return {name: getattr(form, name).data or None for name in FIELDS}, None
+
+
+def _insert_batch(batch, employer, approve, result):
+    """INSERTs one batch of validated rows with its derived data, then commits."""
+    rows = [dict(values, company_name=employer.company_name or "N/A", employer_id=employer.id, is_approved=approve)
+            for values in batch]
+    # ORM-enabled bulk INSERT (column defaults apply, batched VALUES). It skips unit-of-work flush events,
+    # so everything derived from jobs is maintained right here, as the bulk moderation actions do
+    job_ids = list(db.session.scalars(insert(Job).returning(Job.id), rows))
+    stats.adjust({stats.TOTAL_JOBS: len(rows), stats.APPROVED_JOBS if approve else stats.PENDING_JOBS: len(rows)})
+    if approve: # Only approved jobs are public: facets, search index and cached pages change too
+        facets.adjust(Counter((row['location'], row['category']) for row in rows))
+        search.sync_jobs(job_ids)
+        invalidate_public_pages()
+    db.session.commit()
+    result.job_ids.extend(job_ids)
+    result.titles.extend(row['title'] for row in rows)
+
+def import_jobs(parsed_rows, employer, approve=False, batch_size=500, max_rows=5000):
+    """
+    Validates every parsed row, then inserts the valid ones for `employer` (committing per batch). Returns an
+    ImportResult. Reading errors (UnicodeDecodeError, csv.Error) propagate before anything is inserted.
+    """
+    result = ImportResult()
+    valid = []
+    for number, row, parse_error in parsed_rows:
+        if result.rows >= max_rows:
+            result.errors.append((number, {'file': [f"Too many rows; only the first {max_rows} were processed."]}))
+            break
+        result.rows += 1
+        if parse_error:
+            result.errors.append((number, {'row': [parse_error]}))
+            continue
+        values, errors = validate_row(row)
+        if errors:
+            result.errors.append((number, errors))
+            continue
+        valid.append(values)
+    for start in range(0, len(valid), batch_size):
+        try:
+            _insert_batch(valid[start:start + batch_size], employer, approve, result)
+        except Exception as e:
+            db.session.rollback()
+            result.insert_error = f"Stopped after {result.imported} of {len(valid)} valid row(s): {e}"
+            break
+    return result
+
+# --- End of job_import.py ---
@@ -0,0 +1,242 @@
+# --- app/loadtest.py ---
+# Concurrent job-application load test: sync vs cooperative (gevent) gunicorn workers.
+#
+# `flask load-test` starts a single-worker gunicorn per --worker-class against the configured database.
+# The workers' Cloudinary uploads go to a local stand-in that answers after --upload-latency-ms, which
+# reproduces the real upload's network wait without its variance. Applications are then submitted from
+# fresh seeded job seekers at each --concurrency level, through the real apply form (CSRF token, multipart
+# PDF, sync upload mode). For every class and level it prints applications/s, p50/p95 latency and
+# failures. A sync worker tops out near 1000 / upload latency applications per second whatever the
+# concurrency; a gevent worker keeps scaling until the DB pool or the CPU is the limit.
+# Needs gunicorn (and gevent for that class) and a seeded throwaway database (`flask seed-data`),
+# never production: every run adds seekers and applications.
+
+import http.client
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.util import find_spec
+import click
+from flask import current_app
+
+from . import db
+from .benchmark import SEED_EMAIL_DOMAIN, percentile, _bulk_insert, _new_ids, _max_id
+from .models import User, Job
+
+WORKER_MODULES = {'sync': 'gunicorn', 'gthread': 'gunicorn', 'gevent': 'gevent'}
+_CSRF_RE = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+# Smallest file the apply form accepts as a PDF; padded to --resume-kb
+_PDF_HEADER = b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n'
+
+
+# --- Cloudinary Stand-In ---
+class _UploadHandler(BaseHTTPRequestHandler):
+    """Answers any upload like Cloudinary does, after the server's latency."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        time.sleep(self.server.latency)
+        body = json.dumps({'public_id': f"loadtest/{uuid.uuid4().hex}", 'resource_type': 'raw'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_upload_stub(latency_ms):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _UploadHandler)
+    server.daemon_threads = True
+    server.latency = latency_ms / 1000.0
+    threading.Thread(target=server.serve_forever, name='loadtest-upload-stub', daemon=True).start()
+    return server
+
+
+# --- Test Users ---
+def prepare_applicants(count):
+    """Creates `count` fresh job seekers, each paired with an approved job. Returns [(user id, job id)]."""
+    job_ids = [row[0] for row in db.session.query(Job.id).filter(Job.is_approved.is_(True))
+               .order_by(Job.id.desc()).limit(500)]
+    if not job_ids:
+        raise click.ClickException("No approved jobs; run `flask seed-data` first.")
+    tag = uuid.uuid4().hex[:8]
+    placeholder = User(username='loadtest', email='loadtest@example.com', role='job_seeker')
+    placeholder.set_password('loadtest-password') # Never used to log in; hashed once
+    before = _max_id(User)
+    _bulk_insert(User, ({'username': f"loadtest_{tag}_{i}", 'email': f"loadtest_{tag}_{i}@{SEED_EMAIL_DOMAIN}",
+                         'password_hash': placeholder.password_hash, 'role': 'job_seeker', 'is_verified': True}
+                        for i in range(count)), 1000)
+    user_ids = _new_ids(User, before, role='job_seeker')
+    return [(user_id, job_ids[i % len(job_ids)]) for i, user_id in enumerate(user_ids)]
+
+def session_cookie(app, user_id):
+    """A signed session cookie logging `user_id` in (no password form, no hashing)."""
+    serializer = app.session_interface.get_signing_serializer(app)
+    return serializer.dumps({'_user_id': str(user_id), '_fresh': True})
+
+
+# --- Client ---
+def _multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, content, mimetype) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: {mimetype}\r\n\r\n'.encode() + content + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+def _request(port, method, path, cookie, body=None, content_type=None):
+    """Returns (status, body, updated cookie value)."""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+    headers = {'Cookie': f"{cookie[0]}={cookie[1]}"}
+    if content_type:
+        headers['Content-Type'] = content_type
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        data = response.read()
+    finally:
+        conn.close()
+    value = cookie[1]
+    for header in response.msg.get_all('Set-Cookie') or []:
+        morsel = SimpleCookie(header).get(cookie[0])
+        if morsel is not None:
+            value = morsel.value
+    return response.status, data, value
+
+def fetch_form(port, cookie_name, cookie_value, job_id):
+    """GETs the job page as the applicant. Returns (CSRF token, session cookie value) or None."""
+    status, body, value = _request(port, 'GET', f"/jobs/{job_id}", (cookie_name, cookie_value))
+    match = _CSRF_RE.search(body.decode('utf-8', 'replace')) if status == 200 else None
+    return (match.group(1), value) if match else None
+
+def submit_application(port, cookie_name, cookie_value, job_id, csrf_token, resume):
+    """POSTs the apply form. Returns (succeeded, latency ms). Success is the redirect after saving."""
+    body, content_type = _multipart({
+        'csrf_token': csrf_token, 'current_ctc': '10 LPA', 'expected_ctc': '12 LPA', 'notice_period_days': '30',
+        'earliest_join_date': (date.today() + timedelta(days=30)).isoformat(),
+    }, {'resume': ('resume.pdf', resume, 'application/pdf')})
+    start = time.perf_counter()
+    try:
+        status, _, _ = _request(port, 'POST', f"/jobs/{job_id}/apply", (cookie_name, cookie_value), body, content_type)
+    except OSError:
+        status = None
+    return status == 302, (time.perf_counter() - start) * 1000
+
+
+# --- Server ---
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(worker_class, port, upload_url, connections):
+    """Starts `gunicorn run:app` with one worker of `worker_class` and waits until it answers."""
+    env = dict(os.environ, WEB_WORKER_CLASS=worker_class, RESUME_UPLOAD_MODE='sync', CLOUDINARY_CLOUD_NAME='loadtest',
+               CLOUDINARY_API_KEY='loadtest', CLOUDINARY_API_SECRET='loadtest', CLOUDINARY_UPLOAD_PREFIX=upload_url,
+               ARCHIVE_INTERVAL_SECONDS='0', STATS_RECONCILE_SECONDS='0')
+    command = [sys.executable, '-m', 'gunicorn', 'run:app', '--workers', '1', '--worker-class', worker_class,
+               '--threads', '1', '--worker-connections', str(connections), '--bind', f"127.0.0.1:{port}",
+               '--timeout', '120', '--log-level', 'warning']
+    process = subprocess.Popen(command, cwd=os.path.dirname(current_app.root_path), env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise click.ClickException(f"gunicorn ({worker_class}) exited with code {process.returncode}.")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise click.ClickException(f"gunicorn ({worker_class}) did not start within 60s.")
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_level(port, cookie_name, applicants, concurrency, resume):
+    """Submits one application per applicant, `concurrency` at a time. Returns the level's summary."""
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        forms = list(executor.map(lambda a: fetch_form(port, cookie_name, a[2], a[1]), applicants)) # Untimed
+        ready = [(job_id, form) for (_, job_id, _), form in zip(applicants, forms) if form]
+        start = time.perf_counter()
+        outcomes = list(executor.map(
+            lambda r: submit_application(port, cookie_name, r[1][1], r[0], r[1][0], resume), ready))
+        elapsed = time.perf_counter() - start
+    timings = sorted(ms for ok, ms in outcomes if ok)
+    succeeded = len(timings)
+    return {
+        'concurrency': concurrency, 'submitted': len(applicants), 'succeeded': succeeded,
+        'failed': len(applicants) - succeeded,
+        'per_second': round(succeeded / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(timings, 50), 1) if timings else None,
+        'p95_ms': round(percentile(timings, 95), 1) if timings else None,
+    }
+
+
+# --- CLI ---
+@click.command('load-test')
+@click.option('--worker-class', 'worker_classes', multiple=True, default=('sync', 'gevent'), show_default=True,
+              type=click.Choice(sorted(WORKER_MODULES)), help='Gunicorn worker classes to compare (repeatable).')
+@click.option('--concurrency', 'levels', multiple=True, type=int, default=(1, 10, 50), show_default=True,
+              help='Concurrent clients per level (repeatable).')
+@click.option('--requests', 'per_level', default=100, show_default=True, help='Applications per level.')
+@click.option('--upload-latency-ms', default=300, show_default=True, help='Simulated Cloudinary upload time.')
+@click.option('--resume-kb', default=50, show_default=True, help='Size of the uploaded PDF.')
+@click.option('--output', default=None, help='Also write results as JSON to this path.')
+def load_test_command(worker_classes, levels, per_level, upload_latency_ms, resume_kb, output):
+    """Compares concurrent job applications per single gunicorn worker across worker classes (throwaway DB only)."""
+    missing = sorted({WORKER_MODULES[c] for c in worker_classes if find_spec(WORKER_MODULES[c]) is None})
+    if missing:
+        raise click.ClickException(f"Not installed: {', '.join(missing)}.")
+    app = current_app._get_current_object()
+    cookie_name = app.config.get('SESSION_COOKIE_NAME', 'session')
+    resume = _PDF_HEADER + b'0' * max(0, resume_kb * 1024 - len(_PDF_HEADER))
+    applicants = prepare_applicants(len(worker_classes) * len(levels) * per_level)
+    applicants = [(user_id, job_id, session_cookie(app, user_id)) for user_id, job_id in applicants]
+    db.session.remove() # Nothing of ours holds the SQLite write lock while the workers run
+    stub = start_upload_stub(upload_latency_ms)
+    upload_url = f"http://127.0.0.1:{stub.server_address[1]}"
+    click.echo(f"Upload latency {upload_latency_ms} ms, {per_level} applications per level, one worker per class.")
+    click.echo(f"{'worker':<9}{'clients':>8}{'ok':>6}{'failed':>8}{'apps/s':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    results = {}
+    try:
+        for worker_class in worker_classes:
+            port = _free_port()
+            process = start_server(worker_class, port, upload_url, max(levels))
+            try:
+                for level in levels:
+                    batch, applicants = applicants[:per_level], applicants[per_level:]
+                    result = run_level(port, cookie_name, batch, level, resume)
+                    results.setdefault(worker_class, []).append(result)
+                    click.echo(f"{worker_class:<9}{level:>8}{result['succeeded']:>6}{result['failed']:>8}"
+                               f"{result['per_second']:>9}{str(result['p50_ms']):>9}{str(result['p95_ms']):>9}")
+            finally:
+                stop_server(process)
+    finally:
+        stub.shutdown()
+    if output:
+        with open(output, 'w') as f:
+            json.dump({'upload_latency_ms': upload_latency_ms, 'results': results}, f, indent=2)
+
+# --- End of loadtest.py ---
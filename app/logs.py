@@ -0,0 +1,156 @@
+# --- app/logs.py ---
+# Application logging: request threads only enqueue records; one listener thread writes them.
+#
+# init_logging() puts a QueueHandler on app.logger. Emitting a record copies the request ID and
+# endpoint onto it and drops it on a bounded in-memory queue (LOG_QUEUE_SIZE; when full the record
+# is dropped and counted rather than blocking the request). A QueueListener thread formats
+# the records (plain text, or one JSON object per line with LOG_FORMAT=json) and writes them to
+# LOG_DIR/LOG_FILE, rotating at LOG_MAX_BYTES and keeping LOG_BACKUP_COUNT old files. Flask's
+# default stderr handler is moved behind the same queue.
+#
+# Every request gets an ID, either the incoming X-Request-ID header or a fresh one. It is echoed
+# back in the response's X-Request-ID header, so a client report can be matched to log lines.
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from flask import g, has_request_context, request
+from flask.logging import default_handler
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps request_id / endpoint / method / path onto records (runs on the emitting thread)."""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id') or '-'
+            record.endpoint = request.endpoint or '-'
+            record.method = request.method
+            record.path = request.path
+        else:
+            record.request_id = record.endpoint = record.method = record.path = '-'
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request/endpoint and source location."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'endpoint': getattr(record, 'endpoint', '-'),
+            'method': getattr(record, 'method', '-'),
+            'path': getattr(record, 'path', '-'),
+            'module': record.module,
+            'line': record.lineno,
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: when the queue is full the record is dropped and counted."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _make_formatter(log_format):
+    if log_format == 'json':
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def stop_listener():
+    """Flushes queued records and stops the writer thread (registered with atexit)."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                if handler is not default_handler:
+                    handler.close()
+            _listener = None
+
+
+def init_logging(app):
+    """Sets app.logger's level and, outside debug/testing, the queued rotating file handler."""
+    global _listener
+    level = getattr(logging, str(app.config.get('LOG_LEVEL', 'INFO')).upper(), logging.INFO)
+    app.logger.setLevel(level)
+
+    @app.before_request
+    def _assign_request_id():
+        g.request_id = request.headers.get(REQUEST_ID_HEADER, '')[:64] or uuid.uuid4().hex
+
+    @app.after_request
+    def _echo_request_id(response):
+        if 'request_id' in g:
+            response.headers.setdefault(REQUEST_ID_HEADER, g.request_id)
+        return response
+
+    if app.debug or app.testing: # Console output only
+        app.logger.info("Debug/Testing mode active. File logging skipped/minimal.")
+        return None
+
+    log_dir = app.config.get('LOG_DIR', 'logs')
+    log_file_path = os.path.join(log_dir, app.config.get('LOG_FILE', 'job_portal.log'))
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = RotatingFileHandler(log_file_path, maxBytes=app.config.get('LOG_MAX_BYTES', 10 * 1024 * 1024),
+                                           backupCount=app.config.get('LOG_BACKUP_COUNT', 10), delay=True)
+        file_handler.setFormatter(_make_formatter(app.config.get('LOG_FORMAT', 'text')))
+        file_handler.setLevel(level)
+    except Exception as e:
+        app.logger.error(f"Failed to configure file logging: {e}")
+        return None
+
+    handlers = [file_handler]
+    if default_handler in app.logger.handlers: # Flask's stderr handler also moves off the request thread
+        app.logger.removeHandler(default_handler)
+        handlers.append(default_handler)
+
+    stop_listener() # create_app() called again in this process: replace the previous writer
+    log_queue = queue.Queue(maxsize=max(0, int(app.config.get('LOG_QUEUE_SIZE', 10000))))
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    queue_handler.addFilter(RequestContextFilter())
+    for handler in [h for h in app.logger.handlers if isinstance(h, DroppingQueueHandler)]:
+        app.logger.removeHandler(handler)
+    app.logger.addHandler(queue_handler)
+    with _listener_lock:
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    app.extensions['log_queue_handler'] = queue_handler
+    app.logger.info(f"File logging configured: {log_file_path} ({app.config.get('LOG_FORMAT', 'text')}, queued)")
+    return queue_handler
+
+
+atexit.register(stop_listener)
+
+# --- End of logs.py ---
@@ -0,0 +1,88 @@
+# --- app/migrations.py ---
+# Columns added to existing tables.
+#
+# db.create_all() creates missing tables but never alters existing ones, so a column added to models.py
+# after a deployment's tables were made would break every query on that table. ensure_columns() (run by
+# `flask bootstrap` before ensure_indexes) adds each column in ADDED_COLUMNS that the database lacks with
+# ALTER TABLE ... ADD COLUMN, using the model's type and nullability and the listed value for existing
+# rows. Backfills that derive the new values from other tables run once, right after their columns are
+# added. Every step checks the live schema first, so bootstrap stays safe to run on every deploy.
+
+from sqlalchemy import inspect as sa_inspect, text
+
+from . import db
+from .counters import recompute_counters
+
+# (table, column, SQL default for rows that already exist; None = NULL), in the order they were added
+ADDED_COLUMNS = (
+    # Off-request resume uploads (app/uploads.py): existing applications were uploaded in the request
+    ('applications', 'resume_status', "'uploaded'"),
+    ('applications', 'resume_spool_path', None),
+    ('applications', 'resume_upload_attempts', '0'),
+    ('applications', 'resume_claimed_at', None),
+    # Denormalized application counters (app/counters.py), recounted by the backfill below
+    ('jobs', 'applications_count', '0'),
+    ('jobs', 'submitted_count', '0'),
+    ('jobs', 'viewed_count', '0'),
+    ('jobs', 'shortlisted_count', '0'),
+    ('jobs', 'interviewing_count', '0'),
+    ('jobs', 'offer_made_count', '0'),
+    ('jobs', 'hired_count', '0'),
+    ('jobs', 'offer_declined_count', '0'),
+    ('jobs', 'rejected_count', '0'),
+    # JSON API validators (app/job_api.py): existing jobs start at version 1, Last-Modified falls back to posted_at
+    ('jobs', 'version', '1'),
+    ('jobs', 'updated_at', None),
+    ('cache_versions', 'updated_at', None),
+    # Resume upload retry backoff; the archive copy mirrors every applications column
+    ('applications', 'resume_next_attempt_at', None),
+    ('applications_archive', 'resume_next_attempt_at', None),
+)
+
+# ((table, column), callable()): the callable runs when that column was just added
+BACKFILLS = (
+    (('jobs', 'applications_count'), recompute_counters),
+)
+
+
+def _add_column(engine, table_name, column_name, existing_default):
+    column = db.metadata.tables[table_name].c[column_name]
+    preparer = engine.dialect.identifier_preparer
+    ddl = (f"ALTER TABLE {preparer.quote(table_name)} ADD COLUMN {preparer.quote(column_name)} "
+           f"{column.type.compile(dialect=engine.dialect)}")
+    if existing_default is not None:
+        ddl += f" DEFAULT {existing_default}"
+    if not column.nullable:
+        if existing_default is None:
+            raise ValueError(f"{table_name}.{column_name} is NOT NULL and needs a default for existing rows")
+        ddl += " NOT NULL"
+    with engine.begin() as conn:
+        conn.execute(text(ddl))
+
+def ensure_columns():
+    """Adds declared columns missing from existing tables and runs (and commits) their backfills. Returns 'table.column' names added."""
+    engine = db.engine
+    inspector = sa_inspect(engine)
+    added = []
+    existing = {}
+    for table_name, column_name, existing_default in ADDED_COLUMNS:
+        if table_name not in existing:
+            if not inspector.has_table(table_name):
+                existing[table_name] = None # create_all() makes new tables with every column
+            else:
+                existing[table_name] = {column['name'] for column in inspector.get_columns(table_name)}
+        if existing[table_name] is None or column_name in existing[table_name]:
+            continue
+        _add_column(engine, table_name, column_name, existing_default)
+        existing[table_name].add(column_name)
+        added.append(f"{table_name}.{column_name}")
+    backfills = [backfill for (table_name, column_name), backfill in BACKFILLS if f"{table_name}.{column_name}" in added]
+    for backfill in backfills:
+        backfill()
+    if backfills:
+        # Committed now: the columns are already there, so a later failure must not lose the backfill (and on
+        # SQLite an open write transaction would lock out the index DDL that follows)
+        db.session.commit()
+    return added
+
+# --- End of migrations.py ---
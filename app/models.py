@@ -1,10 +1,10 @@
 # --- app/models.py ---
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 # Import necessary types from SQLAlchemy
 from sqlalchemy import Date, Text, DateTime
 from . import db # Import the db instance from __init__.py
+from . import passwords
 
 class User(UserMixin, db.Model):
     """User model for authentication and profile information."""
@@ -17,7 +17,7 @@ class User(UserMixin, db.Model):
     role = db.Column(db.String(20), nullable=False, default='job_seeker') # 'job_seeker', 'employer', 'admin'
     is_verified = db.Column(db.Boolean, default=False, nullable=False)
     company_name = db.Column(db.String(120), nullable=True) # For employers
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True) # manage_users sorts by it
 
     # Relationships
     # 'employer' backref allows accessing User from Job object (job.employer)
@@ -26,12 +26,12 @@ class User(UserMixin, db.Model):
     applications_submitted = db.relationship('Application', backref='job_seeker', lazy='dynamic', foreign_keys='Application.job_seeker_id')
 
     def set_password(self, password):
-        """Hashes the password and stores it."""
-        self.password_hash = generate_password_hash(password)
+        """Hashes the password with the configured method and stores it (see app/passwords.py)."""
+        self.password_hash = passwords.hash_password(password)
 
     def check_password(self, password):
         """Checks if the provided password matches the stored hash."""
-        return check_password_hash(self.password_hash, password)
+        return passwords.verify_password(self.password_hash, password)
 
     # Flask-Login required methods
     def get_id(self):
@@ -47,6 +47,20 @@ class User(UserMixin, db.Model):
         return f"<User {self.username} ({self.role})>"
 
 
+# Application.status value -> Job counter column, in workflow order
+APPLICATION_STATUS_COUNTERS = {
+    'Submitted': 'submitted_count',
+    'Viewed': 'viewed_count',
+    'Shortlisted': 'shortlisted_count',
+    'Interviewing': 'interviewing_count',
+    'Offer Made': 'offer_made_count',
+    'Hired': 'hired_count',
+    'Offer Declined': 'offer_declined_count',
+    'Rejected': 'rejected_count',
+}
+# Statuses that end an application's workflow (jobs whose applications are all closed can be archived)
+CLOSED_APPLICATION_STATUSES = ('Rejected', 'Hired', 'Offer Declined')
+
 class Job(db.Model):
     """Job listing model."""
     __tablename__ = 'jobs'
@@ -60,18 +74,43 @@ class Job(db.Model):
     company_name = db.Column(db.String(120), nullable=False)
     posted_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     is_approved = db.Column(db.Boolean, default=False, nullable=False)
+    # Change tracking for the JSON API's ETag / Last-Modified (see app/job_api.py): bumped on every edit,
+    # approval or unapproval; updated_at stays None until the first change after posting
+    version = db.Column(db.Integer, default=1, server_default='1', nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=True)
 
     # Foreign Key to the employer (User) who posted the job
     employer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
+    # --- Application counters (maintained in the same transaction by app/counters.py) ---
+    applications_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    submitted_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    viewed_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    shortlisted_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    interviewing_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    offer_made_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    hired_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    offer_declined_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rejected_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
     # Relationship to applications for this job
     # 'job' backref allows accessing Job from Application object (application.job)
     # cascade="all, delete-orphan": If a Job is deleted, also delete its linked Applications
     applications = db.relationship('Application', backref='job', lazy='dynamic', cascade="all, delete-orphan")
 
+    def status_counts(self):
+        """Application count per status, in workflow order."""
+        return {status: getattr(self, column) or 0 for status, column in APPLICATION_STATUS_COUNTERS.items()}
+
     def __repr__(self):
         return f"<Job {self.title} by {self.company_name}>"
 
+# Composite indexes matching the list pages' filter + sort (created on existing databases by `flask bootstrap`)
+# job_list / index / manage_jobs: is_approved = ? ORDER BY posted_at DESC (cursor mode adds id)
+db.Index('ix_jobs_approved_posted', Job.is_approved, Job.posted_at.desc(), Job.id.desc())
+# Employer dashboard: employer_id = ? ORDER BY posted_at DESC
+db.Index('ix_jobs_employer_posted', Job.employer_id, Job.posted_at.desc())
+
 
 class Application(db.Model):
     """Model representing a job application."""
@@ -89,6 +128,15 @@ class Application(db.Model):
     resume_public_id = db.Column(db.String(255), nullable=True) # Store Cloudinary Public ID
     # --- ^ ^ ^ --- End Field --- ^ ^ ^ ---
 
+    # --- Off-request upload state (RESUME_UPLOAD_MODE='async', see app/uploads.py) ---
+    # 'uploaded' (resume_public_id is set), 'pending' (spooled on local disk, waiting for the uploader),
+    # 'uploading' (claimed by an uploader thread) or 'failed' (gave up after retries)
+    resume_status = db.Column(db.String(20), default='uploaded', nullable=False, index=True)
+    resume_spool_path = db.Column(db.String(500), nullable=True)
+    resume_upload_attempts = db.Column(db.Integer, default=0, nullable=False)
+    resume_claimed_at = db.Column(db.DateTime, nullable=True)
+    resume_next_attempt_at = db.Column(db.DateTime, nullable=True) # Retry backoff after a failed upload (NULL = now)
+
     # --- Fields for Workflow ---
     # Possible Statuses: Submitted, Viewed, Shortlisted, Interviewing, Offer Made, Hired, Offer Declined, Rejected
     status = db.Column(db.String(30), default='Submitted', nullable=False, index=True)
@@ -105,4 +153,110 @@ class Application(db.Model):
     def __repr__(self):
         return f"<Application ID {self.id} Status {self.status} ResumeID {self.resume_public_id}>"
 
+# view_applications: job_id = ? ORDER BY status, applied_at DESC (cursor mode: applied_at DESC, id DESC)
+db.Index('ix_applications_job_status_applied', Application.job_id, Application.status, Application.applied_at.desc())
+db.Index('ix_applications_job_applied', Application.job_id, Application.applied_at.desc(), Application.id.desc())
+# my_applications: job_seeker_id = ? ORDER BY applied_at DESC, id DESC
+db.Index('ix_applications_seeker_applied', Application.job_seeker_id, Application.applied_at.desc(), Application.id.desc())
+
+# --- Cold Storage (see app/archive.py) ---
+def _archive_table(name, source):
+    """Same columns as `source` (ids kept, no foreign keys, defaults or unique constraints) plus archived_at."""
+    columns = [db.Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable,
+                         autoincrement=False) for column in source.columns]
+    return db.Table(name, db.metadata, *columns, db.Column('archived_at', db.DateTime, nullable=False, index=True))
+
+class ArchivedJob(db.Model):
+    """Read-only copy of an expired job moved out of `jobs` by app/archive.py (same id and counters)."""
+    __table__ = _archive_table('jobs_archive', Job.__table__)
+
+    employer = db.relationship('User', primaryjoin='foreign(ArchivedJob.employer_id) == User.id', viewonly=True)
+    applications = db.relationship('ArchivedApplication', primaryjoin='ArchivedJob.id == foreign(ArchivedApplication.job_id)',
+                                   lazy='dynamic', viewonly=True)
+
+    status_counts = Job.status_counts
+
+    def __repr__(self):
+        return f"<ArchivedJob {self.title} by {self.company_name}>"
+
+# Employer archive list: employer_id = ? ORDER BY posted_at DESC
+db.Index('ix_jobs_archive_employer_posted', ArchivedJob.employer_id, ArchivedJob.posted_at.desc())
+
+
+class ArchivedApplication(db.Model):
+    """Read-only copy of an application moved to cold storage together with its job."""
+    __table__ = _archive_table('applications_archive', Application.__table__)
+
+    job = db.relationship('ArchivedJob', primaryjoin='foreign(ArchivedApplication.job_id) == ArchivedJob.id', viewonly=True)
+    job_seeker = db.relationship('User', primaryjoin='foreign(ArchivedApplication.job_seeker_id) == User.id', viewonly=True)
+
+    def __repr__(self):
+        return f"<ArchivedApplication ID {self.id} Status {self.status}>"
+
+# Archived applications of a job (employer) and of a seeker, newest first
+db.Index('ix_applications_archive_job_applied', ArchivedApplication.job_id, ArchivedApplication.applied_at.desc())
+db.Index('ix_applications_archive_seeker_applied', ArchivedApplication.job_seeker_id,
+         ArchivedApplication.applied_at.desc(), ArchivedApplication.id.desc())
+
+
+class OutboxEmail(db.Model):
+    """Email waiting to be sent by the outbox workers (see app/outbox.py)."""
+    __tablename__ = 'email_outbox'
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(255), nullable=False)
+    recipients = db.Column(db.Text, nullable=False) # JSON list of addresses
+    text_body = db.Column(db.Text, nullable=True)
+    html_body = db.Column(db.Text, nullable=True)
+    # Statuses: pending -> sending -> sent, or back to pending (retry) / failed (gave up)
+    status = db.Column(db.String(20), default='pending', nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    claim_token = db.Column(db.String(32), nullable=True, index=True) # Set by the worker that claimed the row
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    # Workers poll for "pending and due"
+    __table_args__ = (db.Index('ix_email_outbox_status_next', 'status', 'next_attempt_at'),)
+
+    def __repr__(self):
+        return f"<OutboxEmail {self.id} {self.status} attempts={self.attempts}>"
+
+class CacheVersion(db.Model):
+    """Version counter per cache namespace; bumping it invalidates that namespace (see app/cache.py)."""
+    __tablename__ = 'cache_versions'
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=True) # Last bump (Last-Modified for the JSON job list)
+
+    def __repr__(self):
+        return f"<CacheVersion {self.name}={self.version}>"
+
+class SiteStat(db.Model):
+    """One site-wide count (total users, pending jobs, ...) kept up to date by app/stats.py."""
+    __tablename__ = 'site_stats'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<SiteStat {self.name}={self.value}>"
+
+class JobFacet(db.Model):
+    """Approved-job count for one (location, category) pair, kept up to date by app/facets.py."""
+    __tablename__ = 'job_facets'
+
+    location = db.Column(db.String(100), primary_key=True) # Normalized: lower-case, single spaces
+    category = db.Column(db.String(100), primary_key=True) # Normalized; '' = no category
+    location_label = db.Column(db.String(100), nullable=False) # As first posted, for display
+    category_label = db.Column(db.String(100), nullable=False)
+    count = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<JobFacet {self.location}/{self.category}={self.count}>"
+
 # --- End of models.py ---
\ No newline at end of file
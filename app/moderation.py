@@ -0,0 +1,109 @@
+# --- app/moderation.py ---
+# Bulk job moderation for admins (approve / unapprove / delete many jobs at once).
+#
+# The target set is either explicit job IDs or a filter (status, employer). Jobs are processed in
+# chunks of CHUNK_SIZE IDs with set-based UPDATE/DELETE statements. Everything, including the
+# search index, site stats, job facets and page cache version, changes in the caller's single transaction.
+# Approvals are returned grouped by employer so the view can send each employer one email per batch.
+
+from collections import Counter, defaultdict
+from datetime import datetime
+from sqlalchemy import bindparam
+
+from . import db, search, stats, facets, uploads
+from .cache import invalidate_public_pages
+from .models import Job, Application
+
+ACTIONS = ('approve', 'unapprove', 'delete')
+CHUNK_SIZE = 500
+
+
+class ModerationResult:
+    """Outcome of one bulk action: how many jobs it touched and, for approvals, job IDs per employer."""
+
+    def __init__(self, action):
+        self.action = action
+        self.affected = 0
+        self.approved_by_employer = defaultdict(list)
+
+    def to_dict(self):
+        return {'action': self.action, 'affected': self.affected, 'employers': len(self.approved_by_employer)}
+
+
+def select_job_ids(status='all', employer_id=None):
+    """IDs of the jobs matching a manage_jobs-style filter, oldest first."""
+    query = db.session.query(Job.id)
+    if status == 'pending':
+        query = query.filter(Job.is_approved.is_(False))
+    elif status == 'approved':
+        query = query.filter(Job.is_approved.is_(True))
+    if employer_id:
+        query = query.filter(Job.employer_id == employer_id)
+    return [row.id for row in query.order_by(Job.id)]
+
+def _chunks(ids):
+    ids = sorted(set(ids))
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start:start + CHUNK_SIZE]
+
+
+def bulk_moderate(action, job_ids):
+    """Applies `action` to `job_ids` (jobs already in the target state are skipped). Caller commits."""
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown moderation action: {action}")
+    result = ModerationResult(action)
+    approved_removed = pending_removed = 0
+    facet_deltas = Counter()
+    ids_param = bindparam('ids', expanding=True)
+
+    for chunk in _chunks(job_ids):
+        rows = db.session.query(Job.id, Job.employer_id, Job.is_approved, Job.location, Job.category)\
+            .filter(Job.id.in_(chunk)).all()
+        if action == 'approve':
+            targets = [row for row in rows if not row.is_approved]
+        elif action == 'unapprove':
+            targets = [row for row in rows if row.is_approved]
+        else:
+            targets = rows
+        ids = [row.id for row in targets]
+        if not ids:
+            continue
+
+        if action == 'delete':
+            uploads.discard_spooled_for(Application.job_id.in_(ids))
+            db.session.execute(Application.__table__.delete().where(Application.job_id.in_(ids_param)), {'ids': ids})
+            db.session.execute(Job.__table__.delete().where(Job.id.in_(ids_param)), {'ids': ids})
+            search.remove_jobs(ids)
+            approved = sum(1 for row in targets if row.is_approved)
+            approved_removed += approved
+            pending_removed += len(ids) - approved
+        else:
+            db.session.execute(Job.__table__.update().where(Job.id.in_(ids_param))
+                               .values(is_approved=(action == 'approve'), version=Job.__table__.c.version + 1,
+                                       updated_at=datetime.utcnow()), {'ids': ids})
+            search.sync_jobs(ids)
+            if action == 'approve':
+                for row in targets:
+                    result.approved_by_employer[row.employer_id].append(row.id)
+        result.affected += len(ids)
+        for row in targets: # Listings entering (approve) or leaving (unapprove, delete of approved) the public set
+            if action == 'approve':
+                facet_deltas[(row.location, row.category)] += 1
+            elif row.is_approved:
+                facet_deltas[(row.location, row.category)] -= 1
+
+    if not result.affected:
+        return result
+    facets.adjust(facet_deltas)
+    if action == 'approve':
+        stats.adjust({stats.APPROVED_JOBS: result.affected, stats.PENDING_JOBS: -result.affected})
+    elif action == 'unapprove':
+        stats.adjust({stats.APPROVED_JOBS: -result.affected, stats.PENDING_JOBS: result.affected})
+    else:
+        stats.adjust({stats.TOTAL_JOBS: -result.affected, stats.APPROVED_JOBS: -approved_removed,
+                      stats.PENDING_JOBS: -pending_removed})
+    if action != 'delete' or approved_removed:
+        invalidate_public_pages() # Approved listings appeared or disappeared
+    return result
+
+# --- End of moderation.py ---
@@ -0,0 +1,185 @@
+# --- app/outbox.py ---
+# Email delivery.
+#
+# send_email() in views.py hands messages to deliver() here. What happens next depends on MAIL_USE_OUTBOX:
+#   * True  - the message becomes an OutboxEmail row in the caller's transaction. Outbox workers
+#             (in-process threads and/or `flask outbox-worker`) claim due rows in batches, send each
+#             batch over one SMTP connection and retry failures with exponential backoff.
+#   * False - the message is held on the session and sent over SMTP right after the caller's commit
+#             (dropped on rollback), so mail never goes out for changes that didn't persist. Under gevent
+#             workers the send runs in its own greenlet (concurrency.spawn).
+# Either way the caller must commit after queueing.
+
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from . import db, mail
+from .background import BackgroundPool
+from .concurrency import spawn
+
+_pool = None
+
+
+# --- Queueing ---
+def deliver(subject, sender, recipients, text_body, html_body):
+    """Queues one message for delivery once the current transaction commits."""
+    if current_app.config.get('MAIL_USE_OUTBOX'):
+        from .models import OutboxEmail
+        db.session.add(OutboxEmail(
+            subject=subject, sender=sender, recipients=json.dumps(recipients),
+            text_body=text_body, html_body=html_body
+        ))
+    else:
+        msg = Message(subject, sender=sender, recipients=recipients, body=text_body, html=html_body)
+        db.session.info.setdefault('pending_mail', []).append(msg)
+
+
+def _send_messages(messages):
+    for msg in messages:
+        try:
+            mail.send(msg)
+            current_app.logger.info(f"Email sent to {msg.recipients}")
+        except Exception as e:
+            current_app.logger.error(f"Email send fail to {msg.recipients}: {e}")
+
+@event.listens_for(Session, 'after_commit')
+def _send_after_commit(session):
+    messages = session.info.pop('pending_mail', None)
+    if messages:
+        # Under gevent workers SMTP runs in its own greenlet, so the request's pooled connection is released now
+        spawn(_send_messages, messages)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop('pending_mail', None)
+
+
+# --- Draining the Outbox ---
+def _claim_batch(batch_size):
+    """Marks up to `batch_size` due rows as ours and returns them."""
+    from .models import OutboxEmail
+    now = datetime.utcnow()
+
+    # Rows left in 'sending' by a crashed worker go back to the queue
+    stale_before = now - timedelta(seconds=current_app.config.get('MAIL_OUTBOX_CLAIM_TIMEOUT', 300))
+    OutboxEmail.query.filter(OutboxEmail.status == 'sending', OutboxEmail.claimed_at < stale_before)\
+        .update({'status': 'pending', 'claim_token': None}, synchronize_session=False)
+
+    due = db.session.query(OutboxEmail.id)\
+        .filter(OutboxEmail.status == 'pending', OutboxEmail.next_attempt_at <= now)\
+        .order_by(OutboxEmail.next_attempt_at, OutboxEmail.id).limit(batch_size)
+    if db.engine.dialect.name == 'postgresql':
+        due = due.with_for_update(skip_locked=True)
+    ids = [row.id for row in due]
+    if not ids:
+        db.session.commit()
+        return []
+
+    token = uuid.uuid4().hex
+    # Status check in the WHERE makes the claim safe if another worker grabbed some of the same rows
+    OutboxEmail.query.filter(OutboxEmail.id.in_(ids), OutboxEmail.status == 'pending')\
+        .update({'status': 'sending', 'claim_token': token, 'claimed_at': now}, synchronize_session=False)
+    db.session.commit()
+    return OutboxEmail.query.filter_by(claim_token=token).order_by(OutboxEmail.id).all()
+
+
+def _schedule_retry(row, error):
+    config = current_app.config
+    row.attempts += 1
+    row.last_error = str(error)[:2000]
+    row.claim_token = None
+    if row.attempts >= config.get('MAIL_OUTBOX_MAX_ATTEMPTS', 8):
+        row.status = 'failed'
+        current_app.logger.error(f"Outbox email {row.id} failed permanently after {row.attempts} attempts: {error}")
+        return
+    delay = min(config.get('MAIL_OUTBOX_BACKOFF_SECONDS', 30) * 2 ** (row.attempts - 1),
+                config.get('MAIL_OUTBOX_BACKOFF_MAX_SECONDS', 3600))
+    row.status = 'pending'
+    row.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+    current_app.logger.warning(f"Outbox email {row.id} attempt {row.attempts} failed, retry in {delay}s: {error}")
+
+
+def drain_once(batch_size=None):
+    """Sends one batch of due emails over a single SMTP connection. Returns the number of rows processed."""
+    batch_size = batch_size or current_app.config.get('MAIL_OUTBOX_BATCH_SIZE', 50)
+    rows = _claim_batch(batch_size)
+    if not rows:
+        return 0
+    sent = 0
+    try:
+        with mail.connect() as conn:
+            for row in rows:
+                msg = Message(row.subject, sender=row.sender, recipients=json.loads(row.recipients),
+                              body=row.text_body, html=row.html_body)
+                try:
+                    conn.send(msg)
+                    row.status = 'sent'
+                    row.sent_at = datetime.utcnow()
+                    row.attempts += 1
+                    row.claim_token = None
+                    sent += 1
+                except Exception as e:
+                    _schedule_retry(row, e)
+    except Exception as e: # Connect/login/quit failed
+        for row in rows:
+            if row.status == 'sending':
+                _schedule_retry(row, e)
+    db.session.commit()
+    current_app.logger.info(f"Outbox batch done: {sent}/{len(rows)} sent.")
+    return len(rows)
+
+
+def queue_depth():
+    """Returns outbox row counts by status plus the age (seconds) of the oldest pending row."""
+    from .models import OutboxEmail
+    counts = dict(db.session.query(OutboxEmail.status, func.count()).group_by(OutboxEmail.status).all())
+    oldest = db.session.query(func.min(OutboxEmail.created_at)).filter(OutboxEmail.status == 'pending').scalar()
+    depth = {status: counts.get(status, 0) for status in ('pending', 'sending', 'sent', 'failed')}
+    depth['oldest_pending_age'] = (datetime.utcnow() - oldest).total_seconds() if oldest else 0
+    return depth
+
+
+# --- Worker Pool ---
+def start_workers(app, threads=None):
+    """Starts the in-process outbox sender threads (once per process)."""
+    global _pool
+    if _pool is None or not _pool.running:
+        _pool = BackgroundPool(
+            app, 'outbox', drain_once,
+            threads=threads or app.config.get('MAIL_OUTBOX_WORKERS', 1),
+            interval=app.config.get('MAIL_OUTBOX_POLL_SECONDS', 5),
+        ).start()
+    return _pool
+
+
+# --- CLI ---
+@click.command('outbox-worker')
+@click.option('--threads', default=2, show_default=True, help='Sender threads.')
+def outbox_worker_command(threads):
+    """Runs outbox sender threads in the foreground until interrupted."""
+    app = current_app._get_current_object()
+    pool = BackgroundPool(app, 'outbox', drain_once, threads=threads,
+                          interval=app.config.get('MAIL_OUTBOX_POLL_SECONDS', 5)).start()
+    click.echo(f"Outbox worker running with {threads} thread(s). Ctrl-C to stop.")
+    try:
+        while pool.running:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+
+@click.command('outbox-status')
+def outbox_status_command():
+    """Prints outbox queue depth."""
+    for key, value in queue_depth().items():
+        click.echo(f"{key}: {value}")
+
+# --- End of outbox.py ---
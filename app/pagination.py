@@ -0,0 +1,178 @@
+# --- app/pagination.py ---
+# Keyset (cursor) pagination for the list pages.
+#
+# OFFSET pagination re-reads every skipped row and needs a COUNT(*) per page view. Keyset
+# pagination instead remembers the (sort value, id) of the last row shown and asks for rows
+# "after" it, so page N costs the same as page 1 (given an index on the sort columns).
+# Cursors are opaque url-safe tokens; the total count is optional (see COUNT_MODES).
+
+import base64
+import json
+import time
+import threading
+from datetime import datetime
+from flask import current_app, request
+
+from . import db
+
+# exact  - COUNT(*) on every page view (same as .paginate())
+# cached - exact count, cached in-process for PAGINATION_COUNT_CACHE_SECONDS
+# approx - planner estimate on PostgreSQL (EXPLAIN), cached count elsewhere
+# none   - no total at all
+COUNT_MODES = ('exact', 'cached', 'approx', 'none')
+
+_count_cache = {}
+_count_cache_lock = threading.Lock()
+
+
+class KeysetPage:
+    """A page of results plus cursors, exposing the bits of flask_sqlalchemy's Pagination the templates use."""
+    is_keyset = True
+
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None, total=None, total_is_estimate=False):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def use_keyset():
+    """True if the current request asked for cursor paging (or the app defaults to it)."""
+    return ('cursor' in request.args
+            or request.args.get('paging') == 'cursor'
+            or current_app.config.get('PAGINATION_MODE') == 'keyset')
+
+
+# --- Cursor Tokens ---
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+def _decode_value(value):
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+def encode_cursor(sort_value, row_id, direction):
+    payload = json.dumps([_encode_value(sort_value), row_id, direction], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(token):
+    """Returns (sort_value, row_id, direction) or None for a missing/garbled token."""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        sort_value, row_id, direction = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if direction not in ('next', 'prev') or not isinstance(row_id, int):
+            return None
+        return _decode_value(sort_value), row_id, direction
+    except Exception:
+        return None
+
+
+# --- Totals ---
+def _cache_key(query):
+    stmt = query.order_by(None).statement
+    compiled = stmt.compile(dialect=db.engine.dialect)
+    return f"{compiled}|{sorted((k, str(v)) for k, v in compiled.params.items())}"
+
+def _cached_count(query):
+    ttl = current_app.config.get('PAGINATION_COUNT_CACHE_SECONDS', 60)
+    key = _cache_key(query)
+    now = time.monotonic()
+    with _count_cache_lock:
+        hit = _count_cache.get(key)
+        if hit and hit[1] > now:
+            return hit[0]
+    total = query.order_by(None).count()
+    with _count_cache_lock:
+        if len(_count_cache) > 1000: # Keep the cache bounded; filters are user-controlled
+            _count_cache.clear()
+        _count_cache[key] = (total, now + ttl)
+    return total
+
+def _estimated_count(query):
+    """Row estimate from the PostgreSQL planner; falls back to a cached exact count."""
+    if db.engine.dialect.name != 'postgresql':
+        return _cached_count(query), False
+    try:
+        compiled = query.order_by(None).statement.compile(dialect=db.engine.dialect)
+        plan = db.session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows']), True
+    except Exception as e:
+        current_app.logger.warning(f"Count estimate failed, using cached count: {e}")
+        return _cached_count(query), False
+
+def count_total(query, mode=None):
+    """Returns (total, is_estimate) for a query according to the count mode."""
+    mode = mode or current_app.config.get('PAGINATION_COUNT_MODE', 'exact')
+    if mode == 'none':
+        return None, False
+    if mode == 'cached':
+        return _cached_count(query), False
+    if mode == 'approx':
+        return _estimated_count(query)
+    return query.order_by(None).count(), False
+
+
+# --- Paginate ---
+def keyset_paginate(query, sort_column, id_column, cursor=None, per_page=10, count_mode=None):
+    """
+    Pages `query` newest-first on (sort_column, id_column). Any existing ORDER BY is replaced.
+    `cursor` is a token from a previous page's next_cursor/prev_cursor (None = first page).
+    """
+    query = query.order_by(None)
+    key = decode_cursor(cursor)
+    backwards = key is not None and key[2] == 'prev'
+
+    page_query = query
+    if key is not None:
+        sort_value, row_id, _ = key
+        if backwards: # Rows shown above the first row of the current page
+            page_query = page_query.filter(db.or_(
+                sort_column > sort_value, db.and_(sort_column == sort_value, id_column > row_id)))
+        else:
+            page_query = page_query.filter(db.or_(
+                sort_column < sort_value, db.and_(sort_column == sort_value, id_column < row_id)))
+    if backwards:
+        page_query = page_query.order_by(sort_column.asc(), id_column.asc())
+    else:
+        page_query = page_query.order_by(sort_column.desc(), id_column.desc())
+
+    rows = page_query.limit(per_page + 1).all() # One extra row tells us if there is more
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    def key_of(item):
+        return getattr(item, sort_column.key), getattr(item, id_column.key)
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if has_more or backwards:
+            next_cursor = encode_cursor(*key_of(rows[-1]), 'next')
+        if (has_more and backwards) or (key is not None and not backwards):
+            prev_cursor = encode_cursor(*key_of(rows[0]), 'prev')
+
+    total, is_estimate = count_total(query, count_mode)
+    return KeysetPage(rows, per_page, next_cursor=next_cursor, prev_cursor=prev_cursor,
+                      total=total, total_is_estimate=is_estimate)
+
+# --- End of pagination.py ---
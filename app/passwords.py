@@ -0,0 +1,100 @@
+# --- app/passwords.py ---
+# Password hashing with a per-deployment scheme/cost and a bounded hashing pool.
+#
+# PASSWORD_HASH_METHOD is any werkzeug method string ('scrypt:32768:8:1', 'pbkdf2:sha256:600000', ...;
+# empty = werkzeug's default). Hashes made with a different method are replaced on the next
+# successful login (rehash_if_needed), so raising or lowering the cost needs no migration.
+#
+# Hashing and verification run on a small thread pool (PASSWORD_HASH_WORKERS per process; hashlib
+# releases the GIL while it works). At most PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE calls may be
+# in flight; beyond that, or after waiting PASSWORD_HASH_TIMEOUT seconds, PasswordHashingBusy is
+# raised and the view answers 503, so a login storm cannot tie up every worker thread. Under gevent
+# workers the pool is made of real OS threads (concurrency.native_executor), not greenlets.
+
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from .concurrency import native_executor
+
+DEFAULTS = {'PASSWORD_HASH_METHOD': '', 'PASSWORD_HASH_WORKERS': 2, 'PASSWORD_HASH_QUEUE': 16,
+            'PASSWORD_HASH_TIMEOUT': 10.0}
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+_method_prefixes = {}
+
+
+class PasswordHashingBusy(RuntimeError):
+    """Too many password hashes already queued in this process."""
+
+
+def _config(name):
+    if has_app_context():
+        return current_app.config.get(name, DEFAULTS[name])
+    return DEFAULTS[name]
+
+def _pool():
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = max(1, int(_config('PASSWORD_HASH_WORKERS')))
+                _slots = threading.BoundedSemaphore(workers + max(0, int(_config('PASSWORD_HASH_QUEUE'))))
+                _executor = native_executor(workers, thread_name_prefix='password-hash')
+    return _executor, _slots
+
+def _run(fn, *args):
+    """Runs fn on the hashing pool and waits for the result, or raises PasswordHashingBusy."""
+    executor, slots = _pool()
+    if not slots.acquire(blocking=False):
+        raise PasswordHashingBusy("Password hashing queue is full")
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release()) # Slot is held until the hash really finishes
+    try:
+        return future.result(timeout=float(_config('PASSWORD_HASH_TIMEOUT')))
+    except FutureTimeout:
+        raise PasswordHashingBusy("Password hashing timed out waiting for the pool")
+
+
+def hash_method():
+    return _config('PASSWORD_HASH_METHOD') or None # None = werkzeug default
+
+def method_prefix(method=None):
+    """Canonical '<scheme>:<params>' prefix werkzeug writes for `method` (e.g. 'pbkdf2' -> 'pbkdf2:sha256:1000000')."""
+    method = method if method is not None else hash_method()
+    if method not in _method_prefixes:
+        sample = generate_password_hash('', method) if method else generate_password_hash('')
+        _method_prefixes[method] = sample.split('$', 1)[0]
+    return _method_prefixes[method]
+
+
+def hash_password(password):
+    method = hash_method()
+    if method:
+        return _run(generate_password_hash, password, method)
+    return _run(generate_password_hash, password)
+
+def verify_password(password_hash, password):
+    if not password_hash:
+        return False
+    return _run(check_password_hash, password_hash, password)
+
+def needs_rehash(password_hash):
+    """True if the stored hash was made with a different scheme or cost than the configured one."""
+    return bool(password_hash) and password_hash.split('$', 1)[0] != method_prefix()
+
+def rehash_if_needed(user, password):
+    """After a successful check, re-hashes `password` with the configured method. Returns True if it changed (caller commits)."""
+    if not needs_rehash(user.password_hash):
+        return False
+    user.password_hash = hash_password(password)
+    return True
+
+# --- End of passwords.py ---
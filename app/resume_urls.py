@@ -0,0 +1,86 @@
+# --- app/resume_urls.py ---
+# Cloudinary delivery URLs for uploaded resumes, memoized.
+#
+# Building a URL is pure string work (plus a signature when signing is on), but the applications
+# page used to redo it for every row on every render. URLs are now kept in an in-process LRU
+# (RESUME_URL_CACHE_SIZE entries) keyed by public_id + the URL options. resume_urls() builds a whole
+# page's worth in one call, and views pass the result to the template.
+#
+# Entries live for RESUME_URL_CACHE_TTL seconds. When the options carry an expiry (`expires_at`,
+# epoch seconds, as used by signed/expiring delivery URLs), the entry is dropped
+# EXPIRY_MARGIN_SECONDS before that expiry, so a page never hands out a URL that is about to lapse.
+
+import time
+import cloudinary
+import cloudinary.utils
+from flask import current_app
+
+from .cache import TTLCache
+
+DEFAULT_OPTIONS = {'resource_type': 'raw', 'secure': True} # resource_type='raw' for PDFs/DOCs
+EXPIRY_MARGIN_SECONDS = 60
+
+_warned_unconfigured = False
+
+
+def init_resume_urls(app):
+    """Creates the URL cache (stored in app.extensions['resume_url_cache'])."""
+    app.extensions['resume_url_cache'] = TTLCache(maxsize=app.config.get('RESUME_URL_CACHE_SIZE', 4096),
+                                                  ttl=app.config.get('RESUME_URL_CACHE_TTL', 3600))
+
+
+def _cache_key(public_id, options):
+    return (public_id, tuple(sorted(options.items())))
+
+def _entry_ttl(options, default_ttl):
+    """Cache lifetime for a URL built with `options` (None = don't cache, it's about to expire)."""
+    expires_at = options.get('expires_at')
+    if expires_at is None:
+        return default_ttl
+    remaining = float(expires_at) - time.time() - EXPIRY_MARGIN_SECONDS
+    return min(default_ttl, remaining) if remaining > 0 else None
+
+def _configured():
+    global _warned_unconfigured
+    if cloudinary.config().cloud_name:
+        return True
+    if not _warned_unconfigured: # Once per process, not once per row
+        current_app.logger.warning("Cloudinary not configured, cannot generate resume URLs.")
+        _warned_unconfigured = True
+    return False
+
+def _build(public_id, options):
+    try:
+        url, _ = cloudinary.utils.cloudinary_url(public_id, **options) # Returns (url, remaining options)
+        return url
+    except Exception as e:
+        current_app.logger.error(f"Error generating Cloudinary URL for {public_id}: {e}")
+        return None
+
+
+def resume_urls(public_ids, **options):
+    """Returns {public_id: url or None} for every non-empty id, building only the ones not cached."""
+    options = {**DEFAULT_OPTIONS, **options}
+    wanted = {public_id for public_id in public_ids if public_id}
+    if not wanted or not _configured():
+        return {public_id: None for public_id in wanted}
+    cache = current_app.extensions['resume_url_cache']
+    ttl = _entry_ttl(options, cache.ttl)
+    urls = {}
+    for public_id in wanted:
+        key = _cache_key(public_id, options)
+        url = cache.get(key)
+        if url is None:
+            url = _build(public_id, options)
+            if url is not None and ttl is not None:
+                cache.set(key, url, ttl=ttl)
+        urls[public_id] = url
+    return urls
+
+def resume_url(public_id, **options):
+    """URL for one resume (None if there is none or Cloudinary isn't configured)."""
+    if not public_id:
+        return None
+    return resume_urls([public_id], **options)[public_id]
+
+# --- End of resume_urls.py ---
@@ -0,0 +1,304 @@
+# --- app/search.py ---
+# Full-text search for approved job listings.
+#
+# Backends (created by `flask bootstrap`, detected per process on first search):
+#   * 'fts5'     - SQLite FTS5 virtual table `jobs_fts` (rowid = jobs.id), ranked with bm25()
+#   * 'postgres' - side table `jobs_search` holding a weighted tsvector with a GIN index, ranked with ts_rank_cd()
+#   * 'fallback' - portable SQLAlchemy expressions (no DB extensions needed), ranked by weighted term hits
+#
+# Terms are words only (\w+); the fallback matches them with escaped LIKE patterns, so '_' is literal.
+# On PostgreSQL a query made only of stopwords narrows nothing, like an empty query.
+#
+# Only approved jobs live in the index. Views call sync_job()/remove_job() *before* committing,
+# so the index changes in the same transaction as the job itself.
+
+import re
+import click
+from flask import current_app
+from sqlalchemy import text, bindparam, Integer, Float
+
+from . import db
+
+# Column weights used for ranking (title matters most, description least)
+TITLE_WEIGHT = 10.0
+COMPANY_WEIGHT = 5.0
+DESCRIPTION_WEIGHT = 1.0
+
+MAX_QUERY_TERMS = 8
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _terms(query):
+    """Splits free text into lowercase search terms (punctuation/operators are dropped)."""
+    return [t.lower() for t in _TERM_RE.findall(query or '')][:MAX_QUERY_TERMS]
+
+
+def get_backend():
+    """Returns the search backend for the current app, detecting it on first use (no DDL on worker start)."""
+    backend = current_app.extensions.get('job_search')
+    if backend is None:
+        backend = current_app.extensions['job_search'] = detect_backend()
+    return backend
+
+def detect_backend():
+    """Picks the backend whose index already exists in the database (created by init_search_index)."""
+    dialect = db.engine.dialect.name
+    try:
+        if dialect == 'sqlite':
+            exists = db.session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='jobs_fts'"
+            )).first()
+            return 'fts5' if exists else 'fallback'
+        if dialect == 'postgresql':
+            exists = db.session.execute(text("SELECT to_regclass('jobs_search') IS NOT NULL")).scalar()
+            return 'postgres' if exists else 'fallback'
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Search backend detection failed, using fallback search: {e}")
+    return 'fallback'
+
+
+# --- Index Setup ---
+def init_search_index(app):
+    """Creates the search index for the app's database (if missing) and back-fills it. Run by `flask bootstrap`."""
+    dialect = db.engine.dialect.name
+    backend = 'fallback'
+    try:
+        if dialect == 'sqlite':
+            exists = db.session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='jobs_fts'"
+            )).first()
+            if not exists:
+                db.session.execute(text(
+                    "CREATE VIRTUAL TABLE jobs_fts USING fts5("
+                    "title, description, company_name, tokenize='porter unicode61')"
+                ))
+                _backfill_fts5()
+            backend = 'fts5'
+        elif dialect == 'postgresql':
+            db.session.execute(text(
+                "CREATE TABLE IF NOT EXISTS jobs_search ("
+                "job_id INTEGER PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE, "
+                "document TSVECTOR NOT NULL)"
+            ))
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_jobs_search_document ON jobs_search USING GIN (document)"
+            ))
+            empty = db.session.execute(text("SELECT NOT EXISTS (SELECT 1 FROM jobs_search)")).scalar()
+            if empty:
+                _backfill_postgres()
+            backend = 'postgres'
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Full-text index setup failed on '{dialect}', using fallback search: {e}")
+        backend = 'fallback'
+    app.extensions['job_search'] = backend
+    app.logger.info(f"Job search backend: {backend}")
+    return backend
+
+
+def _backfill_fts5():
+    db.session.execute(text("DELETE FROM jobs_fts"))
+    db.session.execute(text(
+        "INSERT INTO jobs_fts (rowid, title, description, company_name) "
+        "SELECT id, title, description, company_name FROM jobs WHERE is_approved"
+    ))
+
+_PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce({title}, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({company}, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce({description}, '')), 'D')"
+)
+
+def _backfill_postgres():
+    db.session.execute(text("DELETE FROM jobs_search"))
+    db.session.execute(text(
+        "INSERT INTO jobs_search (job_id, document) SELECT id, "
+        + _PG_DOCUMENT.format(title='title', company='company_name', description='description')
+        + " FROM jobs WHERE is_approved"
+    ))
+
+
+def rebuild_index():
+    """Drops and rebuilds the whole index from the jobs table. Caller commits."""
+    backend = get_backend()
+    if backend == 'fts5':
+        _backfill_fts5()
+    elif backend == 'postgres':
+        _backfill_postgres()
+    return backend
+
+
+# --- Index Maintenance (call before db.session.commit()) ---
+def sync_job(job):
+    """Adds/refreshes an approved job in the index, or removes it if it is not approved."""
+    if job.id is None:
+        db.session.flush() # Need the primary key for the index row
+    if not job.is_approved:
+        remove_job(job.id)
+        return
+    backend = get_backend()
+    params = {'id': job.id, 'title': job.title, 'description': job.description, 'company': job.company_name}
+    if backend == 'fts5':
+        db.session.execute(text("DELETE FROM jobs_fts WHERE rowid = :id"), {'id': job.id})
+        db.session.execute(text(
+            "INSERT INTO jobs_fts (rowid, title, description, company_name) "
+            "VALUES (:id, :title, :description, :company)"
+        ), params)
+    elif backend == 'postgres':
+        db.session.execute(text(
+            "INSERT INTO jobs_search (job_id, document) VALUES (:id, "
+            + _PG_DOCUMENT.format(title=':title', company=':company', description=':description')
+            + ") ON CONFLICT (job_id) DO UPDATE SET document = EXCLUDED.document"
+        ), params)
+
+
+def remove_job(job_id):
+    """Removes a job from the index (no-op if it was never indexed)."""
+    if job_id is None:
+        return
+    backend = get_backend()
+    if backend == 'fts5':
+        db.session.execute(text("DELETE FROM jobs_fts WHERE rowid = :id"), {'id': job_id})
+    elif backend == 'postgres':
+        db.session.execute(text("DELETE FROM jobs_search WHERE job_id = :id"), {'id': job_id})
+
+
+# --- Set-Based Maintenance (bulk moderation; call before db.session.commit()) ---
+def sync_jobs(job_ids):
+    """Re-indexes the given jobs from the jobs table in one statement per backend (unapproved ones drop out)."""
+    if not job_ids:
+        return
+    remove_jobs(job_ids)
+    backend = get_backend()
+    ids = bindparam('ids', expanding=True)
+    if backend == 'fts5':
+        db.session.execute(text(
+            "INSERT INTO jobs_fts (rowid, title, description, company_name) "
+            "SELECT id, title, description, company_name FROM jobs WHERE is_approved AND id IN :ids"
+        ).bindparams(ids), {'ids': list(job_ids)})
+    elif backend == 'postgres':
+        db.session.execute(text(
+            "INSERT INTO jobs_search (job_id, document) SELECT id, "
+            + _PG_DOCUMENT.format(title='title', company='company_name', description='description')
+            + " FROM jobs WHERE is_approved AND id IN :ids"
+        ).bindparams(ids), {'ids': list(job_ids)})
+
+def remove_jobs(job_ids):
+    """Removes the given jobs from the index in one statement."""
+    if not job_ids:
+        return
+    backend = get_backend()
+    ids = bindparam('ids', expanding=True)
+    if backend == 'fts5':
+        db.session.execute(text("DELETE FROM jobs_fts WHERE rowid IN :ids").bindparams(ids), {'ids': list(job_ids)})
+    elif backend == 'postgres':
+        db.session.execute(text("DELETE FROM jobs_search WHERE job_id IN :ids").bindparams(ids), {'ids': list(job_ids)})
+
+
+# --- Querying ---
+def _fts5_match(terms):
+    # Each term quoted (so user input can't inject FTS syntax) and prefix-matched; terms are ANDed
+    return ' '.join(f'"{t}"*' for t in terms)
+
+def _pg_tsquery(terms):
+    return ' & '.join(f'{t}:*' for t in terms)
+
+def _pg_only_stopwords(tsquery):
+    # to_tsquery() drops English stopwords, so a query made only of them comes out empty and would match
+    # nothing; this is true for such queries, which then keep the base query's rows
+    return text("numnode(to_tsquery('english', :stop_tsq)) = 0").bindparams(stop_tsq=tsquery)
+
+def _like_pattern(term):
+    # '_' is a word character, so it survives _terms(); LIKE wildcards are matched literally
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+def _fallback_filter(base_query, terms):
+    from .models import Job
+    for t in terms:
+        pattern = _like_pattern(t)
+        base_query = base_query.filter(db.or_(
+            Job.title.ilike(pattern, escape='\\'), Job.company_name.ilike(pattern, escape='\\'),
+            Job.description.ilike(pattern, escape='\\')
+        ))
+    return base_query
+
+
+def match_jobs(base_query, query):
+    """
+    Narrows a Job query to listings matching `query` without ranking them (cheaper, for counts and
+    facets). Returns the query unchanged if `query` has no usable terms.
+    """
+    from .models import Job
+    terms = _terms(query)
+    if not terms:
+        return base_query
+    backend = get_backend()
+    if backend == 'fts5':
+        ids = text("SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH :match")\
+            .bindparams(match=_fts5_match(terms)).columns(rowid=Integer)
+        return base_query.filter(Job.id.in_(ids))
+    if backend == 'postgres':
+        tsquery = _pg_tsquery(terms)
+        ids = text("SELECT job_id FROM jobs_search WHERE document @@ to_tsquery('english', :tsq)")\
+            .bindparams(tsq=tsquery).columns(job_id=Integer)
+        return base_query.filter(db.or_(_pg_only_stopwords(tsquery), Job.id.in_(ids)))
+    return _fallback_filter(base_query, terms)
+
+def search_jobs(base_query, query):
+    """
+    Narrows a Job query to listings matching `query`, ordered by relevance (best first).
+    Returns the query unchanged if `query` has no usable terms.
+    """
+    from .models import Job
+    terms = _terms(query)
+    if not terms:
+        return base_query
+    backend = get_backend()
+
+    if backend == 'fts5':
+        match = _fts5_match(terms)
+        hits = text(
+            "SELECT rowid AS job_id, bm25(jobs_fts, :w_title, :w_desc, :w_company) AS score "
+            "FROM jobs_fts WHERE jobs_fts MATCH :match"
+        ).bindparams(match=match, w_title=TITLE_WEIGHT, w_desc=DESCRIPTION_WEIGHT, w_company=COMPANY_WEIGHT)\
+         .columns(job_id=Integer, score=Float).subquery('job_hits')
+        # bm25() is lower-is-better
+        return base_query.join(hits, Job.id == hits.c.job_id).order_by(hits.c.score.asc(), Job.posted_at.desc())
+
+    if backend == 'postgres':
+        tsquery = _pg_tsquery(terms)
+        hits = text(
+            "SELECT job_id, ts_rank_cd(document, to_tsquery('english', :tsq)) AS score "
+            "FROM jobs_search WHERE document @@ to_tsquery('english', :tsq)"
+        ).bindparams(tsq=tsquery).columns(job_id=Integer, score=Float).subquery('job_hits')
+        # Outer join, so a stopword-only query keeps every base row (newest first) instead of none
+        return base_query.outerjoin(hits, Job.id == hits.c.job_id)\
+            .filter(db.or_(_pg_only_stopwords(tsquery), hits.c.job_id.isnot(None)))\
+            .order_by(db.func.coalesce(hits.c.score, 0.0).desc(), Job.posted_at.desc())
+
+    # Fallback: every term must appear in one of the columns; rank by weighted column hits
+    score = None
+    base_query = _fallback_filter(base_query, terms)
+    for t in terms:
+        pattern = _like_pattern(t)
+        term_score = (
+            db.case((Job.title.ilike(pattern, escape='\\'), TITLE_WEIGHT), else_=0.0)
+            + db.case((Job.company_name.ilike(pattern, escape='\\'), COMPANY_WEIGHT), else_=0.0)
+            + db.case((Job.description.ilike(pattern, escape='\\'), DESCRIPTION_WEIGHT), else_=0.0)
+        )
+        score = term_score if score is None else score + term_score
+    return base_query.order_by(score.desc(), Job.posted_at.desc())
+
+
+# --- CLI ---
+@click.command('search-reindex')
+def reindex_command():
+    """Rebuilds the job full-text search index."""
+    backend = rebuild_index()
+    db.session.commit()
+    click.echo(f"Search index rebuilt (backend: {backend}).")
+
+# --- End of search.py ---
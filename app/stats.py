@@ -0,0 +1,138 @@
+# --- app/stats.py ---
+# Site-wide counts for the admin pages (users, jobs, pending jobs, approved jobs).
+#
+# The counts live in the small `site_stats` table. Views adjust them with UPDATE value = value + n in
+# the same transaction as the change (user registered/deleted, job posted/approved/unapproved/
+# edited/deleted), so the admin dashboard and manage_jobs read four rows instead of running
+# COUNT(*) over `jobs` and `users`. Reads go through an in-process TTL cache that is cleared when a
+# transaction that adjusted a stat commits. A reconcile pass (background thread every
+# STATS_RECONCILE_SECONDS, or `flask stats-reconcile`) recounts everything and fixes any drift.
+
+import click
+from flask import current_app
+from sqlalchemy import event, func, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from . import db
+from .background import BackgroundPool
+from .cache import TTLCache
+
+TOTAL_USERS = 'total_users'
+TOTAL_JOBS = 'total_jobs'
+PENDING_JOBS = 'pending_jobs'
+APPROVED_JOBS = 'approved_jobs'
+STAT_NAMES = (TOTAL_USERS, TOTAL_JOBS, PENDING_JOBS, APPROVED_JOBS)
+
+_pool = None
+
+
+def _cache():
+    return current_app.extensions['site_stats_cache']
+
+
+# --- Reading ---
+def get_stats():
+    """Returns {name: count} for all site stats (cached in-process for STATS_CACHE_SECONDS)."""
+    from .models import SiteStat
+    stats = _cache().get('all')
+    if stats is None:
+        rows = dict(db.session.query(SiteStat.name, SiteStat.value).all())
+        if any(name not in rows for name in STAT_NAMES): # Table not populated yet
+            rows = reconcile()
+            db.session.commit()
+        stats = {name: rows[name] for name in STAT_NAMES}
+        _cache().set('all', stats)
+    return stats
+
+
+# --- Incremental Updates (call before db.session.commit()) ---
+def adjust(deltas):
+    """Adds {name: delta} to the stats in the caller's transaction."""
+    from .models import SiteStat
+    for name, delta in deltas.items():
+        if delta:
+            SiteStat.query.filter_by(name=name)\
+                .update({'value': SiteStat.value + delta}, synchronize_session=False)
+            db.session.info['site_stats_changed'] = True
+
+def user_added():
+    adjust({TOTAL_USERS: 1})
+
+def user_removed():
+    adjust({TOTAL_USERS: -1})
+
+def job_changed(job, deleted=False):
+    """Updates job totals for a new, re-approved/unapproved or deleted job. Call before the session flushes."""
+    state = sa_inspect(job)
+    approval = state.attrs.is_approved.history
+    was_approved = bool(approval.deleted[0]) if approval.deleted else bool(job.is_approved)
+    if state.transient or state.pending:
+        adjust({TOTAL_JOBS: 1, APPROVED_JOBS if job.is_approved else PENDING_JOBS: 1})
+    elif deleted:
+        adjust({TOTAL_JOBS: -1, APPROVED_JOBS if was_approved else PENDING_JOBS: -1})
+    elif was_approved != bool(job.is_approved):
+        adjust({APPROVED_JOBS: 1 if job.is_approved else -1, PENDING_JOBS: -1 if job.is_approved else 1})
+
+
+@event.listens_for(Session, 'after_commit')
+def _clear_cache_after_commit(session):
+    if session.info.pop('site_stats_changed', None):
+        _cache().clear()
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_after_rollback(session, previous_transaction):
+    session.info.pop('site_stats_changed', None)
+
+
+# --- Reconciliation ---
+def reconcile():
+    """Recounts every stat from the source tables and stores the results. Caller commits. Returns {name: count}."""
+    from .models import User, Job, SiteStat
+    job_counts = dict(db.session.query(Job.is_approved, func.count(Job.id)).group_by(Job.is_approved).all())
+    actual = {
+        TOTAL_USERS: db.session.query(func.count(User.id)).scalar() or 0,
+        PENDING_JOBS: job_counts.get(False, 0),
+        APPROVED_JOBS: job_counts.get(True, 0),
+    }
+    actual[TOTAL_JOBS] = actual[PENDING_JOBS] + actual[APPROVED_JOBS]
+    stored = {row.name: row for row in SiteStat.query.all()}
+    for name, value in actual.items():
+        row = stored.get(name)
+        if row is None:
+            db.session.add(SiteStat(name=name, value=value))
+        elif row.value != value:
+            current_app.logger.warning(f"Site stat '{name}' drifted: stored {row.value}, actual {value}. Corrected.")
+            row.value = value
+    db.session.info['site_stats_changed'] = True
+    return actual
+
+def reconcile_once():
+    reconcile()
+    db.session.commit()
+    return 0 # Nothing queued; the pool sleeps until the next reconcile
+
+
+def init_stats(app):
+    """Creates the in-process stats cache (stored in app.extensions['site_stats_cache'])."""
+    app.extensions['site_stats_cache'] = TTLCache(maxsize=4, ttl=app.config.get('STATS_CACHE_SECONDS', 30))
+
+def start_reconciler(app):
+    """Starts the periodic reconcile thread (once per process)."""
+    global _pool
+    if _pool is None or not _pool.running:
+        interval = app.config.get('STATS_RECONCILE_SECONDS', 3600)
+        _pool = BackgroundPool(app, 'stats-reconcile', reconcile_once, threads=1,
+                               interval=interval, start_delay=interval).start() # Not on worker boot
+    return _pool
+
+
+# --- CLI ---
+@click.command('stats-reconcile')
+def stats_reconcile_command():
+    """Recounts site-wide stats (users, jobs, pending/approved jobs) and fixes drift."""
+    actual = reconcile()
+    db.session.commit()
+    for name, value in actual.items():
+        click.echo(f"{name}: {value}")
+
+# --- End of stats.py ---
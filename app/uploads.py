@@ -0,0 +1,189 @@
+# --- app/uploads.py ---
+# Resume uploads to Cloudinary.
+#
+# RESUME_UPLOAD_MODE='sync'  - apply_job uploads while the request is open (original behaviour).
+# RESUME_UPLOAD_MODE='async' - apply_job only writes the PDF to RESUME_SPOOL_FOLDER and commits the
+#                              Application with resume_status='pending'. Uploader threads (started
+#                              per app process, or `flask resume-uploader`) push spooled files to
+#                              Cloudinary and fill in resume_public_id. The spool folder is local
+#                              disk, so uploaders must run on the same host as the web workers.
+# A failed upload is retried after RESUME_UPLOAD_BACKOFF_SECONDS, doubling per attempt, until
+# RESUME_UPLOAD_MAX_ATTEMPTS marks it 'failed'. Applications deleted while their resume waits (job or
+# user deletion, bulk delete) are skipped by the uploader, and their spool files go once the delete commits.
+
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+import click
+import cloudinary
+import cloudinary.uploader
+from flask import current_app
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session
+
+from . import db
+from .background import BackgroundPool
+
+_pool = None
+
+
+def resume_public_id_for(job_id, filename):
+    """Builds a unique Cloudinary public ID (folder + name) for a resume."""
+    unique_id = uuid.uuid4().hex[:12]
+    return f"job_portal/resumes/{job_id}/{unique_id}_{filename}"
+
+
+def is_async():
+    return current_app.config.get('RESUME_UPLOAD_MODE') == 'async'
+
+
+# --- Spooling (request side) ---
+def spool_resume(file_storage, job_id, filename):
+    """Saves an uploaded resume to the local spool folder and returns its path."""
+    folder = os.path.join(current_app.config['RESUME_SPOOL_FOLDER'], str(job_id))
+    os.makedirs(folder, exist_ok=True)
+    # Spool name doubles as the final Cloudinary name (see _public_id_from_spool)
+    path = os.path.join(folder, os.path.basename(resume_public_id_for(job_id, filename)))
+    file_storage.save(path)
+    return path
+
+def discard_spooled(path):
+    """Deletes a spooled file (e.g. after the DB commit failed)."""
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass # Already gone (e.g. the uploader and a deletion both dropped it)
+        except OSError as e:
+            current_app.logger.warning(f"Could not remove spooled resume {path}: {e}")
+
+def _public_id_from_spool(application):
+    return f"job_portal/resumes/{application.job_id}/{os.path.basename(application.resume_spool_path)}"
+
+def discard_spooled_for(*criteria):
+    """Deletes the spool files of the applications matching `criteria` once the current transaction commits. Call before deleting them."""
+    from .models import Application
+    paths = [path for (path,) in db.session.query(Application.resume_spool_path)
+             .filter(Application.resume_spool_path.isnot(None), *criteria)]
+    if paths:
+        db.session.info.setdefault('spool_discard', []).extend(paths)
+
+@event.listens_for(Session, 'after_commit')
+def _discard_after_commit(session):
+    for path in session.info.pop('spool_discard', None) or ():
+        discard_spooled(path)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _keep_after_rollback(session, previous_transaction):
+    session.info.pop('spool_discard', None)
+
+
+# --- Uploader (background side) ---
+def _claim(application_id):
+    """Atomically moves one application from pending to uploading. True if this thread got it."""
+    from .models import Application
+    claimed = Application.query.filter_by(id=application_id, resume_status='pending')\
+        .update({'resume_status': 'uploading', 'resume_claimed_at': datetime.utcnow()}, synchronize_session=False)
+    db.session.commit()
+    return claimed == 1
+
+
+def upload_pending_once(batch_size=None):
+    """Uploads a batch of spooled resumes. Returns the number uploaded successfully."""
+    from .models import Application
+    config = current_app.config
+    batch_size = batch_size or config.get('RESUME_UPLOAD_BATCH_SIZE', 10)
+
+    # Rows stuck in 'uploading' (uploader died mid-way) go back to pending
+    stale_before = datetime.utcnow() - timedelta(seconds=config.get('RESUME_UPLOAD_CLAIM_TIMEOUT', 600))
+    Application.query.filter(Application.resume_status == 'uploading', Application.resume_claimed_at < stale_before)\
+        .update({'resume_status': 'pending'}, synchronize_session=False)
+    db.session.commit()
+
+    now = datetime.utcnow()
+    due = db.session.query(Application.id, Application.resume_spool_path)\
+        .filter(Application.resume_status == 'pending',
+                or_(Application.resume_next_attempt_at.is_(None), Application.resume_next_attempt_at <= now))\
+        .order_by(Application.id).limit(batch_size).all()
+    uploaded = 0
+    for application_id, spool_path in due:
+        if not _claim(application_id):
+            continue # Another uploader took it, or the application is gone
+        application = db.session.get(Application, application_id)
+        if application is None: # Deleted (with its job or user) since the claim
+            _skip_deleted(application_id, spool_path)
+            continue
+        try:
+            public_id = _public_id_from_spool(application)
+            result = cloudinary.uploader.upload(application.resume_spool_path, public_id=public_id, resource_type="raw")
+            if not result or not result.get('public_id'):
+                raise Exception(f"Cloudinary upload did not return public_id. Result: {result}")
+            application.resume_public_id = result.get('public_id')
+            application.resume_status = 'uploaded'
+            application.resume_upload_attempts += 1
+            spool_path = application.resume_spool_path
+            application.resume_spool_path = None
+            db.session.commit()
+            discard_spooled(spool_path)
+            uploaded += 1
+            current_app.logger.info(f"Spooled resume uploaded for application {application_id}: {application.resume_public_id}")
+        except Exception as e:
+            db.session.rollback()
+            application = db.session.get(Application, application_id)
+            if application is None: # Deleted mid-upload (the commit above found no row)
+                _skip_deleted(application_id, spool_path)
+                continue
+            _schedule_retry(application, e)
+            db.session.commit()
+    return uploaded
+
+def _skip_deleted(application_id, spool_path):
+    current_app.logger.info(f"Application {application_id} was deleted before its resume was uploaded; dropping the spool file.")
+    discard_spooled(spool_path)
+
+def _schedule_retry(application, error):
+    config = current_app.config
+    application.resume_upload_attempts += 1
+    if application.resume_upload_attempts >= config.get('RESUME_UPLOAD_MAX_ATTEMPTS', 5):
+        application.resume_status = 'failed' # Spool file kept for manual recovery
+        current_app.logger.error(f"Resume upload for application {application.id} failed permanently: {error}")
+        return
+    delay = min(config.get('RESUME_UPLOAD_BACKOFF_SECONDS', 30) * 2 ** (application.resume_upload_attempts - 1),
+                config.get('RESUME_UPLOAD_BACKOFF_MAX_SECONDS', 1800))
+    application.resume_status = 'pending'
+    application.resume_next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+    current_app.logger.warning(f"Resume upload for application {application.id} failed "
+                               f"(attempt {application.resume_upload_attempts}), retry in {delay}s: {error}")
+
+
+def start_uploaders(app, threads=None):
+    """Starts the in-process resume uploader threads (once per process)."""
+    global _pool
+    if _pool is None or not _pool.running:
+        _pool = BackgroundPool(
+            app, 'resume-uploader', upload_pending_once,
+            threads=threads or app.config.get('RESUME_UPLOAD_WORKERS', 2),
+            interval=app.config.get('RESUME_UPLOAD_POLL_SECONDS', 2),
+        ).start()
+    return _pool
+
+
+# --- CLI ---
+@click.command('resume-uploader')
+@click.option('--threads', default=2, show_default=True, help='Uploader threads.')
+def resume_uploader_command(threads):
+    """Runs resume uploader threads in the foreground until interrupted."""
+    app = current_app._get_current_object()
+    pool = BackgroundPool(app, 'resume-uploader', upload_pending_once, threads=threads,
+                          interval=app.config.get('RESUME_UPLOAD_POLL_SECONDS', 2)).start()
+    click.echo(f"Resume uploader running with {threads} thread(s). Ctrl-C to stop.")
+    try:
+        while pool.running:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+
+# --- End of uploads.py ---
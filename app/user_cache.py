@@ -0,0 +1,96 @@
+# --- app/user_cache.py ---
+# Identity cache in front of Flask-Login's user loader.
+#
+# Every authenticated request used to load its User row before any view code ran. Now load_user()
+# first looks for a snapshot of the user's columns and rebuilds the User from it without touching
+# the database. The rebuilt object is merged into the session as persistent, so relationships and
+# columns left out of the snapshot (the password hash) still lazy-load when needed.
+# Where snapshots live decides how far an eviction reaches:
+#   * CACHE_BACKEND set (redis / custom) - only in the shared store, no per-process copy. Changes to a
+#     user (verification, password reset, deletion) delete that user's key there once their
+#     transaction commits, so every worker sees the change on its next request.
+#   * CACHE_BACKEND=local - a per-process TTL LRU. The committing process deletes the key; other
+#     processes keep their copy for up to USER_CACHE_TTL seconds, so keep it short.
+
+import json
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from . import db
+from .cache import TTLCache, make_shared_backend
+
+# Snapshot columns (never the password hash; snapshots may sit in a shared cache)
+CACHED_FIELDS = ('id', 'username', 'email', 'role', 'is_verified', 'company_name', 'created_at')
+
+
+def init_user_cache(app):
+    """Creates the identity cache (stored in app.extensions['user_cache']): the shared backend if any, else a local LRU."""
+    shared = make_shared_backend(app)
+    app.extensions['user_cache'] = shared if shared is not None else \
+        TTLCache(maxsize=app.config.get('USER_CACHE_MAX_ENTRIES', 2048), ttl=app.config.get('USER_CACHE_TTL', 30))
+
+def _key(user_id):
+    return f"user:{user_id}"
+
+def _cache_call(method, *args):
+    """Runs a cache operation; a failing shared backend counts as a miss rather than failing the request."""
+    try:
+        return getattr(current_app.extensions['user_cache'], method)(*args)
+    except Exception as e:
+        current_app.logger.warning(f"User cache {method} failed: {e}")
+        return None
+
+def _snapshot(user):
+    fields = {name: getattr(user, name) for name in CACHED_FIELDS}
+    if fields['created_at'] is not None:
+        fields['created_at'] = fields['created_at'].isoformat()
+    return json.dumps(fields).encode()
+
+def _restore(data):
+    from .models import User
+    fields = json.loads(data)
+    if fields.get('created_at'):
+        fields['created_at'] = datetime.fromisoformat(fields['created_at'])
+    user = User(**fields)
+    make_transient_to_detached(user) # Treat as an already-loaded row...
+    return db.session.merge(user, load=False) # ...and attach it to this request's session without a SELECT
+
+
+def load_user(user_id):
+    """Returns the User for a session's user id, from the cache when possible (None if it doesn't exist)."""
+    from .models import User
+    user_id = int(user_id)
+    if not current_app.config.get('USER_CACHE_ENABLED'):
+        return db.session.get(User, user_id)
+    data = _cache_call('get', _key(user_id))
+    if data is not None:
+        try:
+            return _restore(data)
+        except Exception as e:
+            current_app.logger.warning(f"Discarding unreadable cached user {user_id}: {e}")
+            _cache_call('delete', _key(user_id))
+    user = db.session.get(User, user_id)
+    if user is not None:
+        _cache_call('set', _key(user_id), _snapshot(user), current_app.config.get('USER_CACHE_TTL', 30))
+    return user
+
+
+# --- Invalidation ---
+def evict(user_id):
+    """Drops a user's cached snapshot once the current transaction commits. Call before db.session.commit()."""
+    db.session.info.setdefault('user_cache_evict', set()).add(int(user_id))
+
+@event.listens_for(Session, 'after_commit')
+def _evict_after_commit(session):
+    user_ids = session.info.pop('user_cache_evict', None)
+    if user_ids and 'user_cache' in current_app.extensions:
+        for user_id in user_ids:
+            _cache_call('delete', _key(user_id))
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _keep_after_rollback(session, previous_transaction):
+    session.info.pop('user_cache_evict', None)
+
+# --- End of user_cache.py ---
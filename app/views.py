@@ -1,26 +1,32 @@
 # --- app/views.py ---
 
-import os
-import uuid
+import csv
 from functools import wraps
 from datetime import datetime
 from flask import (
-    render_template, redirect, url_for, flash, request, Blueprint, current_app, abort, send_from_directory
+    render_template, redirect, url_for, flash, request, Blueprint, current_app, abort, jsonify,
+    Response, stream_with_context
 )
 from flask_login import login_user, logout_user, login_required, current_user
-from flask_mail import Message
 from itsdangerous import SignatureExpired, BadSignature
 from werkzeug.utils import secure_filename
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import joinedload
 # Import Cloudinary specific modules
 import cloudinary
 import cloudinary.uploader
 
-from . import db, mail, serializer
-from .models import User, Job, Application
+from . import db, serializer, search, outbox, uploads, counters, stats, facets, moderation, user_cache, passwords, exports, job_import, archive, job_api
+from .pagination import use_keyset, keyset_paginate
+from .cache import cached_page, invalidate_public_pages
+from .resume_urls import resume_urls
+from .instrumentation import query_budget, sql_stats_summary
+from .engine import metrics as engine_metrics, pool_stats
+from .concurrency import release_connection
+from .models import User, Job, Application, ArchivedJob, ArchivedApplication
 from .forms import (
     RegistrationForm, LoginForm, JobForm, RequestResetForm, ResetPasswordForm, ApplicationForm,
-    RejectApplicationForm
+    RejectApplicationForm, JobImportForm
 )
 
 # --- Blueprints ---
@@ -29,6 +35,7 @@ auth_bp = Blueprint('auth', __name__)
 jobs_bp = Blueprint('jobs', __name__)
 employers_bp = Blueprint('employers', __name__)
 admin_bp = Blueprint('admin', __name__)
+api_bp = Blueprint('api', __name__)
 
 
 # --- Decorators for Role Checks (VERIFIED SYNTAX & INDENTATION) ---
@@ -66,21 +73,56 @@ def job_seeker_required(f):
 
 # --- Helper Function for Sending Emails ---
 def send_email(subject, recipients, text_body, html_body):
+    """Queues an email that goes out once the current DB transaction commits (see app/outbox.py). Commit after calling."""
     if not isinstance(recipients, list): current_app.logger.error(f"Recipient not list: {recipients}"); return False
     if not recipients: current_app.logger.error("Recipients empty."); return False
     if not current_app.config.get('MAIL_USERNAME') or not current_app.config.get('MAIL_PASSWORD'): current_app.logger.error("Mail not configured."); return False
     sender = current_app.config.get('MAIL_DEFAULT_SENDER') or current_app.config.get('MAIL_USERNAME', 'noreply@example.com')
-    msg = Message(subject, sender=sender, recipients=recipients, body=text_body, html=html_body)
     try:
-        mail.send(msg)
-        current_app.logger.info(f"Email sent to {recipients}")
+        outbox.deliver(subject, sender, recipients, text_body, html_body)
+        current_app.logger.info(f"Email queued for {recipients}")
         return True
     except Exception as e:
-        current_app.logger.error(f"Email send fail to {recipients}: {e}")
+        current_app.logger.error(f"Email queue fail for {recipients}: {e}")
         return False
 
+# --- Helper for Job Listing Changes ---
+def _job_listing_changed(job, deleted=False):
+    """Keeps derived listing data (site stats, facets, search index, public page cache, API version) in step with a job. Call before db.session.commit()."""
+    # Read attribute history first: the helpers' UPDATEs autoflush, which resets it
+    state = sa_inspect(job)
+    approval = state.attrs.is_approved.history
+    was_public = bool(approval.deleted[0]) if approval.deleted else (bool(job.is_approved) and job.id is not None)
+    facet_deltas = facets.job_deltas(job, deleted=deleted)
+    if state.persistent and not deleted: # New validators for API clients (ETag / Last-Modified)
+        job.version = Job.version + 1
+        job.updated_at = datetime.utcnow()
+    stats.job_changed(job, deleted=deleted)
+    facets.adjust(facet_deltas)
+    # Public pages only show approved jobs, so only changes to (formerly) approved jobs invalidate them
+    if job.is_approved or was_public:
+        invalidate_public_pages()
+    if deleted:
+        search.remove_job(job.id)
+    else:
+        search.sync_job(job)
+
+# --- Helpers for Listing Filters ---
+def _listing_filter_value(name):
+    """A location/category filter from the query string, with whitespace trimmed and collapsed."""
+    return ' '.join(request.args.get(name, '').split())
+
+def _filter_listing(q, loc, cat):
+    """Applies the case-insensitive substring filters on location/category (% and _ match literally)."""
+    def pattern(value):
+        return '%' + value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    if loc: q = q.filter(Job.location.ilike(pattern(loc), escape='\\'))
+    if cat: q = q.filter(Job.category.ilike(pattern(cat), escape='\\'))
+    return q
+
 # --- Main Routes ---
 @main_bp.route('/')
+@cached_page
 def index():
     recent_jobs = Job.query.filter_by(is_approved=True).order_by(Job.posted_at.desc()).limit(5).all()
     return render_template('index.html', jobs=recent_jobs)
@@ -108,11 +150,15 @@ def register():
     form = RegistrationForm()
     if form.validate_on_submit():
         user=User(username=form.username.data, email=form.email.data.lower(), role=form.role.data, company_name=form.company_name.data if form.role.data == 'employer' else None, is_verified=False)
-        user.set_password(form.password.data)
+        try:
+            user.set_password(form.password.data)
+        except passwords.PasswordHashingBusy:
+            flash('The site is busy right now. Please try again in a moment.', 'warning')
+            return render_template('auth/register.html', title='Register', form=form), 503
         db.session.add(user)
         try:
-            db.session.commit()
-            current_app.logger.info(f"User registered: {user.username}, sending email.")
+            stats.user_added()
+            # Verification email is queued in the same transaction as the new user
             token = serializer.dumps(user.email, salt=current_app.config['SECURITY_PASSWORD_SALT'])
             verify_url = url_for('auth.verify_email', token=token, _external=True)
             subject = "Confirm Email"
@@ -122,15 +168,18 @@ def register():
             except Exception as template_error:
                  current_app.logger.error(f"Error rendering verification email template: {template_error}")
                  html_body = text_body # Fallback
+            email_queued = send_email(subject, [user.email], text_body, html_body)
 
-            if send_email(subject, [user.email], text_body, html_body):
+            db.session.commit()
+            current_app.logger.info(f"User registered: {user.username}, verification email queued: {email_queued}.")
+            if email_queued:
                 flash('Registered! Check email to verify.', 'success')
             else:
                 flash('Registered, but verification email failed.', 'warning')
                 if not current_app.config.get('MAIL_USERNAME') or not current_app.config.get('MAIL_PASSWORD'):
                      flash("Email functionality may be disabled due to configuration issues.", "danger")
                 else:
-                     flash("Could not connect to the email server.", "danger")
+                     flash("Could not queue the verification email.", "danger")
             return redirect(url_for('auth.login'))
         except Exception as e:
             db.session.rollback()
@@ -153,6 +202,7 @@ def verify_email(token):
         flash('Already verified.', 'info')
     else:
         user.is_verified = True
+        user_cache.evict(user.id)
         db.session.commit()
         flash('Email verified!', 'success')
         current_app.logger.info(f"Email verified: {user.username}")
@@ -165,10 +215,22 @@ def login():
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(email=form.email.data.lower()).first()
-        if user and user.check_password(form.password.data):
+        try:
+            password_ok = bool(user) and user.check_password(form.password.data)
+        except passwords.PasswordHashingBusy:
+            flash('The site is busy right now. Please try again in a moment.', 'warning')
+            return render_template('auth/login.html', title='Login', form=form), 503
+        if password_ok:
             if not user.is_verified:
                 flash('Account not verified.', 'warning')
                 return redirect(url_for('auth.login'))
+            try: # Move the stored hash to the configured scheme/cost while we have the plain password
+                if passwords.rehash_if_needed(user, form.password.data):
+                    db.session.commit()
+                    current_app.logger.info(f"Password hash upgraded for user {user.id}")
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.warning(f"Password rehash skipped for user {user.id}: {e}")
             login_user(user, remember=form.remember_me.data)
             flash(f'Welcome {user.username}!', 'success')
             current_app.logger.info(f"Login: {user.username}")
@@ -214,6 +276,7 @@ def forgot_password():
                 current_app.logger.error(f"Error rendering reset password template: {e}")
                 html = text # Fallback
             if send_email(subject, [user.email], text, html):
+                db.session.commit() # Releases the queued email
                 sent = True
             else:
                 flash('Failed to send reset email.', 'danger')
@@ -239,7 +302,12 @@ def reset_password(token):
     user = User.query.filter_by(email=email).first_or_404()
     form = ResetPasswordForm()
     if form.validate_on_submit():
-        user.set_password(form.password.data)
+        try:
+            user.set_password(form.password.data)
+        except passwords.PasswordHashingBusy:
+            flash('The site is busy right now. Please try again in a moment.', 'warning')
+            return render_template('auth/reset_password.html', title='Reset Password', form=form, token=token), 503
+        user_cache.evict(user.id)
         db.session.commit()
         flash('Password reset!', 'success')
         current_app.logger.info(f"Password reset: {user.username}")
@@ -250,21 +318,43 @@ def reset_password(token):
 # --- Job Seeker Routes ---
 @jobs_bp.route('/')
 @jobs_bp.route('/list')
+@cached_page
+@query_budget(5) # Location/category filters add one COUNT
 def job_list():
     page = request.args.get('page', 1, type=int)
     query = request.args.get('q', '')
-    loc = request.args.get('location', '')
-    cat = request.args.get('category', '')
-    q = Job.query.filter_by(is_approved=True)
-    if query: q = q.filter(db.or_(Job.title.ilike(f'%{query}%'), Job.description.ilike(f'%{query}%'), Job.company_name.ilike(f'%{query}%')))
-    if loc: q = q.filter(Job.location.ilike(f'%{loc}%'))
-    if cat: q = q.filter(Job.category.ilike(f'%{cat}%'))
-    jobs = q.order_by(Job.posted_at.desc()).paginate(page=page, per_page=10, error_out=False)
-    return render_template('jobs/index.html', title='Find Jobs', jobs=jobs, query=query, location=loc, category=cat)
+    loc = _listing_filter_value('location')
+    cat = _listing_filter_value('category')
+    filtered = _filter_listing(Job.query.filter_by(is_approved=True), loc, cat)
+    if query:
+        q = search.search_jobs(filtered, query) # Full-text match, ordered by relevance
+    else:
+        q = filtered.order_by(Job.posted_at.desc())
+    approved = Job.query.filter_by(is_approved=True)
+    keyword_matches = search.match_jobs(approved, query) if query else approved
+    if keyword_matches is not approved: # Facets over the keyword matches (location/category filters applied per facet)
+        facet_counts = facets.search_facet_counts(keyword_matches, loc, cat, keyword=query)
+    else:
+        facet_counts = facets.facet_counts(loc, cat) # Maintained counts, no GROUP BY over jobs
+    if use_keyset(): # Cursor mode pages newest-first, even for keyword searches
+        jobs = keyset_paginate(q, Job.posted_at, Job.id, cursor=request.args.get('cursor'), per_page=10, count_mode='none')
+    else:
+        jobs = q.paginate(page=page, per_page=10, error_out=False, count=False)
+    if loc or cat:
+        # Facets match normalized values in Python, which can differ from the database's ilike (case folding of
+        # non-ASCII text on SQLite, whitespace inside stored values), so filtered totals come from the rows' own filter
+        jobs.total = (search.match_jobs(filtered, query) if query else filtered).order_by(None).count()
+    else:
+        jobs.total = facet_counts['total'] # Every approved (keyword-matching) job: no COUNT(*) needed
+    return render_template('jobs/index.html', title='Find Jobs', jobs=jobs, query=query, location=loc, category=cat,
+                           facet_counts=facet_counts)
 
 @jobs_bp.route('/<int:job_id>')
 def job_detail(job_id):
-    job = Job.query.filter_by(id=job_id, is_approved=True).first_or_404()
+    job = Job.query.filter_by(id=job_id, is_approved=True).first()
+    if job is None: # Archived listings stay readable (closed, no apply form)
+        job = ArchivedJob.query.filter_by(id=job_id, is_approved=True).first_or_404()
+        return render_template('jobs/detail.html', title=job.title, job=job, archived=True, already_applied=False, form=None)
     applied = False
     form = None
     if current_user.is_authenticated and current_user.role == 'job_seeker':
@@ -287,41 +377,50 @@ def apply_job(job_id):
         f = form.resume.data
         filename = secure_filename(f.filename)
         cloudinary_public_id = None # Initialize
+        spool_path = None # Set instead in async upload mode
 
         if not filename:
             flash('Invalid resume filename provided.', 'danger')
             return render_template('jobs/detail.html', title=job.title, job=job, already_applied=False, form=form)
 
-        # Cloudinary Upload
-        try:
-            cld_folder = f"job_portal/resumes/{job.id}"
-            unique_id = uuid.uuid4().hex[:12]
-            # Define the desired public ID (folder structure + unique name)
-            cld_public_id = f"{cld_folder}/{unique_id}_{filename}"
-
-            current_app.logger.info(f"Attempting to upload resume to Cloudinary with public_id: {cld_public_id}")
-            # Upload using the file stream, ONLY providing public_id
-            upload_result = cloudinary.uploader.upload(
-                f,
-                public_id=cld_public_id, # Set the desired ID including folder
-                resource_type="raw"     # Treat as generic file
-            )
-
-            # Verify upload and get the confirmed public ID
-            if upload_result and upload_result.get('public_id'):
-                cloudinary_public_id = upload_result.get('public_id')
-                # Log the *actual* ID returned, it should match cld_public_id if successful
-                current_app.logger.info(f"Resume uploaded successfully. Returned public_id: {cloudinary_public_id}")
-                # Optional sanity check:
-                # if cloudinary_public_id != cld_public_id:
-                #    current_app.logger.warning(f"Cloudinary returned slightly different public_id: {cloudinary_public_id}")
-            else:
-                raise Exception(f"Cloudinary upload failed or did not return public_id. Result: {upload_result}")
+        if uploads.is_async():
+            # Async mode: spool to local disk now, background uploader pushes it to Cloudinary later
+            try:
+                spool_path = uploads.spool_resume(f, job.id, filename)
+            except Exception as e:
+                current_app.logger.error(f"Resume spool error for user {current_user.id}, job {job_id}: {e}")
+                flash("Error saving resume. Please try again.", 'danger')
+                return render_template('jobs/detail.html', title=job.title, job=job, already_applied=False, form=form)
+        else:
+            # Cloudinary Upload (sync mode, while the request is open)
+            release_connection() # Don't hold a pooled DB connection for the upload's network wait
+            try:
+                # Define the desired public ID (folder structure + unique name)
+                cld_public_id = uploads.resume_public_id_for(job.id, filename)
+
+                current_app.logger.info(f"Attempting to upload resume to Cloudinary with public_id: {cld_public_id}")
+                # Upload using the file stream, ONLY providing public_id
+                upload_result = cloudinary.uploader.upload(
+                    f,
+                    public_id=cld_public_id, # Set the desired ID including folder
+                    resource_type="raw"     # Treat as generic file
+                )
+
+                # Verify upload and get the confirmed public ID
+                if upload_result and upload_result.get('public_id'):
+                    cloudinary_public_id = upload_result.get('public_id')
+                    # Log the *actual* ID returned, it should match cld_public_id if successful
+                    current_app.logger.info(f"Resume uploaded successfully. Returned public_id: {cloudinary_public_id}")
+                    # Optional sanity check:
+                    # if cloudinary_public_id != cld_public_id:
+                    #    current_app.logger.warning(f"Cloudinary returned slightly different public_id: {cloudinary_public_id}")
+                else:
+                    raise Exception(f"Cloudinary upload failed or did not return public_id. Result: {upload_result}")
 
-        except Exception as e:
-            current_app.logger.error(f"Cloudinary upload error for user {current_user.id}, job {job_id}: {e}")
-            flash("Error uploading resume to cloud storage. Please try again.", 'danger')
-            return render_template('jobs/detail.html', title=job.title, job=job, already_applied=False, form=form)
+            except Exception as e:
+                current_app.logger.error(f"Cloudinary upload error for user {current_user.id}, job {job_id}: {e}")
+                flash("Error uploading resume to cloud storage. Please try again.", 'danger')
+                return render_template('jobs/detail.html', title=job.title, job=job, already_applied=False, form=form)
 
         # Create Application Record
         app_record = Application(
@@ -329,16 +428,16 @@ def apply_job(job_id):
             expected_ctc=form.expected_ctc.data, notice_period_days=form.notice_period_days.data,
             earliest_join_date=form.earliest_join_date.data,
             resume_public_id=cloudinary_public_id, # Use renamed field
+            resume_status='pending' if spool_path else 'uploaded',
+            resume_spool_path=spool_path,
             status='Submitted'
         )
         db.session.add(app_record)
         try:
-            db.session.commit()
-            flash('Application submitted!', 'success')
-            current_app.logger.info(f"Application saved: user {current_user.id}, job {job_id}, resume_id: {cloudinary_public_id}")
+            counters.application_added(job.id, app_record.status)
             now_time = datetime.utcnow()
 
-            # Send Emails
+            # Queue Emails (sent once the application is committed)
             try: # Seeker Email
                 subj_seeker = f"Application Received: {job.title}"
                 job_url = url_for('jobs.job_detail', job_id=job.id, _external=True)
@@ -346,7 +445,7 @@ def apply_job(job_id):
                 html_seeker = render_template('jobs/email/application_confirmation.html',
                                               user=current_user, job=job, job_url=job_url, now=now_time)
                 if send_email(subj_seeker, [current_user.email], text_seeker, html_seeker):
-                    current_app.logger.info(f"App confirm email sent to {current_user.email}")
+                    current_app.logger.info(f"App confirm email queued for {current_user.email}")
                 else:
                     flash("Confirm email failed to send.", "warning")
             except Exception as e:
@@ -362,17 +461,22 @@ def apply_job(job_id):
                     html_emp = render_template('employers/email/new_application_notification.html',
                                                employer=emp, job=job, applicant=current_user, apps_url=apps_url, now=now_time)
                     if send_email(subj_emp, [emp.email], text_emp, html_emp):
-                        current_app.logger.info(f"New app email sent to {emp.email}")
+                        current_app.logger.info(f"New app email queued for {emp.email}")
                     # else: No flash needed for user if employer email fails
                 else:
                     current_app.logger.warning(f"Employer email not found for job {job_id}")
             except Exception as e:
                 current_app.logger.error(f"Employer notify email error: {e}")
 
+            db.session.commit()
+            flash('Application submitted!', 'success')
+            current_app.logger.info(f"Application saved: user {current_user.id}, job {job_id}, resume_id: {cloudinary_public_id or 'pending upload'}")
             return redirect(url_for('jobs.job_detail', job_id=job_id))
         except Exception as e:
             db.session.rollback()
             current_app.logger.error(f"App DB save error: {e}")
+            if spool_path: # Nothing reached Cloudinary yet; just drop the local copy
+                uploads.discard_spooled(spool_path)
             if cloudinary_public_id: # Attempt to delete orphaned Cloudinary file
                 try:
                     cloudinary.uploader.destroy(cloudinary_public_id, resource_type="raw")
@@ -390,22 +494,67 @@ def apply_job(job_id):
 @jobs_bp.route('/my-applications')
 @login_required
 @job_seeker_required
+@query_budget(4)
 def my_applications():
     page = request.args.get('page', 1, type=int)
     applications_query = Application.query.options(joinedload(Application.job))\
                                         .filter_by(job_seeker_id=current_user.id)\
                                         .order_by(Application.applied_at.desc())
-    applications = applications_query.paginate(page=page, per_page=15, error_out=False)
+    if use_keyset():
+        applications = keyset_paginate(applications_query, Application.applied_at, Application.id, cursor=request.args.get('cursor'), per_page=15)
+    else:
+        applications = applications_query.paginate(page=page, per_page=15, error_out=False)
     return render_template('jobs/my_applications.html', title="My Applications", applications=applications)
 
+@jobs_bp.route('/my-applications/archived')
+@login_required
+@job_seeker_required
+@query_budget(4)
+def my_archived_applications():
+    """Read-only list of the seeker's applications to jobs that were archived (see app/archive.py)."""
+    page = request.args.get('page', 1, type=int)
+    applications = ArchivedApplication.query.options(joinedload(ArchivedApplication.job))\
+                                            .filter_by(job_seeker_id=current_user.id)\
+                                            .order_by(ArchivedApplication.applied_at.desc(), ArchivedApplication.id.desc())\
+                                            .paginate(page=page, per_page=15, error_out=False)
+    return render_template('jobs/my_archived_applications.html', title="Archived Applications", applications=applications)
+
 # --- Employer Routes ---
 @employers_bp.route('/dashboard')
 @employer_required
+@query_budget(4)
 def dashboard():
     page = request.args.get('page', 1, type=int)
+    # Application counts come from the denormalized counters on each job (see app/counters.py)
     jobs = Job.query.filter_by(employer_id=current_user.id).order_by(Job.posted_at.desc()).paginate(page=page, per_page=10, error_out=False)
     return render_template('employers/dashboard.html', title='Employer Dashboard', jobs=jobs)
 
+@employers_bp.route('/jobs/archived')
+@employer_required
+@query_budget(4)
+def archived_jobs():
+    """Read-only list of the employer's archived jobs (see app/archive.py)."""
+    page = request.args.get('page', 1, type=int)
+    jobs = ArchivedJob.query.filter_by(employer_id=current_user.id).order_by(ArchivedJob.posted_at.desc())\
+                            .paginate(page=page, per_page=10, error_out=False)
+    return render_template('employers/archived_jobs.html', title='Archived Jobs', jobs=jobs)
+
+@employers_bp.route('/jobs/archived/<int:job_id>/applications')
+@employer_required
+@query_budget(5)
+def archived_applications(job_id):
+    """Read-only list of an archived job's applications."""
+    job = ArchivedJob.query.get_or_404(job_id)
+    if job.employer_id != current_user.id: abort(403)
+    page = request.args.get('page', 1, type=int)
+    applications = ArchivedApplication.query.options(joinedload(ArchivedApplication.job_seeker)).filter_by(job_id=job_id)\
+        .order_by(ArchivedApplication.status.asc(), ArchivedApplication.applied_at.desc())\
+        .paginate(page=page, per_page=15, error_out=False, count=False)
+    applications.total = job.applications_count # Counters were archived with the job
+    resume_links = resume_urls(app_obj.resume_public_id for app_obj in applications.items)
+    return render_template('employers/archived_applications.html', title=f'Applications for {job.title}', job=job,
+                           applications=applications, resume_links=resume_links)
+
 @employers_bp.route('/jobs/new', methods=['GET', 'POST'])
 @employer_required
 def post_job():
@@ -414,10 +563,8 @@ def post_job():
         job = Job(title=form.title.data, description=form.description.data, salary=form.salary.data, location=form.location.data, category=form.category.data, company_name=current_user.company_name or "N/A", employer_id=current_user.id, is_approved=False)
         db.session.add(job)
         try:
-            db.session.commit()
-            flash('Job posted pending approval.', 'success')
-            current_app.logger.info(f"Job posted: {job.id} by {current_user.id}")
-            # Admin Notification
+            _job_listing_changed(job) # Also flushes, so job.id/posted_at are set for the email
+            # Admin Notification (queued with the job)
             try:
                 admins = User.query.filter_by(role='admin').all()
                 emails = [a.email for a in admins if a.email]
@@ -427,11 +574,14 @@ def post_job():
                     text = f"New job '{job.title}' needs approval.\nReview: {url}"
                     html = render_template('admin/email/new_job_notification.html', job=job, user=current_user, admin_jobs_url=url)
                     send_email(subj, emails, text, html)
-                    current_app.logger.info(f"Admin notification sent: {emails}")
+                    current_app.logger.info(f"Admin notification queued: {emails}")
                 else:
                     current_app.logger.warning("No admins found for notification.")
             except Exception as e:
                 current_app.logger.error(f"Admin notify email error: {e}")
+            db.session.commit()
+            flash('Job posted pending approval.', 'success')
+            current_app.logger.info(f"Job posted: {job.id} by {current_user.id}")
             return redirect(url_for('employers.dashboard'))
         except Exception as e:
             db.session.rollback()
@@ -450,6 +600,7 @@ def edit_job(job_id):
         form.populate_obj(job)
         job.is_approved = False
         try:
+            _job_listing_changed(job)
             db.session.commit()
             flash('Job updated pending re-approval.', 'success')
             current_app.logger.info(f"Job edited: {job_id} by {current_user.id}")
@@ -466,6 +617,8 @@ def delete_job(job_id):
     job = Job.query.get_or_404(job_id)
     if job.employer_id != current_user.id: abort(403)
     try:
+        _job_listing_changed(job, deleted=True)
+        uploads.discard_spooled_for(Application.job_id == job.id)
         db.session.delete(job)
         db.session.commit()
         flash('Job deleted.', 'success')
@@ -478,14 +631,118 @@ def delete_job(job_id):
 
 @employers_bp.route('/jobs/<int:job_id>/applications')
 @employer_required
+@query_budget(5)
 def view_applications(job_id):
     job = Job.query.get_or_404(job_id)
     if job.employer_id != current_user.id: abort(403)
     page = request.args.get('page', 1, type=int)
-    apps_query = Application.query.filter_by(job_id=job_id).order_by(Application.status.asc(), Application.applied_at.desc())
-    applications = apps_query.paginate(page=page, per_page=15, error_out=False)
+    apps_query = Application.query.options(joinedload(Application.job_seeker)).filter_by(job_id=job_id).order_by(Application.status.asc(), Application.applied_at.desc())
+    # Total comes from the job's application counter instead of a COUNT(*) per page view
+    if use_keyset(): # Cursor mode orders by applied date only (no status grouping)
+        applications = keyset_paginate(apps_query, Application.applied_at, Application.id, cursor=request.args.get('cursor'), per_page=15, count_mode='none')
+    else:
+        applications = apps_query.paginate(page=page, per_page=15, error_out=False, count=False)
+    applications.total = job.applications_count
+    resume_links = resume_urls(app_obj.resume_public_id for app_obj in applications.items) # Whole page in one call
     reject_form = RejectApplicationForm()
-    return render_template('employers/applications.html', title=f'Applications for {job.title}', job=job, applications=applications, reject_form=reject_form)
+    return render_template('employers/applications.html', title=f'Applications for {job.title}', job=job, applications=applications,
+                           resume_links=resume_links, reject_form=reject_form)
+
+@employers_bp.route('/jobs/<int:job_id>/applications/export')
+@employer_required
+def export_applications(job_id):
+    """Streams every application for the job as CSV (default) or JSON Lines (?format=jsonl)."""
+    job = Job.query.get_or_404(job_id)
+    if job.employer_id != current_user.id: abort(403)
+    export = exports.export_applications(job.id, request.args.get('format', 'csv'))
+    if export is None:
+        abort(400)
+    chunks, mimetype, extension = export
+    current_app.logger.info(f"Applications export ({extension}) for job {job_id} by {current_user.id}")
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="job-{job.id}-applications.{extension}"'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@employers_bp.route('/jobs/import', methods=['GET', 'POST'])
+@employer_required
+def import_jobs():
+    """Creates pending jobs from an uploaded CSV / JSON Lines file (see app/job_import.py)."""
+    form = JobImportForm()
+    result = None
+    if form.validate_on_submit():
+        result = _run_job_import(form, current_user, approve=False)
+        if result is not None and result.imported and not result.errors and not result.insert_error:
+            return redirect(url_for('employers.dashboard'))
+    return render_template('employers/import_jobs.html', title='Import Jobs', form=form, result=result,
+                           is_admin=False, fields=job_import.FIELDS)
+
+def _run_job_import(form, employer, approve):
+    """Imports form.file for `employer` and queues one admin summary email. Flashes the outcome; returns the ImportResult (None on an unreadable file)."""
+    upload = form.file.data
+    fmt = job_import.detect_format(upload.filename)
+    try:
+        result = job_import.import_jobs(
+            job_import.parse_rows(upload.stream, fmt), employer, approve=approve,
+            batch_size=current_app.config.get('JOB_IMPORT_BATCH_SIZE', 500),
+            max_rows=current_app.config.get('JOB_IMPORT_MAX_ROWS', 5000))
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback() # Nothing was inserted: the whole file is read before the first batch
+        flash(f'Could not read the file (use UTF-8 CSV with a header row, or JSON Lines): {e}', 'danger')
+        current_app.logger.warning(f"Job import by {current_user.id} failed to parse: {e}")
+        return None
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Error importing jobs: {e}', 'danger')
+        current_app.logger.error(f"Job import error: {e}")
+        return None
+    if result.imported and not approve:
+        _queue_job_import_notification(employer, result)
+    elif result.imported:
+        _queue_job_import_approval(employer, result)
+    current_app.logger.info(f"Job import by {current_user.id} for employer {employer.id}: {result.imported} of {result.rows} row(s) imported, {len(result.errors)} rejected.")
+    if result.imported:
+        state = 'approved' if approve else 'pending approval'
+        flash(f'Imported {result.imported} job(s) ({state}).', 'success')
+    if result.insert_error:
+        flash(f'The import stopped part-way; only the jobs counted above were saved. {result.insert_error}', 'danger')
+        current_app.logger.error(f"Job import by {current_user.id} stopped: {result.insert_error}")
+    if result.errors:
+        flash(f'{len(result.errors)} row(s) were not imported; see the report below.', 'warning')
+    elif not result.imported:
+        flash('The file has no job rows.', 'warning')
+    return result
+
+def _queue_job_import_notification(employer, result, listed=20):
+    """Queues one email to all admins summarizing the jobs an import left pending, then commits."""
+    try:
+        admins = User.query.filter_by(role='admin').all()
+        emails = [a.email for a in admins if a.email]
+        if not emails:
+            current_app.logger.warning("No admins found for notification.")
+            return
+        url = url_for('admin.manage_jobs', status='pending', _external=True)
+        titles = result.titles[:listed]
+        subj = f"{result.imported} Imported Job(s) Need Approval"
+        text = f"{employer.company_name or employer.username} imported {result.imported} job(s) needing approval:\n" \
+            + "\n".join(f"- {title}" for title in titles) \
+            + (f"\n...and {result.imported - len(titles)} more" if result.imported > len(titles) else "") + f"\nReview: {url}"
+        html = render_template('admin/email/jobs_imported_notification.html', employer=employer, count=result.imported,
+                               titles=titles, admin_jobs_url=url)
+        send_email(subj, emails, text, html)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Admin import notify email error: {e}")
+
+def _queue_job_import_approval(employer, result):
+    """Queues the employer's batched approval email for jobs an admin imported pre-approved, then commits."""
+    try:
+        _queue_bulk_approval_emails({employer.id: result.job_ids})
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Import approval email error for employer {employer.id}: {e}")
 
 # download_resume route was removed
 
@@ -504,6 +761,7 @@ def reject_application(application_id):
 
     form = RejectApplicationForm()
     if form.validate_on_submit():
+        counters.application_status_changed(job.id, application.status, 'Rejected')
         application.status = 'Rejected'
         application.status_updated_at = datetime.utcnow()
         selected_reason_text = dict(form.reason.choices).get(form.reason.data, "No specific reason provided")
@@ -511,10 +769,7 @@ def reject_application(application_id):
         if form.notes.data:
             application.rejection_reason += f" | Notes: {form.notes.data}"
         try:
-            db.session.commit()
-            flash(f"Application from {application.job_seeker.username} rejected.", "success")
-            current_app.logger.info(f"Employer {current_user.id} rejected app {application_id}.")
-            # Send rejection email
+            # Queue rejection email (sent once the status change is committed)
             try:
                 applicant = application.job_seeker
                 if applicant and applicant.email:
@@ -522,12 +777,15 @@ def reject_application(application_id):
                     text = f"Update on {job.title}:\nReason: {selected_reason_text}\nNotes: {form.notes.data or 'N/A'}"
                     html = render_template('jobs/email/application_rejection.html', applicant=applicant, job=job, reason=selected_reason_text, notes=form.notes.data)
                     send_email(subject, [applicant.email], text, html)
-                    current_app.logger.info(f"Sent rejection email to {applicant.email}")
+                    current_app.logger.info(f"Queued rejection email for {applicant.email}")
                 else:
                     current_app.logger.warning(f"Applicant email not found for app {application_id}")
             except Exception as e:
                 current_app.logger.error(f"Rejection email error: {e}")
                 flash("App rejected, but notification failed.", "warning")
+            db.session.commit()
+            flash(f"Application from {application.job_seeker.username} rejected.", "success")
+            current_app.logger.info(f"Employer {current_user.id} rejected app {application_id}.")
         except Exception as e:
             db.session.rollback()
             flash("DB error updating application.", "danger")
@@ -566,17 +824,14 @@ def update_application_status(application_id):
         return redirect(url_for('employers.view_applications', job_id=job.id))
 
     # Update status and timestamp
+    counters.application_status_changed(job.id, application.status, new_status)
     application.status = new_status
     application.status_updated_at = datetime.utcnow()
     if application.status != 'Rejected': # Clear rejection reason if moving to non-rejected state
          application.rejection_reason = None
 
     try:
-        db.session.commit()
-        flash(f"Application status updated to '{new_status}'.", "success")
-        current_app.logger.info(f"Employer {current_user.id} updated app {application_id} status to '{new_status}'.")
-
-        # Send Email Notification (Example for Offer Made)
+        # Queue Email Notification (Example for Offer Made), sent once the update is committed
         if new_status == 'Offer Made':
             try:
                 applicant = application.job_seeker
@@ -585,13 +840,16 @@ def update_application_status(application_id):
                     text_body = f"Hello {applicant.username},\n\nWe are pleased to extend an offer for '{job.title}'. Details to follow.\n\nRegards"
                     html_body = render_template('jobs/email/offer_notification.html', applicant=applicant, job=job)
                     send_email(subject, [applicant.email], text_body, html_body)
-                    current_app.logger.info(f"Sent offer notification to {applicant.email}")
+                    current_app.logger.info(f"Queued offer notification for {applicant.email}")
                 else:
                     current_app.logger.warning(f"Applicant/email not found for app {application_id}, cannot send offer email.")
             except Exception as e:
                 current_app.logger.error(f"Offer email error for app {application_id}: {e}")
                 flash("Status updated, but failed to send offer notification email.", "warning")
 
+        db.session.commit()
+        flash(f"Application status updated to '{new_status}'.", "success")
+        current_app.logger.info(f"Employer {current_user.id} updated app {application_id} status to '{new_status}'.")
     except Exception as e:
         db.session.rollback()
         flash("Database error updating application status.", "danger")
@@ -604,16 +862,29 @@ def update_application_status(application_id):
 @admin_bp.route('/dashboard')
 @admin_required
 def dashboard():
-    pending = Job.query.filter_by(is_approved=False).count()
-    total_users = User.query.count()
-    total_jobs = Job.query.count()
-    return render_template('admin/index.html', title='Admin Dashboard', pending_jobs_count=pending, total_users_count=total_users, total_jobs_count=total_jobs)
+    site = stats.get_stats() # Maintained counts, no COUNT(*) per view (see app/stats.py)
+    return render_template('admin/index.html', title='Admin Dashboard', pending_jobs_count=site[stats.PENDING_JOBS], total_users_count=site[stats.TOTAL_USERS], total_jobs_count=site[stats.TOTAL_JOBS])
+
+@admin_bp.route('/sql-stats')
+@admin_required
+def sql_stats():
+    """Rolling per-endpoint SQL summary and connection-pool usage for this worker process (endpoints need SQL_INSTRUMENTATION)."""
+    if request.args.get('reset') == '1':
+        if current_app.extensions.get('sql_stats'):
+            current_app.extensions['sql_stats'].reset()
+        engine_metrics.reset()
+    return jsonify(enabled=bool(current_app.config.get('SQL_INSTRUMENTATION')), endpoints=sql_stats_summary(),
+                   pool=pool_stats())
 
 @admin_bp.route('/users')
 @admin_required
+@query_budget(4)
 def manage_users():
     page = request.args.get('page', 1, type=int)
-    users = User.query.order_by(User.created_at.desc()).paginate(page=page, per_page=15, error_out=False)
+    if use_keyset():
+        users = keyset_paginate(User.query, User.created_at, User.id, cursor=request.args.get('cursor'), per_page=15)
+    else:
+        users = User.query.order_by(User.created_at.desc()).paginate(page=page, per_page=15, error_out=False)
     return render_template('admin/manage_users.html', title='Manage Users', users=users)
 
 @admin_bp.route('/users/<int:user_id>/edit', methods=['GET', 'POST'])
@@ -624,6 +895,7 @@ def edit_user(user_id):
         action_taken = False
         if 'toggle_verify' in request.form:
             user.is_verified = not user.is_verified
+            user_cache.evict(user.id)
             db.session.commit()
             flash(f"User '{user.username}' verification updated.", "success")
             current_app.logger.info(f"Admin {current_user.id} toggled verification for user {user.id}.")
@@ -647,6 +919,12 @@ def delete_user(user_id):
          return redirect(url_for('admin.manage_users'))
     username = user_to_delete.username
     try:
+        # Applications go with the seeker, taken off each job's counters in the same transaction
+        uploads.discard_spooled_for(Application.job_seeker_id == user_to_delete.id)
+        counters.remove_seeker_applications(user_to_delete.id)
+        archive.remove_user_records(user_to_delete.id)
+        stats.user_removed()
+        user_cache.evict(user_to_delete.id)
         db.session.delete(user_to_delete)
         db.session.commit()
         flash(f'User {username} deleted.', 'success')
@@ -659,21 +937,27 @@ def delete_user(user_id):
 
 @admin_bp.route('/jobs')
 @admin_required
+@query_budget(4)
 def manage_jobs():
     page = request.args.get('page', 1, type=int)
     status = request.args.get('status', 'all')
-    query = Job.query
+    site = stats.get_stats() # Filter counts and the pagination total come from the maintained stats
+    query = Job.query.options(joinedload(Job.employer))
+    total = site[stats.TOTAL_JOBS]
     if status == 'pending':
         query = query.filter_by(is_approved=False)
+        total = site[stats.PENDING_JOBS]
     elif status == 'approved':
         query = query.filter_by(is_approved=True)
-    jobs = query.order_by(Job.is_approved.asc(), Job.posted_at.desc()).paginate(page=page, per_page=15, error_out=False)
-    total = Job.query.count()
-    pending = Job.query.filter_by(is_approved=False).count()
-    approved = Job.query.filter_by(is_approved=True).count()
+        total = site[stats.APPROVED_JOBS]
+    if use_keyset(): # Cursor mode orders by posted date only (no pending-first grouping)
+        jobs = keyset_paginate(query, Job.posted_at, Job.id, cursor=request.args.get('cursor'), per_page=15, count_mode='none')
+    else:
+        jobs = query.order_by(Job.is_approved.asc(), Job.posted_at.desc()).paginate(page=page, per_page=15, error_out=False, count=False)
+    jobs.total = total
     return render_template(
         'admin/manage_jobs.html', title='Manage Jobs', jobs=jobs, filter_status=status,
-        total_jobs_count=total, pending_jobs_count=pending, approved_jobs_count=approved
+        total_jobs_count=site[stats.TOTAL_JOBS], pending_jobs_count=site[stats.PENDING_JOBS], approved_jobs_count=site[stats.APPROVED_JOBS]
     )
 
 @admin_bp.route('/jobs/<int:job_id>/approve', methods=['POST'])
@@ -682,10 +966,8 @@ def approve_job(job_id):
     job = Job.query.get_or_404(job_id)
     if not job.is_approved:
         job.is_approved = True
-        db.session.commit()
-        flash(f'Job approved.', 'success')
-        current_app.logger.info(f"Admin approved job {job_id}.")
-        # Send notification to employer
+        _job_listing_changed(job)
+        # Queue notification to employer (sent once the approval is committed)
         try:
             employer = job.employer
             if employer and employer.email:
@@ -696,12 +978,15 @@ def approve_job(job_id):
                 html_body = render_template('employers/email/job_approved_notification.html',
                                             employer=employer, job=job, job_url=job_url, dashboard_url=dashboard_url)
                 send_email(subject, [employer.email], text_body, html_body)
-                current_app.logger.info(f"Sent job approval email to {employer.email}")
+                current_app.logger.info(f"Queued job approval email for {employer.email}")
             else:
                 current_app.logger.warning(f"Employer/email not found for job {job_id}, cannot send approval email.")
         except Exception as e:
             current_app.logger.error(f"Failed sending approval email for job {job_id}: {e}")
             flash("Job approved, but failed to send notification email to employer.", "warning")
+        db.session.commit()
+        flash(f'Job approved.', 'success')
+        current_app.logger.info(f"Admin approved job {job_id}.")
     else:
         flash(f'Job already approved.', 'info')
     return redirect(url_for('admin.manage_jobs', status=request.args.get('status', 'pending')))
@@ -712,6 +997,7 @@ def unapprove_job(job_id):
     job = Job.query.get_or_404(job_id)
     if job.is_approved:
         job.is_approved = False
+        _job_listing_changed(job)
         db.session.commit()
         flash(f'Job unapproved.', 'success')
         current_app.logger.info(f"Admin unapproved job {job_id}.")
@@ -725,6 +1011,8 @@ def admin_delete_job(job_id):
     job = Job.query.get_or_404(job_id)
     title = job.title
     try:
+        _job_listing_changed(job, deleted=True)
+        uploads.discard_spooled_for(Application.job_id == job.id)
         db.session.delete(job)
         db.session.commit()
         flash(f'Job "{title}" deleted.', 'success')
@@ -735,6 +1023,105 @@ def admin_delete_job(job_id):
         current_app.logger.error(f"Error deleting job {job_id}: {e}")
     return redirect(url_for('admin.manage_jobs', status=request.args.get('status', 'all')))
 
+@admin_bp.route('/jobs/bulk', methods=['POST'])
+@admin_required
+def bulk_moderate_jobs():
+    """Approve/unapprove/delete selected jobs (job_ids) or every job matching a filter (scope=filter) in one transaction."""
+    if request.is_json:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify(error='Expected a JSON object.'), 400
+        job_ids = data.get('job_ids') or []
+        if not isinstance(job_ids, list):
+            job_ids = [None] # Rejected below
+    else:
+        data = request.form
+        job_ids = request.form.getlist('job_ids')
+    action = data.get('action')
+    status = data.get('status', 'all')
+    try:
+        job_ids = [int(job_id) for job_id in job_ids]
+        employer_id = int(data['employer_id']) if data.get('employer_id') else None
+    except (TypeError, ValueError):
+        job_ids, action = [], None # Rejected below
+    if data.get('scope') == 'filter':
+        # Deleting by filter needs a narrowing filter or an explicit confirm, never the 'all' default alone
+        if action == 'delete' and status not in ('pending', 'approved') and not employer_id \
+                and str(data.get('confirm', '')).lower() not in ('true', '1', 'all'):
+            if request.is_json:
+                return jsonify(error='scope=filter delete needs status (pending/approved), employer_id or "confirm": true.'), 400
+            flash('Deleting every job needs a status filter. Filter the list first, or select jobs instead.', 'warning')
+            return redirect(url_for('admin.manage_jobs', status=status))
+        job_ids = moderation.select_job_ids(status=status, employer_id=employer_id)
+
+    if action not in moderation.ACTIONS or not job_ids:
+        if request.is_json:
+            return jsonify(error='Need an action (approve, unapprove, delete) and job_ids or scope=filter.'), 400
+        flash('Select at least one job and a valid bulk action.', 'warning')
+        return redirect(url_for('admin.manage_jobs', status=status))
+
+    try:
+        result = moderation.bulk_moderate(action, job_ids)
+        notified = _queue_bulk_approval_emails(result.approved_by_employer) if action == 'approve' else 0
+        db.session.commit()
+        current_app.logger.info(f"Admin {current_user.id} bulk {action}: {result.affected} job(s), {notified} employer email(s).")
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Bulk {action} failed: {e}")
+        if request.is_json:
+            return jsonify(error=f'Bulk {action} failed.'), 500
+        flash(f'Bulk {action} failed: {e}', 'danger')
+        return redirect(url_for('admin.manage_jobs', status=status))
+
+    if request.is_json:
+        return jsonify(notified=notified, **result.to_dict())
+    flash(f'Bulk {action}: {result.affected} job(s) updated.', 'success')
+    return redirect(url_for('admin.manage_jobs', status=status))
+
+def _queue_bulk_approval_emails(approved_by_employer):
+    """Queues one email per employer listing all of their jobs approved in this batch. Returns emails queued."""
+    queued = 0
+    dashboard_url = url_for('employers.dashboard', _external=True)
+    employer_ids = list(approved_by_employer)
+    for start in range(0, len(employer_ids), moderation.CHUNK_SIZE):
+        chunk = employer_ids[start:start + moderation.CHUNK_SIZE]
+        employers = User.query.filter(User.id.in_(chunk)).all()
+        job_ids = [job_id for employer_id in chunk for job_id in approved_by_employer[employer_id]]
+        jobs_by_id = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids)).all()}
+        for employer in employers:
+            if not employer.email:
+                continue
+            jobs = [jobs_by_id[job_id] for job_id in approved_by_employer[employer.id] if job_id in jobs_by_id]
+            listings = [(job, url_for('jobs.job_detail', job_id=job.id, _external=True)) for job in jobs]
+            try:
+                subject = f"{len(jobs)} job posting(s) approved" if len(jobs) > 1 else f"Your Job Posting Approved: {jobs[0].title}"
+                text_body = f"Hello {employer.username},\n\nThese job postings have been approved:\n" \
+                    + "\n".join(f"- {job.title}: {url}" for job, url in listings) + f"\n\nManage: {dashboard_url}"
+                html_body = render_template('employers/email/jobs_approved_batch_notification.html',
+                                            employer=employer, listings=listings, dashboard_url=dashboard_url)
+                if send_email(subject, [employer.email], text_body, html_body):
+                    queued += 1
+            except Exception as e:
+                current_app.logger.error(f"Bulk approval email error for employer {employer.id}: {e}")
+    return queued
+
+@admin_bp.route('/jobs/import', methods=['GET', 'POST'])
+@admin_required
+def admin_import_jobs():
+    """Imports jobs for an employer (by ID), optionally approving them straight away."""
+    form = JobImportForm()
+    result = None
+    if form.validate_on_submit():
+        employer = db.session.get(User, form.employer_id.data) if form.employer_id.data else None
+        if employer is None or employer.role != 'employer':
+            form.employer_id.errors.append('Enter the ID of an employer account.')
+        else:
+            result = _run_job_import(form, employer, approve=form.approve.data)
+            if result is not None and result.imported and not result.errors and not result.insert_error:
+                return redirect(url_for('admin.manage_jobs', status='approved' if form.approve.data else 'pending'))
+    return render_template('employers/import_jobs.html', title='Import Jobs', form=form, result=result,
+                           is_admin=True, fields=job_import.FIELDS)
+
 @admin_bp.route('/jobs/<int:job_id>/admin_edit', methods=['GET', 'POST'])
 @admin_required
 def admin_edit_job(job_id):
@@ -744,6 +1131,7 @@ def admin_edit_job(job_id):
         form.populate_obj(job)
         # Admin edit policy
         try:
+            _job_listing_changed(job)
             db.session.commit()
             flash(f'Job updated by admin.', 'success')
             current_app.logger.info(f"Admin edited job {job_id}.")
@@ -756,4 +1144,42 @@ def admin_edit_job(job_id):
     flash("Admin job edit page not fully implemented.", "info")
     return redirect(url_for('admin.manage_jobs'))
 
+# --- JSON API Routes (read-only, conditional GET; see app/job_api.py) ---
+@api_bp.route('/jobs')
+@query_budget(4)
+def api_jobs():
+    """Approved jobs, newest first, with the same q/location/category filters as job_list. Cursor paged (?cursor=, ?limit=)."""
+    etag, last_modified = job_api.list_validators()
+    if job_api.is_fresh(etag, last_modified):
+        return job_api.not_modified(etag, last_modified)
+    query = request.args.get('q', '').strip()
+    loc = _listing_filter_value('location')
+    cat = _listing_filter_value('category')
+    limit = min(max(request.args.get('limit', 20, type=int), 1), current_app.config.get('API_MAX_PAGE_SIZE', 100))
+    q = _filter_listing(Job.query.filter_by(is_approved=True), loc, cat)
+    if query:
+        q = search.match_jobs(q, query) # Unranked: the API pages newest-first
+    jobs = keyset_paginate(q, Job.posted_at, Job.id, cursor=request.args.get('cursor'), per_page=limit, count_mode='none')
+    payload = {
+        'jobs': [job_api.serialize(job) for job in jobs.items],
+        'next_cursor': jobs.next_cursor,
+        'prev_cursor': jobs.prev_cursor,
+    }
+    return job_api.json_response(payload, etag, last_modified)
+
+@api_bp.route('/jobs/<int:job_id>')
+@query_budget(3)
+def api_job(job_id):
+    """One approved job. 410 once the listing has been archived."""
+    row = db.session.query(Job.id, Job.version, Job.posted_at, Job.updated_at).filter_by(id=job_id, is_approved=True).first()
+    if row is None:
+        if db.session.query(ArchivedJob.id).filter_by(id=job_id, is_approved=True).first():
+            return jsonify(error='This job listing has closed.'), 410
+        return jsonify(error='Job not found.'), 404
+    etag, last_modified = job_api.job_validators(*row)
+    if job_api.is_fresh(etag, last_modified):
+        return job_api.not_modified(etag, last_modified) # Row validators only; no job load, no serialization
+    job = db.session.get(Job, job_id)
+    return job_api.json_response(job_api.serialize(job), etag, last_modified)
+
 # --- End of views.py ---
\ No newline at end of file
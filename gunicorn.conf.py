@@ -0,0 +1,21 @@
+# --- gunicorn.conf.py ---
+# Gunicorn settings, read automatically by `gunicorn run:app` (Procfile) from the project root.
+#
+# WEB_WORKER_CLASS picks the worker model:
+#   * sync    - one request at a time per worker process (default, as before)
+#   * gthread - GUNICORN_THREADS request threads per worker
+#   * gevent  - cooperative: up to WEB_WORKER_CONNECTIONS requests per worker, each yielding while it
+#               waits on the network (Cloudinary, SMTP, PostgreSQL). Needs the gevent package; see
+#               app/concurrency.py. `flask load-test` compares the models on a throwaway database.
+import os
+
+worker_class = os.environ.get('WEB_WORKER_CLASS', 'sync').lower()
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+worker_connections = int(os.environ.get('WEB_WORKER_CONNECTIONS', 100))
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+# gevent must patch the standard library before the app (and its DB driver) is imported
+preload_app = False
+
+# --- End of gunicorn.conf.py ---
@@ -1,7 +1,6 @@
 # --- run.py ---
 import os
 from dotenv import load_dotenv
-from whitenoise import WhiteNoise # Import WhiteNoise
 
 # Load environment variables from .env file (primarily for local development)
 dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
@@ -14,28 +13,22 @@ else:
 
 from app import create_app # Import factory function
 
-# --- V V V --- Explicitly find static folder --- V V V ---
-# Get the absolute path to the directory this script is in (project root)
-project_root = os.path.dirname(os.path.abspath(__file__))
-# Construct the absolute path to the static folder
-static_folder_path = os.path.join(project_root, 'static')
-# --- ^ ^ ^ --- End static folder path --- ^ ^ ^ ---
-
-
 # Create the Flask app instance
 app = create_app()
 
-# --- V V V --- Wrap app with WhiteNoise using explicit path --- V V V ---
-# Check if the calculated static folder actually exists before wrapping
-if os.path.isdir(static_folder_path):
-    app.wsgi_app = WhiteNoise(app.wsgi_app, root=static_folder_path, prefix='/static')
-    app.logger.info(f"WhiteNoise configured to serve from: {static_folder_path}")
-else:
-    app.logger.warning(f"Static folder not found at {static_folder_path}. WhiteNoise disabled.")
-# --- ^ ^ ^ --- End WhiteNoise Wrap --- ^ ^ ^ ---
+# --- Static Files ---
+# WhiteNoise serves the fingerprinted, precompressed build from `flask assets-build` (immutable caching),
+# or the plain static folder if there is no build yet (see app/assets.py)
+from app.assets import wrap_static
+wrap_static(app)
 
 
 if __name__ == '__main__':
+    # Local single-process run: create tables/search index/default admin first (gunicorn relies on `flask bootstrap`)
+    if not app.config.get('AUTO_BOOTSTRAP'):
+        from app.bootstrap import bootstrap
+        with app.app_context():
+            bootstrap(app)
     # Get debug status from environment variable, default to False ('0')
     debug_mode = os.environ.get('FLASK_DEBUG', '0') == '1'
     # Get port from environment variable, default to 5000 for local dev
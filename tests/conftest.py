@@ -0,0 +1,84 @@
+# --- tests/conftest.py ---
+# Shared fixtures: a fresh app on a throwaway SQLite file per test, users, and logged-in test clients.
+# `db` keeps an app context open for the test body. Test clients run every request in a fresh app context
+# anyway (own g, session, logged-in user and query count for @query_budget), as a real server would.
+
+import pytest
+from flask import has_app_context
+from flask.testing import FlaskClient
+
+from app import create_app, db as _db
+from app.models import User
+
+
+class RequestClient(FlaskClient):
+    """Test client that gives each request its own app context instead of reusing the test's."""
+
+    def open(self, *args, **kwargs):
+        with self.application.app_context():
+            response = super().open(*args, **kwargs)
+        if has_app_context(): # The test's session reads what the request committed
+            _db.session.expire_all()
+        return response
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'WTF_CSRF_ENABLED': False,
+        'QUERY_BUDGET_ENFORCE': True,
+        'PAGE_CACHE_ENABLED': False,
+        'LOG_DIR': str(tmp_path / 'logs'),
+    })
+    app.test_client_class = RequestClient
+    with app.app_context():
+        _db.create_all()
+    yield app
+
+
+@pytest.fixture
+def search_index(app):
+    """Creates the FTS5 job search index (as `flask bootstrap` does) and returns the backend name."""
+    from app.search import init_search_index
+    with app.app_context():
+        return init_search_index(app)
+
+
+@pytest.fixture
+def db(app):
+    with app.app_context():
+        yield _db
+        _db.session.remove()
+
+
+@pytest.fixture
+def login(app):
+    """login(user_id) -> a test client whose session is logged in as that user."""
+    def login(user_id):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+        return client
+    return login
+
+
+@pytest.fixture
+def admin(db):
+    user = User(username='admin', email='admin@example.com', role='admin', is_verified=True, password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def employer(db):
+    user = User(username='employer', email='employer@example.com', role='employer', is_verified=True,
+                company_name='Acme', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+# --- End of conftest.py ---
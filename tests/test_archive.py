@@ -0,0 +1,95 @@
+# --- tests/test_archive.py ---
+# Archival moves expired jobs with only closed applications to the archive tables and keeps every
+# derived table (site stats, facets, search index) equal to a rebuild; failing chunks are skipped.
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app import archive, facets, search, stats
+from app.models import Application, ArchivedApplication, ArchivedJob, Job, JobFacet, SiteStat, User
+
+OLD = datetime.utcnow() - timedelta(days=400)
+
+
+def _derived(db):
+    return ({row.name: row.value for row in SiteStat.query},
+            {(row.location, row.category): row.count for row in JobFacet.query if row.count},
+            sorted(row[0] for row in db.session.execute(text("SELECT rowid FROM jobs_fts"))))
+
+def _assert_derived_match_rebuild(db):
+    maintained = _derived(db)
+    stats.reconcile()
+    facets.rebuild()
+    search.rebuild_index()
+    db.session.commit()
+    assert maintained == _derived(db)
+
+
+@pytest.fixture
+def jobs(db, employer, search_index):
+    assert search_index == 'fts5'
+    seekers = [User(username=f'seeker{i}', email=f'seeker{i}@example.com', role='job_seeker', is_verified=True,
+                    password_hash='x') for i in range(2)]
+    db.session.add_all(seekers)
+    def job(title, posted_at, statuses):
+        job = Job(title=title, description='Work', location='Berlin', category='IT', company_name='Acme',
+                  employer_id=employer.id, is_approved=True, posted_at=posted_at)
+        db.session.add(job)
+        db.session.flush()
+        for seeker, status in zip(seekers, statuses):
+            db.session.add(Application(job_id=job.id, job_seeker_id=seeker.id, status=status))
+        return job
+    created = {
+        'closed': job('Closed', OLD, ['Rejected', 'Hired']),
+        'open': job('Open', OLD, ['Rejected', 'Interviewing']),
+        'recent': job('Recent', datetime.utcnow(), ['Rejected']),
+        'unapplied': job('Unapplied', OLD, []),
+        'closed_too': job('Closed too', OLD + timedelta(days=1), ['Offer Declined']),
+    }
+    db.session.flush()
+    search.rebuild_index()
+    stats.reconcile()
+    facets.rebuild()
+    from app.counters import recompute_counters
+    recompute_counters()
+    db.session.commit()
+    return {name: job.id for name, job in created.items()}
+
+
+def test_archive_moves_closed_jobs_only(db, jobs):
+    result = archive.archive_expired(days=30)
+    assert (result.jobs, result.applications, result.skipped) == (2, 3, [])
+
+    archived = {job.id for job in ArchivedJob.query}
+    assert archived == {jobs['closed'], jobs['closed_too']}
+    assert {job.id for job in Job.query} == {jobs['open'], jobs['recent'], jobs['unapplied']}
+    assert sorted(a.status for a in ArchivedApplication.query.filter_by(job_id=jobs['closed'])) == ['Hired', 'Rejected']
+    assert sorted(a.status for a in Application.query.filter_by(job_id=jobs['open'])) == ['Interviewing', 'Rejected']
+    archived_job = db.session.get(ArchivedJob, jobs['closed'])
+    assert (archived_job.applications_count, archived_job.hired_count) == (2, 1) # Counters travel with the job
+    _assert_derived_match_rebuild(db)
+    assert archive.archive_expired(days=30).jobs == 0 # Nothing left to move
+
+
+def test_failing_chunk_is_logged_and_skipped(db, jobs, caplog):
+    # A row with the same id already in the archive makes that job's chunk fail
+    db.session.execute(ArchivedJob.__table__.insert().values(
+        id=jobs['closed'], title='Stale copy', description='', location='', company_name='', is_approved=False,
+        employer_id=0, version=1, archived_at=datetime.utcnow(), posted_at=OLD,
+        **{column: 0 for column in ('applications_count', 'submitted_count', 'viewed_count', 'shortlisted_count',
+                                    'interviewing_count', 'offer_made_count', 'hired_count', 'offer_declined_count',
+                                    'rejected_count')}))
+    db.session.commit()
+
+    result = archive.archive_expired(days=30, batch_size=1)
+    assert result.skipped == [jobs['closed']]
+    assert (result.jobs, result.batches) == (1, 1)
+    assert db.session.get(Job, jobs['closed']) is not None # Still live, nothing half-moved
+    assert Application.query.filter_by(job_id=jobs['closed']).count() == 2
+    assert db.session.get(ArchivedJob, jobs['closed_too']) is not None
+    assert f"ids {jobs['closed']}-{jobs['closed']}" in caplog.text
+    _assert_derived_match_rebuild(db)
+
+# --- End of test_archive.py ---
@@ -0,0 +1,76 @@
+# --- tests/test_bulk_moderation.py ---
+# POST /admin/jobs/bulk: malformed JSON is a 400, and a filter-scope delete needs a narrowing filter
+# or an explicit confirm.
+
+import pytest
+
+from app import db as _db
+from app.models import Job, User
+
+
+@pytest.fixture
+def admin_client(app):
+    with app.app_context():
+        admin = User(username='admin', email='admin@example.com', role='admin', is_verified=True, password_hash='x')
+        employer = User(username='employer', email='employer@example.com', role='employer', is_verified=True,
+                        company_name='Acme', password_hash='x')
+        _db.session.add_all([admin, employer])
+        _db.session.flush()
+        for i in range(4):
+            _db.session.add(Job(title=f'Job {i}', description='Work', location='Berlin', company_name='Acme',
+                                employer_id=employer.id, is_approved=i % 2 == 0))
+        _db.session.commit()
+        admin_id = admin.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(admin_id)
+        session['_fresh'] = True
+    return client
+
+
+def _job_count(app):
+    with app.app_context():
+        return Job.query.count()
+
+
+@pytest.mark.parametrize('body', [[1, 2], 'delete', 7])
+def test_non_object_json_is_rejected(app, admin_client, body):
+    response = admin_client.post('/admin/jobs/bulk', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error']
+
+
+def test_job_ids_must_be_a_list(app, admin_client):
+    response = admin_client.post('/admin/jobs/bulk', json={'action': 'delete', 'job_ids': '12'})
+    assert response.status_code == 400
+    assert _job_count(app) == 4
+
+
+@pytest.mark.parametrize('body', [{}, {'status': 'all'}, {'status': 'all', 'confirm': False}])
+def test_unfiltered_filter_scope_delete_is_refused(app, admin_client, body):
+    response = admin_client.post('/admin/jobs/bulk', json={'action': 'delete', 'scope': 'filter', **body})
+    assert response.status_code == 400
+    assert _job_count(app) == 4
+
+
+def test_unfiltered_filter_scope_delete_form_is_refused(app, admin_client):
+    response = admin_client.post('/admin/jobs/bulk', data={'action': 'delete', 'scope': 'filter', 'status': 'all'})
+    assert response.status_code == 302
+    assert _job_count(app) == 4
+
+
+def test_filter_scope_delete_with_status_or_confirm(app, admin_client):
+    response = admin_client.post('/admin/jobs/bulk', json={'action': 'delete', 'scope': 'filter', 'status': 'pending'})
+    assert response.get_json()['affected'] == 2
+    response = admin_client.post('/admin/jobs/bulk', json={'action': 'delete', 'scope': 'filter', 'confirm': True})
+    assert response.get_json()['affected'] == 2
+    assert _job_count(app) == 0
+
+
+def test_filter_scope_approve_needs_no_confirm(app, admin_client):
+    response = admin_client.post('/admin/jobs/bulk', json={'action': 'approve', 'scope': 'filter'})
+    assert response.status_code == 200
+    with app.app_context():
+        assert Job.query.filter_by(is_approved=False).count() == 0
+
+# --- End of test_bulk_moderation.py ---
@@ -0,0 +1,32 @@
+# --- tests/test_concurrency.py ---
+# release_connection() hands the session's connection back without losing loaded objects or pending
+# changes; spawn() runs inline outside gevent workers.
+
+from app.concurrency import is_cooperative, release_connection, spawn
+
+
+def test_release_connection_returns_connection_and_keeps_objects(db, employer):
+    employer = db.session.get(type(employer), employer.id)
+    assert db.session().in_transaction()
+    checked_out = db.engine.pool.checkedout()
+    release_connection()
+    assert not db.session().in_transaction()
+    assert db.engine.pool.checkedout() == checked_out - 1
+    assert employer.username == 'employer' # Still loaded: no refresh query, no DetachedInstanceError
+
+
+def test_release_connection_keeps_unflushed_changes(db, employer):
+    employer.company_name = 'Renamed'
+    release_connection()
+    assert db.session().in_transaction()
+    db.session.rollback()
+    assert employer.company_name == 'Acme'
+
+
+def test_spawn_runs_inline_when_not_cooperative(app):
+    assert not is_cooperative()
+    calls = []
+    spawn(calls.append, 'sent')
+    assert calls == ['sent']
+
+# --- End of test_concurrency.py ---
@@ -0,0 +1,73 @@
+# --- tests/test_counters.py ---
+# The denormalized Job application counters, maintained by apply_job, update_application_status,
+# reject_application and delete_user, always equal a recount from `applications`.
+
+import io
+from datetime import date, timedelta
+
+import pytest
+
+from app.counters import recompute_counters
+from app.models import APPLICATION_STATUS_COUNTERS, Application, Job, User
+
+COLUMNS = ['applications_count'] + list(APPLICATION_STATUS_COUNTERS.values())
+
+
+def _counters(db):
+    return {job.id: {column: getattr(job, column) for column in COLUMNS} for job in Job.query.order_by(Job.id)}
+
+def _assert_matches_recount(db):
+    db.session.expire_all()
+    maintained = _counters(db)
+    recompute_counters()
+    db.session.commit()
+    db.session.expire_all()
+    assert maintained == _counters(db)
+    return maintained
+
+
+@pytest.fixture
+def setup(app, db, admin, employer, login, tmp_path):
+    app.config.update(RESUME_UPLOAD_MODE='async', RESUME_SPOOL_FOLDER=str(tmp_path / 'spool'))
+    jobs = [Job(title=f'Job {i}', description='Work', location='Berlin', company_name='Acme', employer_id=employer.id,
+                is_approved=True) for i in range(2)]
+    seekers = [User(username=f'seeker{i}', email=f'seeker{i}@example.com', role='job_seeker', is_verified=True,
+                    password_hash='x') for i in range(3)]
+    db.session.add_all(jobs + seekers)
+    db.session.commit()
+    return [job.id for job in jobs], [seeker.id for seeker in seekers]
+
+def _apply(login, seeker_id, job_id):
+    response = login(seeker_id).post(f'/jobs/{job_id}/apply', data={
+        'current_ctc': '10', 'expected_ctc': '12', 'notice_period_days': '30',
+        'earliest_join_date': (date.today() + timedelta(days=30)).isoformat(),
+        'resume': (io.BytesIO(b'%PDF-1.4'), 'resume.pdf'),
+    }, content_type='multipart/form-data')
+    assert response.status_code == 302
+    return Application.query.filter_by(job_id=job_id, job_seeker_id=seeker_id).one().id
+
+
+def test_counters_follow_every_application_change(db, setup, admin, employer, login):
+    job_ids, seeker_ids = setup
+    application_ids = [_apply(login, seeker_id, job_id) for seeker_id in seeker_ids for job_id in job_ids]
+    counts = _assert_matches_recount(db)
+    assert counts[job_ids[0]]['applications_count'] == 3
+    assert counts[job_ids[0]]['submitted_count'] == 3
+
+    employer_client = login(employer.id)
+    for status in ('Viewed', 'Shortlisted', 'Interviewing', 'Offer Made', 'Hired'):
+        employer_client.post(f'/employer/applications/{application_ids[0]}/update_status', data={'new_status': status})
+        _assert_matches_recount(db)
+    employer_client.post(f'/employer/applications/{application_ids[0]}/update_status', data={'new_status': 'Viewed'})
+    employer_client.post(f'/employer/applications/{application_ids[2]}/reject', data={'reason': 'Not Qualified'})
+    counts = _assert_matches_recount(db)
+    assert counts[job_ids[0]]['hired_count'] == 1 # A terminal status can't be changed back
+    assert counts[job_ids[0]]['rejected_count'] == 1
+
+    login(admin.id).post(f'/admin/users/{seeker_ids[1]}/delete')
+    counts = _assert_matches_recount(db)
+    assert counts[job_ids[0]]['applications_count'] == 2
+    assert counts[job_ids[0]]['rejected_count'] == 0 # seeker1's rejected application went with them
+    assert Application.query.count() == 4
+
+# --- End of test_counters.py ---
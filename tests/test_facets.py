@@ -0,0 +1,99 @@
+# --- tests/test_facets.py ---
+# The maintained job_facets counts stay equal to a rebuild from `jobs` through posting, approval,
+# edits, unapproval and deletion; facet_counts() filters and limits in SQL.
+
+import pytest
+
+from app import facets
+from app.models import Job, JobFacet
+
+
+def _table(db):
+    return {(row.location, row.category): row.count for row in JobFacet.query if row.count}
+
+def _assert_matches_rebuild(db):
+    maintained = _table(db)
+    facets.rebuild()
+    db.session.commit()
+    assert maintained == _table(db)
+    return maintained
+
+
+@pytest.fixture
+def clients(app, db, admin, employer, login):
+    return login(admin.id), login(employer.id)
+
+def _post(employer_client, title, location, category=''):
+    response = employer_client.post('/employer/jobs/new', data={'title': title, 'description': 'Work',
+                                                                 'location': location, 'category': category})
+    assert response.status_code == 302
+    return Job.query.filter_by(title=title).one().id
+
+
+def test_deltas_match_rebuild(db, clients):
+    admin_client, employer_client = clients
+    berlin = _post(employer_client, 'Dev', 'Berlin', 'IT')
+    berlin_too = _post(employer_client, 'Ops', ' berlin ', 'it')
+    paris = _post(employer_client, 'Chef', 'Paris')
+    assert _assert_matches_rebuild(db) == {} # Pending jobs are not public
+
+    for job_id in (berlin, berlin_too, paris):
+        admin_client.post(f'/admin/jobs/{job_id}/approve')
+    assert _assert_matches_rebuild(db) == {('berlin', 'it'): 2, ('paris', ''): 1}
+
+    # Admin edit keeps the job approved and moves it to another pair
+    admin_client.post(f'/admin/jobs/{berlin_too}/admin_edit', data={'title': 'Ops', 'description': 'Work',
+                                                                     'location': 'Paris', 'category': ''})
+    assert _assert_matches_rebuild(db) == {('berlin', 'it'): 1, ('paris', ''): 2}
+
+    # Employer edit sends the job back for approval
+    employer_client.post(f'/employer/jobs/{paris}/edit', data={'title': 'Chef', 'description': 'Work',
+                                                               'location': 'Lyon', 'category': 'Food'})
+    assert _assert_matches_rebuild(db) == {('berlin', 'it'): 1, ('paris', ''): 1}
+
+    admin_client.post(f'/admin/jobs/{berlin}/unapprove')
+    assert _assert_matches_rebuild(db) == {('paris', ''): 1}
+
+    admin_client.post(f'/admin/jobs/{berlin_too}/admin_delete')
+    employer_client.post(f'/employer/jobs/{berlin}/delete')
+    assert _assert_matches_rebuild(db) == {}
+    assert Job.query.count() == 1
+
+
+def test_facet_counts_filter_and_limit_in_sql(db, employer):
+    for i in range(12):
+        for _ in range(i + 1):
+            db.session.add(Job(title='Job', description='Work', location=f'City {i}', category='IT' if i % 2 else 'Sales',
+                               company_name='Acme', employer_id=employer.id, is_approved=True))
+    db.session.add(Job(title='Job', description='Work', location='100% Remote', category='IT', company_name='Acme',
+                       employer_id=employer.id, is_approved=True))
+    facets.rebuild()
+    db.session.commit()
+
+    counts = facets.facet_counts()
+    assert counts['total'] == 79
+    assert len(counts['location']) == facets.FACET_LIMIT
+    assert counts['location'][0] == ('City 11', 12)
+    assert counts['category'] == [('IT', 43), ('Sales', 36)]
+
+    it_only = facets.facet_counts(category='it')
+    assert it_only['total'] == 43
+    assert all(int(label.split()[-1]) % 2 for label, _ in it_only['location'] if label.startswith('City'))
+
+    assert facets.facet_counts(location='100%')['category'] == [('IT', 1)] # % is literal, not a wildcard
+    assert facets.facet_counts(location='city_1')['category'] == [] # So is _
+    assert facets.facet_counts(location='city 1')['total'] is None # job_list counts filtered totals itself
+
+
+@pytest.mark.parametrize('query_string', ['', '?location=berlin', '?q=dev', '?q=dev&category=it'])
+def test_job_list_facets_within_budget(app, db, employer, query_string):
+    for title, location, category in (('Dev', 'Berlin', 'IT'), ('Dev lead', 'Paris', 'IT'), ('Chef', 'Berlin', '')):
+        db.session.add(Job(title=title, description='Work', location=location, category=category, company_name='Acme',
+                           employer_id=employer.id, is_approved=True))
+    facets.rebuild()
+    db.session.commit()
+    response = app.test_client().get(f'/jobs/{query_string}')
+    assert response.status_code == 200
+    assert b'Berlin' in response.data
+
+# --- End of test_facets.py ---
@@ -0,0 +1,77 @@
+# --- tests/test_job_import.py ---
+# A CSV import inserts the valid rows, reports the invalid ones per row, and keeps everything derived
+# from jobs in step: search index, facets, site stats and the public page cache version. A pre-approved
+# admin import sends the employer the batched approval email.
+
+import io
+
+from sqlalchemy import text
+
+from app import facets, mail, search, stats
+from app.cache import PUBLIC_PAGES, current_version
+from app.models import Job, JobFacet, SiteStat
+
+CSV = (
+    "Title,Description,Salary,Location,Category\n"
+    "Kotlin Developer,Build apps,100k,Berlin,IT\n"
+    ",Missing title,,Paris,IT\n"
+    "Sales Lead,Sell things,,Paris,Sales\n"
+)
+
+
+def _derived(db):
+    return ({row.name: row.value for row in SiteStat.query},
+            {(row.location, row.category): row.count for row in JobFacet.query if row.count},
+            sorted(row[0] for row in db.session.execute(text("SELECT rowid FROM jobs_fts"))))
+
+def _import(client, data):
+    return client.post('/admin/jobs/import', data=dict(data, file=(io.BytesIO(CSV.encode()), 'jobs.csv')),
+                       content_type='multipart/form-data')
+
+
+def test_admin_import_updates_derived_data(app, db, admin, employer, login, search_index):
+    assert search_index == 'fts5'
+    app.config.update(MAIL_USERNAME='mailer', MAIL_PASSWORD='secret')
+    stats.reconcile()
+    db.session.commit()
+    version = current_version(PUBLIC_PAGES)
+    with mail.record_messages() as sent:
+        response = _import(login(admin.id), {'employer_id': employer.id, 'approve': 'y'})
+    assert response.status_code == 200 # Rejected rows keep the report on screen
+    page = response.get_data(as_text=True)
+    assert 'Rows Not Imported (1 of 3)' in page and '<tr><td>3</td><td>title</td>' in page
+
+    jobs = {job.title: job for job in Job.query}
+    assert set(jobs) == {'Kotlin Developer', 'Sales Lead'}
+    assert all(job.is_approved and job.employer_id == employer.id and job.company_name == 'Acme'
+               for job in jobs.values())
+
+    maintained = _derived(db)
+    assert maintained[0]['total_jobs'] == maintained[0]['approved_jobs'] == 2
+    assert maintained[0]['pending_jobs'] == 0
+    assert maintained[1] == {('berlin', 'it'): 1, ('paris', 'sales'): 1}
+    assert maintained[2] == sorted(job.id for job in jobs.values())
+    assert current_version(PUBLIC_PAGES) > version
+    stats.reconcile()
+    facets.rebuild()
+    search.rebuild_index()
+    db.session.commit()
+    assert _derived(db) == maintained
+
+    listing = app.test_client().get('/jobs/?q=kotlin').get_data(as_text=True)
+    assert 'Kotlin Developer' in listing and 'Sales Lead' not in listing
+
+    approvals = [message for message in sent if message.recipients == [employer.email]]
+    assert len(approvals) == 1
+    assert 'Kotlin Developer' in approvals[0].body and 'Sales Lead' in approvals[0].body
+
+
+def test_import_reports_invalid_rows(app, db, employer):
+    from app import job_import
+    with app.test_request_context():
+        result = job_import.import_jobs(job_import.parse_rows(io.BytesIO(CSV.encode()), 'csv'), employer)
+    assert result.to_dict() == {'rows': 3, 'imported': 2, 'insert_error': None,
+                                'errors': [{'row': 3, 'errors': result.errors[0][1]}]}
+    assert 'title' in result.errors[0][1]
+    assert Job.query.filter_by(is_approved=False).count() == 2
+    assert JobFacet.query.count() == 0 # Pending jobs are not public
@@ -0,0 +1,98 @@
+# --- tests/test_outbox.py ---
+# Mail leaves only after the caller's transaction commits; outbox rows are retried with backoff.
+
+from datetime import datetime, timedelta
+
+import pytest
+from flask_mail import Connection
+
+from app import mail, outbox
+from app.models import OutboxEmail
+
+
+def _deliver(to='someone@example.com'):
+    outbox.deliver('Subject', 'noreply@example.com', [to], 'text', '<p>html</p>')
+
+
+def test_direct_mail_waits_for_commit(app, db):
+    with mail.record_messages() as sent:
+        _deliver()
+        db.session.flush()
+        assert sent == []
+        db.session.commit()
+        assert [msg.recipients for msg in sent] == [['someone@example.com']]
+
+
+def test_direct_mail_dropped_on_rollback(app, db, employer):
+    with mail.record_messages() as sent:
+        employer.is_verified = False # The change the email is about
+        _deliver()
+        db.session.flush()
+        db.session.rollback()
+        db.session.commit()
+        assert sent == []
+
+
+@pytest.fixture
+def outbox_app(app):
+    app.config.update(MAIL_USE_OUTBOX=True, MAIL_OUTBOX_BACKOFF_SECONDS=30, MAIL_OUTBOX_MAX_ATTEMPTS=2)
+    return app
+
+
+def test_outbox_row_is_only_sent_after_commit(outbox_app, db):
+    _deliver()
+    db.session.flush()
+    db.session.rollback()
+    assert OutboxEmail.query.count() == 0
+
+    _deliver()
+    db.session.commit()
+    with mail.record_messages() as sent:
+        assert outbox.drain_once() == 1
+    assert len(sent) == 1
+    assert OutboxEmail.query.one().status == 'sent'
+
+
+def test_outbox_retries_with_backoff_then_fails(outbox_app, db, monkeypatch):
+    _deliver()
+    db.session.commit()
+
+    def refuse(self, message, envelope_from=None):
+        raise OSError('SMTP down')
+    monkeypatch.setattr(Connection, 'send', refuse)
+
+    assert outbox.drain_once() == 1
+    row = OutboxEmail.query.one()
+    assert (row.status, row.attempts) == ('pending', 1)
+    assert row.next_attempt_at > datetime.utcnow() + timedelta(seconds=25)
+    assert 'SMTP down' in row.last_error
+    assert outbox.drain_once() == 0 # Not due yet
+
+    row.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert outbox.drain_once() == 1
+    row = OutboxEmail.query.one()
+    assert (row.status, row.attempts) == ('failed', 2) # MAIL_OUTBOX_MAX_ATTEMPTS reached
+
+
+def test_outbox_retry_succeeds(outbox_app, db, monkeypatch):
+    _deliver()
+    db.session.commit()
+    real_send = Connection.send
+    calls = []
+    def flaky(self, message, envelope_from=None):
+        calls.append(message)
+        if len(calls) == 1:
+            raise OSError('try again')
+        return real_send(self, message, envelope_from)
+    monkeypatch.setattr(Connection, 'send', flaky)
+
+    outbox.drain_once()
+    OutboxEmail.query.update({'next_attempt_at': datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+    with mail.record_messages() as sent:
+        assert outbox.drain_once() == 1
+    row = OutboxEmail.query.one()
+    assert (row.status, row.attempts, len(sent)) == ('sent', 2, 1)
+
+# --- End of test_outbox.py ---
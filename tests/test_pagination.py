@@ -0,0 +1,59 @@
+# --- tests/test_pagination.py ---
+# Keyset pagination: following next cursors visits every row once in (sort, id) order, and prev
+# cursors walk back through the same pages.
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import Job
+from app.pagination import decode_cursor, encode_cursor, keyset_paginate
+
+
+@pytest.fixture
+def jobs(db, employer):
+    start = datetime(2026, 1, 1)
+    for i in range(25):
+        # Groups of three share a timestamp, so pages must break ties on id
+        db.session.add(Job(title=f'Job {i}', description='Work', location='Berlin', company_name='Acme',
+                           employer_id=employer.id, is_approved=True, posted_at=start + timedelta(hours=i // 3)))
+    db.session.commit()
+    return [job.id for job in Job.query.order_by(Job.posted_at.desc(), Job.id.desc())]
+
+
+def _page(cursor=None):
+    return keyset_paginate(Job.query, Job.posted_at, Job.id, cursor=cursor, per_page=10, count_mode='exact')
+
+
+def test_cursor_round_trip(jobs):
+    assert decode_cursor(encode_cursor(datetime(2026, 1, 1, 12, 30), 42, 'next')) == (datetime(2026, 1, 1, 12, 30), 42, 'next')
+    assert decode_cursor('not-a-cursor') is None
+    assert decode_cursor(encode_cursor('x', 'not-an-id', 'next')) is None
+
+
+def test_next_cursors_visit_every_row_once(jobs):
+    pages = [_page()]
+    while pages[-1].has_next:
+        pages.append(_page(pages[-1].next_cursor))
+    assert [len(page.items) for page in pages] == [10, 10, 5]
+    assert [job.id for page in pages for job in page.items] == jobs
+    assert not pages[0].has_prev and pages[-1].has_prev
+    assert pages[0].total == 25
+
+
+def test_prev_cursors_walk_back_through_the_same_pages(jobs):
+    forward = [_page()]
+    while forward[-1].has_next:
+        forward.append(_page(forward[-1].next_cursor))
+    backward = [forward[-1]]
+    while backward[-1].has_prev:
+        backward.append(_page(backward[-1].prev_cursor))
+    assert [[job.id for job in page.items] for page in reversed(backward)] == \
+           [[job.id for job in page.items] for page in forward]
+    assert backward[-1].has_next # Back on the first page, which links forward again
+
+
+def test_garbled_cursor_starts_at_first_page(jobs):
+    assert [job.id for job in _page('garbage').items] == jobs[:10]
+
+# --- End of test_pagination.py ---
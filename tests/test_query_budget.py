@@ -0,0 +1,70 @@
+# --- tests/test_query_budget.py ---
+# @query_budget: over-budget views raise under QUERY_BUDGET_ENFORCE (warn otherwise); list pages stay
+# within their budgets however many rows they show.
+
+import pytest
+
+from app import db as _db
+from app.instrumentation import QueryBudgetExceeded, query_budget
+from app.models import Application, Job, User
+
+
+def _run_queries(n):
+    for _ in range(n):
+        _db.session.execute(_db.select(1))
+    return 'ok'
+
+
+def test_over_budget_raises_when_enforced(app):
+    view = query_budget(2)(lambda: _run_queries(3))
+    with app.test_request_context('/'):
+        with pytest.raises(QueryBudgetExceeded, match=r'issued 3 queries \(budget 2\)'):
+            view()
+
+
+def test_within_budget_passes(app):
+    view = query_budget(3)(lambda: _run_queries(3))
+    with app.test_request_context('/'):
+        assert view() == 'ok'
+    assert view.query_budget == 3
+
+
+def test_over_budget_only_warns_when_not_enforced(app, caplog):
+    app.config['QUERY_BUDGET_ENFORCE'] = False
+    view = query_budget(1)(lambda: _run_queries(2))
+    with app.test_request_context('/'):
+        assert view() == 'ok'
+    assert 'Query budget exceeded' in caplog.text
+
+
+@pytest.fixture
+def seeker_with_applications(app):
+    with app.app_context():
+        employer = User(username='employer', email='employer@example.com', role='employer', is_verified=True,
+                        company_name='Acme', password_hash='x')
+        seeker = User(username='seeker', email='seeker@example.com', role='job_seeker', is_verified=True,
+                      password_hash='x')
+        _db.session.add_all([employer, seeker])
+        _db.session.flush()
+        for i in range(20):
+            job = Job(title=f'Job {i}', description='Work', location='Berlin', company_name='Acme',
+                      employer_id=employer.id, is_approved=True)
+            _db.session.add(job)
+            _db.session.flush()
+            _db.session.add(Application(job_id=job.id, job_seeker_id=seeker.id))
+        _db.session.commit()
+        return seeker.id
+
+
+@pytest.mark.parametrize('query_string', ['', '?paging=cursor'])
+def test_my_applications_within_budget(app, seeker_with_applications, query_string):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(seeker_with_applications)
+        session['_fresh'] = True
+    for _ in range(2): # Cold, then warm identity cache
+        response = client.get(f'/jobs/my-applications{query_string}')
+        assert response.status_code == 200
+        assert b'Job 19' in response.data
+
+# --- End of test_query_budget.py ---
@@ -0,0 +1,74 @@
+# --- tests/test_search.py ---
+# Job search on the SQLite FTS5 index and on the portable fallback (no index): term matching, ranking,
+# literal LIKE wildcards; and the PostgreSQL statements keep every row for a stopword-only query.
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app import search
+from app.models import Job
+
+
+@pytest.fixture
+def jobs(db, employer):
+    def job(title, description, approved=True):
+        job = Job(title=title, description=description, location='Berlin', category='IT', company_name='Acme',
+                  employer_id=employer.id, is_approved=approved)
+        db.session.add(job)
+        return job
+    created = [
+        job('Python Developer', 'Backend services'),
+        job('Office Manager', 'Knows some python'),
+        job('snake_case linter', 'Tooling'),
+        job('snakeXcase parser', 'Tooling'),
+        job('Python Intern', 'Unapproved', approved=False),
+    ]
+    db.session.commit()
+    return {job.title: job.id for job in created}
+
+def _titles(query):
+    return [job.title for job in search.search_jobs(Job.query.filter_by(is_approved=True), query)]
+
+def _matched(query):
+    return sorted(job.title for job in search.match_jobs(Job.query.filter_by(is_approved=True), query))
+
+
+def test_fts5_ranks_title_hits_first(db, jobs, search_index):
+    assert search_index == 'fts5'
+    assert _titles('python') == ['Python Developer', 'Office Manager']
+    assert _titles('pyth dev') == ['Python Developer'] # Prefix match, terms ANDed
+    assert _matched('python') == ['Office Manager', 'Python Developer']
+    assert _titles('"python":* -') == ['Python Developer', 'Office Manager'] # FTS syntax is dropped
+    assert _titles('   ') == _titles('') # No terms: the base query unchanged
+    assert len(_titles('')) == 4
+
+
+def test_fts5_follows_approval(db, jobs, search_index):
+    intern = db.session.get(Job, jobs['Python Intern'])
+    intern.is_approved = True
+    search.sync_job(intern)
+    db.session.commit()
+    assert 'Python Intern' in _titles('intern')
+    search.remove_job(intern.id)
+    db.session.commit()
+    assert _titles('intern') == []
+
+
+def test_fallback_matches_like_wildcards_literally(app, db, jobs):
+    assert search.get_backend() == 'fallback'
+    assert _titles('python') == ['Python Developer', 'Office Manager']
+    assert _matched('PYTHON') == ['Office Manager', 'Python Developer']
+    assert _titles('snake_case') == ['snake_case linter'] # '_' is not a single-character wildcard
+    assert _matched('snake_case') == ['snake_case linter']
+    assert _titles('100%') == [] # '%' is dropped from the terms; '100' matches nothing
+    assert search._like_pattern('a%b_c\\') == '%a\\%b\\_c\\\\%'
+
+
+def test_postgres_stopword_only_query_keeps_base_rows(app, db):
+    app.extensions['job_search'] = 'postgres'
+    base = Job.query.filter_by(is_approved=True)
+    for narrowed in (search.search_jobs(base, 'the and'), search.match_jobs(base, 'the and')):
+        sql = str(narrowed.statement.compile(dialect=postgresql.dialect()))
+        assert "numnode(to_tsquery('english', %(stop_tsq)s" in sql and ') = 0 OR ' in sql
+    ranked = str(search.search_jobs(base, 'the').statement.compile(dialect=postgresql.dialect()))
+    assert 'LEFT OUTER JOIN' in ranked and 'coalesce(job_hits.score' in ranked
@@ -0,0 +1,102 @@
+# --- tests/test_uploads.py ---
+# Background resume uploads: retries back off, deleted applications are skipped and their spool files
+# removed.
+
+import os
+from datetime import datetime, timedelta
+
+import cloudinary.uploader
+import pytest
+
+from app import uploads
+from app.models import Application, Job, User
+
+
+@pytest.fixture
+def spooled(app, db, employer, tmp_path):
+    app.config.update(RESUME_UPLOAD_MODE='async', RESUME_UPLOAD_BACKOFF_SECONDS=30, RESUME_UPLOAD_MAX_ATTEMPTS=3)
+    seeker = User(username='seeker', email='seeker@example.com', role='job_seeker', is_verified=True, password_hash='x')
+    job = Job(title='Job', description='Work', location='Berlin', company_name='Acme', employer_id=employer.id,
+              is_approved=True)
+    db.session.add_all([seeker, job])
+    db.session.flush()
+    spool_path = tmp_path / 'resume.pdf'
+    spool_path.write_bytes(b'%PDF-1.4')
+    application = Application(job_id=job.id, job_seeker_id=seeker.id, resume_status='pending',
+                              resume_spool_path=str(spool_path))
+    db.session.add(application)
+    db.session.commit()
+    return application
+
+
+def _fail(path, **options):
+    raise OSError('Cloudinary unavailable')
+
+def _succeed(path, **options):
+    return {'public_id': options['public_id']}
+
+
+def test_failed_upload_backs_off_then_succeeds(db, spooled, monkeypatch):
+    monkeypatch.setattr(cloudinary.uploader, 'upload', _fail)
+    assert uploads.upload_pending_once() == 0
+    application = db.session.get(Application, spooled.id)
+    assert (application.resume_status, application.resume_upload_attempts) == ('pending', 1)
+    assert application.resume_next_attempt_at > datetime.utcnow() + timedelta(seconds=25)
+
+    monkeypatch.setattr(cloudinary.uploader, 'upload', _succeed)
+    assert uploads.upload_pending_once() == 0 # Not due yet
+    application.resume_next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    spool_path = application.resume_spool_path
+    assert uploads.upload_pending_once() == 1
+    application = db.session.get(Application, spooled.id)
+    assert application.resume_status == 'uploaded'
+    assert application.resume_public_id.startswith(f'job_portal/resumes/{application.job_id}/')
+    assert application.resume_spool_path is None
+    assert not os.path.exists(spool_path)
+
+
+def test_backoff_doubles_until_failed(db, spooled, monkeypatch):
+    monkeypatch.setattr(cloudinary.uploader, 'upload', _fail)
+    delays = []
+    for _ in range(3):
+        started = datetime.utcnow()
+        uploads.upload_pending_once()
+        application = db.session.get(Application, spooled.id)
+        if application.resume_status == 'pending':
+            delays.append(round((application.resume_next_attempt_at - started).total_seconds() / 30))
+            application.resume_next_attempt_at = None
+            db.session.commit()
+    assert delays == [1, 2]
+    assert (application.resume_status, application.resume_upload_attempts) == ('failed', 3)
+    assert os.path.exists(application.resume_spool_path) # Kept for manual recovery
+
+
+def test_application_deleted_after_claim_is_skipped(db, spooled, monkeypatch):
+    spool_path = spooled.resume_spool_path
+    claim = uploads._claim
+    def claim_then_delete(application_id):
+        claimed = claim(application_id)
+        Application.query.filter_by(id=application_id).delete()
+        db.session.commit()
+        return claimed
+    monkeypatch.setattr(uploads, '_claim', claim_then_delete)
+    monkeypatch.setattr(cloudinary.uploader, 'upload', _succeed)
+    assert uploads.upload_pending_once() == 0
+    assert not os.path.exists(spool_path)
+
+
+def test_deleting_applications_removes_spool_files_after_commit(db, spooled):
+    spool_path = spooled.resume_spool_path
+    uploads.discard_spooled_for(Application.job_id == spooled.job_id)
+    db.session.rollback()
+    assert os.path.exists(spool_path)
+
+    job = db.session.get(Job, spooled.job_id)
+    uploads.discard_spooled_for(Application.job_id == job.id)
+    db.session.delete(job)
+    db.session.commit()
+    assert not os.path.exists(spool_path)
+    assert Application.query.count() == 0
+
+# --- End of test_uploads.py ---
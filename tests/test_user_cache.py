@@ -0,0 +1,101 @@
+# --- tests/test_user_cache.py ---
+# Warm authenticated requests load the user without SQL; committed changes evict the user's entry
+# (in the shared backend, so in every process).
+
+from sqlalchemy import event
+
+from app import create_app, db as _db, user_cache
+from app.cache import TTLCache
+from app.models import Application, Job, User
+
+
+class DictBackend:
+    """Stand-in for a shared CACHE_BACKEND (get/set/delete), shared by the apps in a test."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_warm_request_loads_user_without_sql(app):
+    with app.app_context():
+        seeker = User(username='seeker', email='seeker@example.com', role='job_seeker', is_verified=True,
+                      password_hash='x')
+        employer = User(username='employer', email='employer@example.com', role='employer', is_verified=True,
+                        company_name='Acme', password_hash='x')
+        _db.session.add_all([seeker, employer])
+        _db.session.flush()
+        job = Job(title='Job', description='Work', location='Berlin', company_name='Acme',
+                  employer_id=employer.id, is_approved=True)
+        _db.session.add(job)
+        _db.session.flush()
+        _db.session.add(Application(job_id=job.id, job_seeker_id=seeker.id))
+        _db.session.commit()
+        seeker_id, engine = seeker.id, _db.engine
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(seeker_id)
+        session['_fresh'] = True
+    assert client.get('/jobs/my-applications').status_code == 200 # Cold: fills the cache
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        assert client.get('/jobs/my-applications').status_code == 200
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert statements
+    assert 'applications' in statements[0] # The view's own query comes first
+    assert not any('FROM users' in statement or 'cache_versions' in statement for statement in statements)
+
+
+def test_evict_deletes_only_that_user_after_commit(app, db, employer):
+    other = User(username='other', email='other@example.com', role='job_seeker', is_verified=True, password_hash='x')
+    db.session.add(other)
+    db.session.commit()
+    cache = app.extensions['user_cache']
+    assert isinstance(cache, TTLCache)
+    user_cache.load_user(employer.id)
+    user_cache.load_user(other.id)
+
+    user_cache.evict(employer.id)
+    assert cache.get(f'user:{employer.id}') is not None # Not before the commit
+    db.session.commit()
+    assert cache.get(f'user:{employer.id}') is None
+    assert cache.get(f'user:{other.id}') is not None
+
+
+def test_evict_reaches_other_processes_through_shared_backend(app, db, employer):
+    other = create_app(dict(app.config)) # A second worker process, same database
+    shared = DictBackend()
+    app.extensions['user_cache'] = other.extensions['user_cache'] = shared
+    user_cache.load_user(employer.id)
+    with other.app_context():
+        assert user_cache.load_user(employer.id).is_verified # Served from the shared entry
+
+    db.session.get(User, employer.id).is_verified = False
+    user_cache.evict(employer.id)
+    db.session.commit()
+
+    with other.app_context():
+        assert not user_cache.load_user(employer.id).is_verified
+
+
+def test_evict_is_dropped_on_rollback(app, db, employer):
+    user_cache.load_user(employer.id)
+    user_cache.evict(employer.id)
+    db.session.rollback()
+    db.session.commit()
+    assert app.extensions['user_cache'].get(f'user:{employer.id}') is not None
+
+# --- End of test_user_cache.py ---